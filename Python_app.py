@@ -2,48 +2,59 @@
 # 📚 Biblioteca Personal Web con Flask, KeyDB y Jinja2
 # ===============================================
 
-from flask import Flask, render_template, request, redirect, url_for, flash
-import redis, json, uuid, os
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+import os
 from dotenv import load_dotenv
+from repositorio_libros import crear_repositorio
+from cache_libros import CacheLibros
 
 # -----------------------------------------------
-# 1️⃣ CONFIGURACIÓN DE ENTORNO Y CONEXIÓN A KEYDB
+# 1️⃣ CONFIGURACIÓN DE ENTORNO Y CONEXIÓN AL BACKEND
 # -----------------------------------------------
 load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = "biblioteca_keydb"
 
-KEYDB_HOST = os.getenv("KEYDB_HOST", "localhost")
-KEYDB_PORT = int(os.getenv("KEYDB_PORT", 6379))
-KEYDB_PASSWORD = os.getenv("KEYDB_PASSWORD", None)
+POR_PAGINA = int(os.getenv("LIBROS_POR_PAGINA", 20))
+MAX_POR_PAGINA = 100
+
+# Backend de almacenamiento: keydb | sqlite | mariadb | mongodb (ver repositorio_libros.py)
+BACKEND = os.getenv("LIBROS_BACKEND", "keydb")
+# Máximo de resultados de búsqueda que se paginan en memoria
+MAX_RESULTADOS = 1000
 
 try:
-    db = redis.Redis(
-        host=KEYDB_HOST,
-        port=KEYDB_PORT,
-        password=KEYDB_PASSWORD,
-        decode_responses=True
-    )
-    db.ping()
-    print("✅ Conectado correctamente a KeyDB.")
-except redis.ConnectionError:
-    print("❌ Error al conectar con KeyDB.")
+    repo = crear_repositorio(BACKEND)
+    print(f"✅ Conectado correctamente al backend {BACKEND}.")
+except Exception as e:
+    print(f"❌ Error al conectar con el backend {BACKEND}:", e)
     exit(1)
 
+# Caché por worker, solo con KeyDB: se invalida con el contador de versión que
+# incrementan las escrituras de keydb_indices. Con CACHE_PUBSUB=1 se invalida por
+# pub/sub en lugar de consultar la versión en cada lectura
+cache = None
+if BACKEND == "keydb":
+    cache = CacheLibros(
+        repo.db,
+        capacidad=int(os.getenv("CACHE_CAPACIDAD", 1024)),
+        ttl=float(os.getenv("CACHE_TTL", 30)),
+        escuchar_cambios=os.getenv("CACHE_PUBSUB", "0").lower() in ("1", "true", "yes")
+    )
+# Con MariaDB/MongoDB y LIBROS_CACHE=1, crear_repositorio ya devuelve el repositorio
+# envuelto en la caché compartida de cache_repositorio.py
+
 # -----------------------------------------------
 # 2️⃣ FUNCIONES AUXILIARES
 # -----------------------------------------------
-def obtener_libros():
-    """Devuelve todos los libros guardados."""
-    claves = db.keys("libro:*")
-    libros = [json.loads(db.get(k)) for k in claves]
-    return sorted(libros, key=lambda x: x["titulo"].lower())
+def cacheado(clave, cargar):
+    """Pasa por la caché si el backend la tiene; si no, carga directamente."""
+    return cache.obtener(clave, cargar) if cache else cargar()
 
 def obtener_libro(id_libro):
-    """Obtiene un libro por su ID."""
-    data = db.get(f"libro:{id_libro}")
-    return json.loads(data) if data else None
+    """Obtiene un libro por su ID (a través de la caché)."""
+    return cacheado(f"libro:{id_libro}", lambda: repo.obtener(id_libro))
 
 # -----------------------------------------------
 # 3️⃣ RUTAS CON JINJA2
@@ -51,18 +62,38 @@ def obtener_libro(id_libro):
 
 @app.route("/")
 def index():
-    """Página principal con listado de libros y barra de búsqueda."""
+    """Página principal con listado paginado de libros y barra de búsqueda."""
     query = request.args.get("q", "").lower()
-    libros = obtener_libros()
+    pagina = max(request.args.get("page", 1, type=int), 1)
+    por_pagina = min(max(request.args.get("per_page", POR_PAGINA, type=int), 1), MAX_POR_PAGINA)
+    despues = request.args.get("after")
+    siguiente = None
 
     if query:
-        libros = [
-            l for l in libros if query in l["titulo"].lower()
-            or query in l["autor"].lower()
-            or query in l["genero"].lower()
-        ]
-
-    return render_template("index.html", libros=libros, query=query)
+        # Búsqueda resuelta con el índice de texto de cada backend
+        encontrados = cacheado(
+            ("busqueda", query),
+            lambda: sorted(repo.buscar(query, limite=MAX_RESULTADOS), key=lambda x: x["titulo"].lower())
+        )
+        total = len(encontrados)
+        inicio = (pagina - 1) * por_pagina
+        libros = encontrados[inicio:inicio + por_pagina]
+    elif despues is not None:
+        # Paginación por cursor (en KeyDB: un ZRANGEBYLEX + un MGET)
+        libros, siguiente = cacheado(
+            ("despues", despues, por_pagina), lambda: repo.pagina(despues, por_pagina)
+        )
+        total = None
+    else:
+        # Paginación por número de página (en KeyDB: un ZRANGE + un MGET)
+        libros, total = cacheado(
+            ("pagina", pagina, por_pagina), lambda: repo.pagina_numero(pagina, por_pagina)
+        )
+
+    return render_template(
+        "index.html", libros=libros, query=query,
+        page=pagina, per_page=por_pagina, total=total, after=siguiente
+    )
 
 
 @app.route("/add", methods=["GET", "POST"])
@@ -78,16 +109,14 @@ def add_book():
             flash("⚠️ Todos los campos son obligatorios.", "warning")
             return redirect(url_for("add_book"))
 
-        libro_id = str(uuid.uuid4())
         libro = {
-            "id": libro_id,
             "titulo": titulo,
             "autor": autor,
             "genero": genero,
             "leido": leido
         }
 
-        db.set(f"libro:{libro_id}", json.dumps(libro))
+        repo.agregar(libro)
         flash("✅ Libro agregado exitosamente.", "success")
         return redirect(url_for("index"))
 
@@ -97,18 +126,21 @@ def add_book():
 @app.route("/edit/<id_libro>", methods=["GET", "POST"])
 def edit_book(id_libro):
     """Editar la información de un libro."""
-    libro = obtener_libro(id_libro)
+    # Lectura directa (sin caché): el libro se modifica antes de guardarlo
+    libro = repo.obtener(id_libro)
     if not libro:
         flash("⚠️ Libro no encontrado.", "danger")
         return redirect(url_for("index"))
 
     if request.method == "POST":
-        libro["titulo"] = request.form["titulo"].strip()
-        libro["autor"] = request.form["autor"].strip()
-        libro["genero"] = request.form["genero"].strip()
-        libro["leido"] = request.form.get("leido", "No")
+        cambios = {
+            "titulo": request.form["titulo"].strip(),
+            "autor": request.form["autor"].strip(),
+            "genero": request.form["genero"].strip(),
+            "leido": request.form.get("leido", "No")
+        }
 
-        db.set(f"libro:{id_libro}", json.dumps(libro))
+        repo.actualizar(id_libro, cambios)
         flash("✅ Libro actualizado correctamente.", "success")
         return redirect(url_for("index"))
 
@@ -118,19 +150,29 @@ def edit_book(id_libro):
 @app.route("/delete/<id_libro>", methods=["GET", "POST"])
 def delete_book(id_libro):
     """Confirmar y eliminar un libro."""
-    libro = obtener_libro(id_libro)
+    libro = repo.obtener(id_libro)
     if not libro:
         flash("⚠️ Libro no encontrado.", "danger")
         return redirect(url_for("index"))
 
     if request.method == "POST":
-        db.delete(f"libro:{id_libro}")
+        repo.eliminar(id_libro)
         flash("🗑️ Libro eliminado correctamente.", "info")
         return redirect(url_for("index"))
 
     return render_template("confirm_delete.html", libro=libro)
 
 
+@app.route("/cache/stats")
+def cache_stats():
+    """Contadores de aciertos/fallos de la caché de este worker (o de la caché en KeyDB con LIBROS_CACHE=1)."""
+    if cache:
+        return jsonify(cache.estadisticas())
+    if hasattr(repo, "estadisticas"):
+        return jsonify(repo.estadisticas())
+    return jsonify({"backend": BACKEND, "cache": None})
+
+
 # -----------------------------------------------
 # 4️⃣ EJECUCIÓN PRINCIPAL
 # -----------------------------------------------
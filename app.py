@@ -4,48 +4,39 @@
 # ===============================================
 
 from flask import Flask, render_template, request, redirect, url_for, flash
-import redis, json, uuid, os
+import os
 from dotenv import load_dotenv
+from repositorio_libros import crear_repositorio
 
 # -----------------------------------------------
-# CONFIGURACIÓN DE ENTORNO Y CONEXIÓN A KEYDB
+# CONFIGURACIÓN DE ENTORNO Y CONEXIÓN AL BACKEND
 # -----------------------------------------------
 load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = "biblioteca_keydb"
 
-KEYDB_HOST = os.getenv("KEYDB_HOST", "localhost")
-KEYDB_PORT = int(os.getenv("KEYDB_PORT", 6379))
-KEYDB_PASSWORD = os.getenv("KEYDB_PASSWORD", None)
+POR_PAGINA = int(os.getenv("LIBROS_POR_PAGINA", 20))
+MAX_POR_PAGINA = 100
+
+# Backend de almacenamiento: keydb | sqlite | mariadb | mongodb (ver repositorio_libros.py)
+BACKEND = os.getenv("LIBROS_BACKEND", "keydb")
+# Máximo de resultados de búsqueda que se paginan en memoria
+MAX_RESULTADOS = 1000
 
 try:
-    db = redis.Redis(
-        host=KEYDB_HOST,
-        port=KEYDB_PORT,
-        password=KEYDB_PASSWORD,
-        decode_responses=True
-    )
-    db.ping()
-    print("✅ Conectado correctamente a KeyDB.")
-except redis.ConnectionError:
-    print("❌ Error al conectar con KeyDB.")
+    repo = crear_repositorio(BACKEND)
+    print(f"✅ Conectado correctamente al backend {BACKEND}.")
+except Exception as e:
+    print(f"❌ Error al conectar con el backend {BACKEND}:", e)
     exit(1)
 
 # -----------------------------------------------
 # FUNCIONES AUXILIARES
 # -----------------------------------------------
-def obtener_libros():
-    """Devuelve todos los libros guardados."""
-    claves = db.keys("libro:*")
-    libros = [json.loads(db.get(k)) for k in claves]
-    return libros
-
-
 def obtener_libro(id_libro):
     """Obtiene un libro por su ID."""
-    data = db.get(f"libro:{id_libro}")
-    return json.loads(data) if data else None
+    return repo.obtener(id_libro)
 
 
 # -----------------------------------------------
@@ -54,16 +45,28 @@ def obtener_libro(id_libro):
 
 @app.route("/")
 def index():
-    """Página principal con listado de libros."""
+    """Página principal con listado paginado de libros."""
     query = request.args.get("q", "").lower()
-    libros = obtener_libros()
+    pagina = max(request.args.get("page", 1, type=int), 1)
+    por_pagina = min(max(request.args.get("per_page", POR_PAGINA, type=int), 1), MAX_POR_PAGINA)
+    despues = request.args.get("after")
+    siguiente = None
 
     if query:
-        libros = [l for l in libros if query in l["titulo"].lower() or
-                                      query in l["autor"].lower() or
-                                      query in l["genero"].lower()]
-
-    return render_template("index.html", libros=libros, query=query)
+        encontrados = sorted(repo.buscar(query, limite=MAX_RESULTADOS), key=lambda x: x["titulo"].lower())
+        total = len(encontrados)
+        inicio = (pagina - 1) * por_pagina
+        libros = encontrados[inicio:inicio + por_pagina]
+    elif despues is not None:
+        libros, siguiente = repo.pagina(despues, por_pagina)
+        total = None
+    else:
+        libros, total = repo.pagina_numero(pagina, por_pagina)
+
+    return render_template(
+        "index.html", libros=libros, query=query,
+        page=pagina, per_page=por_pagina, total=total, after=siguiente
+    )
 
 
 @app.route("/add", methods=["GET", "POST"])
@@ -79,16 +82,14 @@ def add_book():
             flash("⚠️ Todos los campos son obligatorios.", "warning")
             return redirect(url_for("add_book"))
 
-        libro_id = str(uuid.uuid4())
         libro = {
-            "id": libro_id,
             "titulo": titulo,
             "autor": autor,
             "genero": genero,
             "leido": leido
         }
 
-        db.set(f"libro:{libro_id}", json.dumps(libro))
+        repo.agregar(libro)
         flash("✅ Libro agregado exitosamente.", "success")
         return redirect(url_for("index"))
 
@@ -104,12 +105,14 @@ def edit_book(id_libro):
         return redirect(url_for("index"))
 
     if request.method == "POST":
-        libro["titulo"] = request.form["titulo"].strip()
-        libro["autor"] = request.form["autor"].strip()
-        libro["genero"] = request.form["genero"].strip()
-        libro["leido"] = request.form.get("leido", "No")
+        cambios = {
+            "titulo": request.form["titulo"].strip(),
+            "autor": request.form["autor"].strip(),
+            "genero": request.form["genero"].strip(),
+            "leido": request.form.get("leido", "No")
+        }
 
-        db.set(f"libro:{id_libro}", json.dumps(libro))
+        repo.actualizar(id_libro, cambios)
         flash("✅ Libro actualizado correctamente.", "success")
         return redirect(url_for("index"))
 
@@ -119,7 +122,9 @@ def edit_book(id_libro):
 @app.route("/delete/<id_libro>")
 def delete_book(id_libro):
     """Eliminar un libro."""
-    db.delete(f"libro:{id_libro}")
+    libro = obtener_libro(id_libro)
+    if libro:
+        repo.eliminar(id_libro)
     flash("🗑️ Libro eliminado.", "info")
     return redirect(url_for("index"))
 
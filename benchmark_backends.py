@@ -0,0 +1,230 @@
+# ===============================================
+# ⏱️ Benchmark comparativo de backends
+# La misma carga sobre SQLite, MariaDB, MongoDB y KeyDB
+# ===============================================
+#
+# Uso:
+#   python benchmark_backends.py [N] [hilos] [backends] [salida]
+#   p. ej.: python benchmark_backends.py 10000 4 sqlite,keydb informe_backends
+#   Con el sufijo +cache (mariadb+cache, mongodb+cache) se mide el backend envuelto
+#   en la caché compartida de cache_repositorio.py.
+#
+# Cargas (todas a través de repositorio_libros.py):
+#   insertar_lote  agregar_varios en bloques de TAMANO_LOTE
+#   listar         recorrido completo por cursor, una página por operación
+#   obtener        lectura puntual por id (cada id una vez)
+#   obtener_zipf   lecturas repetidas con distribución de Zipf (pocos ids muy leídos),
+#                  donde las variantes +cache pueden acertar
+#   buscar         búsqueda por autor
+#   actualizar     actualizar_campo(id, "leido", "Sí")
+#   eliminar       borrado por id
+# Las operaciones de cada carga se reparten entre `hilos` hilos. Para cada una se
+# informa de latencia (p50/p95/p99/máx en ms) y rendimiento (operaciones/s) en
+# salida.json y salida.md.
+#
+# Con BENCHMARK_LOCAL=1 (por defecto) no hace falta ningún servidor:
+#   sqlite   archivo temporal
+#   mariadb  el mismo código SQLAlchemy sobre un archivo SQLite temporal
+#   mongodb  mongomock
+#   keydb    fakeredis
+# Con BENCHMARK_LOCAL=0 se usan los servidores configurados (MARIADB_URL,
+# MONGODB_URI, KEYDB_HOST...). Solo se leen, modifican y borran los libros
+# creados por el benchmark (genero = MARCA).
+
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from repositorio_libros import BACKENDS, crear_repositorio
+
+LOCAL = os.getenv("BENCHMARK_LOCAL", "1") == "1"
+MARCA = "__benchmark__"
+TAMANO_LOTE = 1000
+POR_PAGINA = 100
+AUTORES = 100
+# Exponente de Zipf de obtener_zipf: con s≈1 el 20 % de los ids recibe la mayoría de lecturas
+ZIPF_S = 1.1
+
+
+# -----------------------------------------------
+# Preparación de cada backend
+# -----------------------------------------------
+def hilos_admitidos(backend, hilos):
+    """mongomock no es seguro entre hilos: en modo local MongoDB se mide con uno."""
+    return 1 if LOCAL and backend.startswith("mongodb") else hilos
+
+
+def preparar(backend, directorio):
+    """Devuelve el repositorio listo para medir (en modo local, aislado en `directorio`)."""
+    if backend.endswith("+cache"):
+        from cache_repositorio import RepositorioCacheado
+        from repositorio_libros import conectar_keydb
+        # Directorio propio: la variante con caché no comparte archivos con la base
+        subdirectorio = os.path.join(directorio, backend)
+        os.makedirs(subdirectorio, exist_ok=True)
+        repo = preparar(backend[:-len("+cache")], subdirectorio)
+        if LOCAL:
+            import fakeredis
+            return RepositorioCacheado(repo, fakeredis.FakeRedis(decode_responses=True))
+        return RepositorioCacheado(repo, conectar_keydb())
+    if backend == "sqlite":
+        ruta = os.path.join(directorio, "sqlite.db") if LOCAL else None
+        return crear_repositorio("sqlite", ruta=ruta)
+    if backend == "mariadb":
+        if not LOCAL:
+            repo = crear_repositorio("mariadb")
+        else:
+            # biblioteca_mariadb crea su engine al importarse: se le da uno que no use
+            # servidor y cada variante recibe su propio engine sobre su archivo
+            os.environ.setdefault("MARIADB_URL", "sqlite://")
+            repo = crear_repositorio("mariadb", url=f"sqlite:///{os.path.join(directorio, 'mariadb.db')}")
+        repo.bm.migrar(repo.engine)
+        return repo
+    if backend == "mongodb":
+        if LOCAL:
+            import mongomock
+            with mongomock.patch(servers=(("localhost", 27017),)):
+                return crear_repositorio("mongodb")
+        return crear_repositorio("mongodb")
+    if backend == "keydb" and LOCAL:
+        import fakeredis
+        return crear_repositorio("keydb", db=fakeredis.FakeRedis(decode_responses=True))
+    return crear_repositorio(backend)
+
+
+# -----------------------------------------------
+# Medición
+# -----------------------------------------------
+def _resumen(latencias, duracion):
+    """Percentiles de latencia (ms) y operaciones/s de una carga."""
+    ms = sorted(l * 1000 for l in latencias)
+    cortes = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    return {
+        "operaciones": len(ms),
+        "duracion_s": round(duracion, 3),
+        "ops_s": round(len(ms) / max(duracion, 1e-9), 1),
+        "p50_ms": round(cortes[49], 3),
+        "p95_ms": round(cortes[94], 3),
+        "p99_ms": round(cortes[98], 3),
+        "max_ms": round(ms[-1], 3) if ms else 0,
+    }
+
+
+def medir(funcion, argumentos, hilos):
+    """Ejecuta funcion(arg) para cada argumento repartido entre `hilos` hilos."""
+    def cronometrar(arg):
+        inicio = time.perf_counter()
+        funcion(arg)
+        return time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    if hilos > 1:
+        with ThreadPoolExecutor(hilos) as pool:
+            latencias = list(pool.map(cronometrar, argumentos))
+    else:
+        latencias = [cronometrar(a) for a in argumentos]
+    return _resumen(latencias, time.perf_counter() - inicio)
+
+
+def _libros(cantidad):
+    return [{"titulo": f"Libro {i}", "autor": f"Autor {i % AUTORES}", "genero": MARCA, "leido": "No"}
+            for i in range(cantidad)]
+
+
+def ejecutar_cargas(repo, cantidad, hilos, semilla=42):
+    azar = random.Random(semilla)
+    resultados = {}
+
+    libros = _libros(cantidad)
+    bloques = [libros[i:i + TAMANO_LOTE] for i in range(0, cantidad, TAMANO_LOTE)]
+    resultados["insertar_lote"] = medir(repo.agregar_varios, bloques, hilos)
+    resultados["insertar_lote"]["filas_s"] = round(cantidad / max(resultados["insertar_lote"]["duracion_s"], 1e-9))
+
+    # El listado es secuencial por naturaleza (cada cursor depende de la página anterior)
+    ids = []
+    latencias = []
+    inicio = time.perf_counter()
+    siguiente = None
+    while True:
+        t = time.perf_counter()
+        pagina, siguiente = repo.pagina(siguiente, POR_PAGINA)
+        latencias.append(time.perf_counter() - t)
+        ids.extend(l["id"] for l in pagina if l["genero"] == MARCA)
+        if siguiente is None:
+            break
+    resultados["listar"] = _resumen(latencias, time.perf_counter() - inicio)
+    resultados["listar"]["libros_listados"] = len(ids)
+
+    muestra = azar.sample(ids, len(ids))
+    resultados["obtener"] = medir(repo.obtener, muestra, hilos)
+    # Rango 1 = id más leído; los pesos 1/rango^s dan la cola larga típica de un catálogo
+    pesos = [1 / (rango ** ZIPF_S) for rango in range(1, len(muestra) + 1)]
+    lecturas = azar.choices(muestra, weights=pesos, k=len(muestra)) if muestra else []
+    resultados["obtener_zipf"] = medir(repo.obtener, lecturas, hilos)
+    resultados["obtener_zipf"]["ids_distintos"] = len(set(lecturas))
+    busquedas = [f"Autor {azar.randrange(AUTORES)}" for _ in range(max(cantidad // 10, 100))]
+    resultados["buscar"] = medir(lambda t: repo.buscar(t, "autor"), busquedas, hilos)
+    resultados["actualizar"] = medir(lambda i: repo.actualizar_campo(i, "leido", "Sí"), muestra, hilos)
+    resultados["eliminar"] = medir(repo.eliminar, muestra, hilos)
+    return resultados
+
+
+# -----------------------------------------------
+# Informe
+# -----------------------------------------------
+def markdown(informe):
+    lineas = [
+        f"# Benchmark de backends ({informe['libros']} libros, {informe['hilos']} hilos, "
+        f"{'local' if informe['local'] else 'servidores'})",
+        "",
+    ]
+    for carga in ("insertar_lote", "listar", "obtener", "obtener_zipf", "buscar", "actualizar", "eliminar"):
+        lineas += [f"## {carga}", "",
+                   "| backend | hilos | ops/s | p50 ms | p95 ms | p99 ms | máx ms |",
+                   "|---|---:|---:|---:|---:|---:|---:|"]
+        for backend, cargas in informe["backends"].items():
+            if "error" in cargas:
+                continue
+            r = cargas[carga]
+            lineas.append(f"| {backend} | {cargas['hilos']} | {r['ops_s']} | {r['p50_ms']} | {r['p95_ms']} | {r['p99_ms']} | {r['max_ms']} |")
+        lineas.append("")
+    errores = {b: c["error"] for b, c in informe["backends"].items() if "error" in c}
+    if errores:
+        lineas += ["## Errores", ""] + [f"- {b}: {e}" for b, e in errores.items()] + [""]
+    return "\n".join(lineas)
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    hilos = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    backends = sys.argv[3].split(",") if len(sys.argv) > 3 else list(BACKENDS)
+    salida = sys.argv[4] if len(sys.argv) > 4 else "benchmark_backends"
+
+    informe = {"libros": cantidad, "hilos": hilos, "local": LOCAL, "backends": {}}
+    with tempfile.TemporaryDirectory() as directorio:
+        for backend in backends:
+            print(f"⏱️ {backend}...")
+            try:
+                repo = preparar(backend, directorio)
+                try:
+                    hilos_backend = hilos_admitidos(backend, hilos)
+                    informe["backends"][backend] = ejecutar_cargas(repo, cantidad, hilos_backend)
+                    informe["backends"][backend]["hilos"] = hilos_backend
+                finally:
+                    repo.cerrar()
+            except Exception as e:
+                print(f"❌ {backend}: {e}")
+                informe["backends"][backend] = {"error": str(e)}
+
+    with open(f"{salida}.json", "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    texto = markdown(informe)
+    with open(f"{salida}.md", "w", encoding="utf-8") as f:
+        f.write(texto)
+    print(texto)
+    print(f"✅ Informe guardado en {salida}.json y {salida}.md")
@@ -0,0 +1,104 @@
+# ===============================================
+# ⏱️ Benchmark de búsqueda: LIKE frente a FTS5
+# sobre una biblioteca generada de N libros
+# ===============================================
+#
+# Uso:
+#   python benchmark_fts.py [N] [ruta_db]
+# Por defecto genera 1.000.000 de libros en benchmark_biblioteca.db.
+# Ambas búsquedas se miden con el mismo límite: sin límite (todas las
+# coincidencias) y con LIMIT LIMITE (la primera página de resultados).
+
+import os
+import random
+import statistics
+import sys
+import time
+
+from biblioteca_personal import conectar, buscar_fts
+
+SILABAS = ("ma", "ri", "so", "len", "ta", "bor", "ges", "cor", "za", "pe", "lu", "vin",
+           "dra", "que", "mon", "tes", "ca", "ni", "ro", "gal")
+GENEROS = ("Novela", "Cuento", "Poesía", "Ensayo", "Teatro", "Ciencia ficción")
+LIMITE = 50
+
+
+def vocabulario(azar, cantidad):
+    """Palabras inventadas de 2 a 4 sílabas: un vocabulario grande y realista en selectividad."""
+    palabras = set()
+    while len(palabras) < cantidad:
+        palabras.add("".join(azar.choice(SILABAS) for _ in range(azar.randint(2, 4))))
+    return sorted(palabras)
+
+
+# -----------------------------------------------
+# Generación de datos
+# -----------------------------------------------
+def generar_libros(conexion, cantidad, lote=50000):
+    """Inserta `cantidad` libros aleatorios con executemany en una sola transacción."""
+    azar = random.Random(42)
+    palabras = vocabulario(azar, 20000)
+    nombres = [p.capitalize() for p in azar.sample(palabras, 2000)]
+    cursor = conexion.cursor()
+    for inicio in range(0, cantidad, lote):
+        filas = [
+            (" ".join(azar.sample(palabras, 4)).capitalize(),
+             f"{azar.choice(nombres)} {azar.choice(nombres)}",
+             azar.choice(GENEROS),
+             azar.choice(("Sí", "No")))
+            for _ in range(min(lote, cantidad - inicio))
+        ]
+        cursor.executemany(
+            "INSERT INTO libros (titulo, autor, genero, leido) VALUES (?, ?, ?, ?)", filas
+        )
+    conexion.commit()
+
+
+# -----------------------------------------------
+# Medición
+# -----------------------------------------------
+def buscar_like(conexion, termino, limite=None):
+    """Búsqueda original: LIKE '%termino%' en los tres campos (recorre toda la tabla)."""
+    patron = f"%{termino}%"
+    cursor = conexion.cursor()
+    cursor.execute(
+        "SELECT * FROM libros WHERE titulo LIKE ? OR autor LIKE ? OR genero LIKE ? LIMIT ?",
+        (patron, patron, patron, -1 if limite is None else limite)
+    )
+    return cursor.fetchall()
+
+
+def medir(funcion, conexion, terminos, limite=None, repeticiones=5):
+    """Mediana y p95 de latencia en milisegundos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        for termino in terminos:
+            inicio = time.perf_counter()
+            funcion(conexion, termino, limite=limite)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return {
+        "mediana_ms": round(statistics.median(tiempos), 3),
+        "p95_ms": round(tiempos[int(len(tiempos) * 0.95) - 1], 3),
+    }
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ruta = sys.argv[2] if len(sys.argv) > 2 else "benchmark_biblioteca.db"
+
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    conexion = conectar(ruta)
+
+    inicio = time.perf_counter()
+    generar_libros(conexion, cantidad)
+    print(f"📚 {cantidad} libros generados en {time.perf_counter() - inicio:.1f} s")
+
+    # Palabras del vocabulario generado (misma semilla que generar_libros)
+    terminos = random.Random(7).sample(vocabulario(random.Random(42), 20000), 10)
+    for limite in (None, LIMITE):
+        etiqueta = "sin límite" if limite is None else f"LIMIT {limite}"
+        print(f"LIKE ({etiqueta}): {medir(buscar_like, conexion, terminos, limite)}")
+        print(f"FTS5 ({etiqueta}): {medir(buscar_fts, conexion, terminos, limite)}")
+    conexion.close()
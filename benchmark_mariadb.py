@@ -0,0 +1,99 @@
+# ===============================================
+# ⏱️ Benchmark de escritura en MariaDB
+# ORM objeto a objeto frente a operaciones masivas con Core
+# ===============================================
+#
+# Uso:
+#   python benchmark_mariadb.py [N] [tamaño_lote]
+# Usa la conexión de biblioteca_mariadb.py (MARIADB_URL). Inserta N libros marcados
+# con un autor propio y los borra al terminar.
+
+import json
+import sys
+import time
+
+from biblioteca_mariadb import (
+    Libro, Session, migrar, insertar_libros, actualizar_libros, actualizar_cada_libro,
+    eliminar_libros, TAMANO_LOTE_ESCRITURA,
+)
+from sqlalchemy import select
+
+AUTOR = "__benchmark__"
+
+
+def _por_segundo(cantidad, inicio):
+    return round(cantidad / max(time.perf_counter() - inicio, 1e-9))
+
+
+def _libros(cantidad, desde=0):
+    return [{"titulo": f"Libro {i}", "autor": AUTOR, "genero": "Novela", "leido": "No"}
+            for i in range(desde, desde + cantidad)]
+
+
+def _ids():
+    with Session() as s:
+        return list(s.scalars(select(Libro.id).where(Libro.autor == AUTOR).order_by(Libro.id)))
+
+
+def medir_orm(cantidad):
+    """El camino del menú original: un objeto y un commit por libro; get + cambio por update/delete."""
+    inicio = time.perf_counter()
+    for libro in _libros(cantidad):
+        with Session.begin() as s:
+            s.add(Libro(**libro))
+    insertar = _por_segundo(cantidad, inicio)
+
+    ids = _ids()
+    inicio = time.perf_counter()
+    for id_libro in ids:
+        with Session.begin() as s:
+            s.get(Libro, id_libro).leido = "Sí"
+    actualizar = _por_segundo(len(ids), inicio)
+
+    inicio = time.perf_counter()
+    for id_libro in ids:
+        with Session.begin() as s:
+            s.delete(s.get(Libro, id_libro))
+    eliminar = _por_segundo(len(ids), inicio)
+    return {"insertar_s": insertar, "actualizar_s": actualizar, "eliminar_s": eliminar}
+
+
+def medir_core(cantidad, lote):
+    """insertar_libros / actualizar_libros / actualizar_cada_libro / eliminar_libros por bloques."""
+    inicio = time.perf_counter()
+    insertar_libros(_libros(cantidad), lote)
+    insertar = _por_segundo(cantidad, inicio)
+
+    ids = _ids()
+    inicio = time.perf_counter()
+    actualizar_libros(ids, lote, leido="Sí")
+    actualizar = _por_segundo(len(ids), inicio)
+
+    inicio = time.perf_counter()
+    actualizar_cada_libro(({"id": i, "titulo": f"Renombrado {i}"} for i in ids), lote)
+    actualizar_cada = _por_segundo(len(ids), inicio)
+
+    inicio = time.perf_counter()
+    eliminar_libros(ids, lote)
+    eliminar = _por_segundo(len(ids), inicio)
+    return {"insertar_s": insertar, "actualizar_s": actualizar,
+            "actualizar_cada_libro_s": actualizar_cada, "eliminar_s": eliminar}
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    lote = int(sys.argv[2]) if len(sys.argv) > 2 else TAMANO_LOTE_ESCRITURA
+    migrar()
+    eliminar_libros(_ids())
+
+    # El camino ORM es mucho más lento: se mide sobre una muestra menor
+    orm = medir_orm(max(cantidad // 20, 100))
+    core = medir_core(cantidad, lote)
+    resultados = {
+        "filas": cantidad,
+        "tamano_lote": lote,
+        "orm_por_objeto": orm,
+        "core_por_lote": core,
+        "aceleracion": {k: round(core[k] / max(orm[k], 1), 1) for k in orm},
+    }
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
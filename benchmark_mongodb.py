@@ -0,0 +1,96 @@
+# ===============================================
+# ⏱️ Benchmark de escritura en MongoDB
+# Documento a documento frente a operaciones por lotes
+# ===============================================
+#
+# Uso:
+#   python benchmark_mongodb.py [N] [tamaño_lote] [w]
+# Usa la conexión de biblioteca_mongodb.py (MONGODB_URI). Inserta N libros marcados
+# con un autor propio y los borra al terminar. Por defecto N = 100.000.
+
+import json
+import sys
+import time
+
+from biblioteca_mongodb import (
+    coleccion, insertar_libros, actualizar_libros, eliminar_libros, informe, W,
+    TAMANO_LOTE_ESCRITURA,
+)
+
+AUTOR = "__benchmark__"
+
+
+def _por_segundo(cantidad, inicio):
+    return round(cantidad / max(time.perf_counter() - inicio, 1e-9))
+
+
+def _libros(cantidad):
+    return ({"titulo": f"Libro {i}", "autor": AUTOR, "genero": f"Género {i % 10}", "leido": "No"}
+            for i in range(cantidad))
+
+
+def _ids():
+    return [d["_id"] for d in coleccion.find({"autor": AUTOR}, {"_id": 1})]
+
+
+def medir_individual(cantidad):
+    """El camino del menú: insert_one / update_one / delete_one, un viaje por documento."""
+    inicio = time.perf_counter()
+    for libro in _libros(cantidad):
+        coleccion.insert_one(libro)
+    insertar = _por_segundo(cantidad, inicio)
+
+    ids = _ids()
+    inicio = time.perf_counter()
+    for id_libro in ids:
+        coleccion.update_one({"_id": id_libro}, {"$set": {"leido": "Sí"}})
+    actualizar = _por_segundo(len(ids), inicio)
+
+    inicio = time.perf_counter()
+    for id_libro in ids:
+        coleccion.delete_one({"_id": id_libro})
+    eliminar = _por_segundo(len(ids), inicio)
+    return {"insertar_s": insertar, "actualizar_s": actualizar, "eliminar_s": eliminar}
+
+
+def medir_lotes(cantidad, lote, w):
+    """insert_many / bulk_write / delete_many desordenados con el write concern indicado."""
+    inicio = time.perf_counter()
+    insertar_libros(_libros(cantidad), lote, w=w)
+    insertar = _por_segundo(cantidad, inicio)
+
+    ids = _ids()
+    inicio = time.perf_counter()
+    actualizar_libros(((i, {"leido": "Sí"}) for i in ids), lote, w=w)
+    actualizar = _por_segundo(len(ids), inicio)
+
+    inicio = time.perf_counter()
+    resumen = informe()
+    informe_ms = round((time.perf_counter() - inicio) * 1000, 1)
+
+    inicio = time.perf_counter()
+    eliminar_libros(ids, lote, w=w)
+    eliminar = _por_segundo(len(ids), inicio)
+    return {"insertar_s": insertar, "actualizar_s": actualizar, "eliminar_s": eliminar,
+            "informe_facet_ms": informe_ms, "libros_en_informe": resumen["total"]}
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lote = int(sys.argv[2]) if len(sys.argv) > 2 else TAMANO_LOTE_ESCRITURA
+    w = sys.argv[3] if len(sys.argv) > 3 else W
+    w = int(w) if str(w).isdigit() else w
+    coleccion.delete_many({"autor": AUTOR})
+
+    individual = medir_individual(cantidad)
+    lotes = medir_lotes(cantidad, lote, w)
+    coleccion.delete_many({"autor": AUTOR})
+    resultados = {
+        "documentos": cantidad,
+        "tamano_lote": lote,
+        "write_concern_w": w,
+        "individual": individual,
+        "por_lotes": lotes,
+        "aceleracion": {k: round(lotes[k] / max(individual[k], 1), 1) for k in individual},
+    }
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
@@ -0,0 +1,73 @@
+# ===============================================
+# ⏱️ Benchmark de perfiles de conexión SQLite
+# Inserciones y lecturas con cada perfil de sqlite_conexion.py
+# ===============================================
+#
+# Uso:
+#   python benchmark_sqlite.py [N]
+# Escribe en archivos temporales benchmark_sqlite_{perfil}.db que se borran al terminar.
+
+import json
+import os
+import random
+import sys
+import time
+
+from biblioteca_personal import conectar
+from sqlite_conexion import PERFILES
+
+
+def _por_segundo(cantidad, inicio):
+    return round(cantidad / max(time.perf_counter() - inicio, 1e-9))
+
+
+def _borrar(ruta):
+    for sufijo in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(ruta + sufijo):
+            os.remove(ruta + sufijo)
+
+
+def medir_perfil(perfil, cantidad):
+    """Filas/s con commit por libro (como el menú), por lote y lecturas por ID."""
+    ruta = f"benchmark_sqlite_{perfil}.db"
+    _borrar(ruta)
+    conexion = conectar(ruta, perfil)
+    cursor = conexion.cursor()
+    fila = ("Título de prueba", "Autor de prueba", "Novela", "No")
+    sql = "INSERT INTO libros (titulo, autor, genero, leido) VALUES (?, ?, ?, ?)"
+
+    # Un commit por libro, como agregar_libro
+    individuales = max(cantidad // 20, 100)
+    inicio = time.perf_counter()
+    for _ in range(individuales):
+        cursor.execute(sql, fila)
+        conexion.commit()
+    commit_por_fila = _por_segundo(individuales, inicio)
+
+    # Una sola transacción con executemany
+    inicio = time.perf_counter()
+    cursor.executemany(sql, [fila] * cantidad)
+    conexion.commit()
+    por_lote = _por_segundo(cantidad, inicio)
+
+    # Lecturas puntuales por clave primaria
+    total = individuales + cantidad
+    ids = [random.randint(1, total) for _ in range(cantidad)]
+    inicio = time.perf_counter()
+    for id_libro in ids:
+        cursor.execute("SELECT * FROM libros WHERE id = ?", (id_libro,)).fetchone()
+    lecturas = _por_segundo(cantidad, inicio)
+
+    conexion.close()
+    _borrar(ruta)
+    return {
+        "inserciones_commit_por_fila_s": commit_por_fila,
+        "inserciones_por_lote_s": por_lote,
+        "lecturas_por_id_s": lecturas,
+    }
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    resultados = {perfil: medir_perfil(perfil, cantidad) for perfil in PERFILES}
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
@@ -4,10 +4,11 @@
 # ===============================================
 
 import redis
-import json
 import uuid
 import os
 from dotenv import load_dotenv
+from keydb_libros import iterar_libros, leer_libro
+from keydb_indices import buscar, guardar_libro, eliminar_libro as eliminar_con_indices
 
 # -----------------------------------------------
 # CARGA DE VARIABLES DE ENTORNO
@@ -54,23 +55,23 @@ def agregar_libro():
         "leido": leido
     }
 
-    # Guardar el libro en formato JSON
-    r.set(f"libro:{libro_id}", json.dumps(libro))
+    # Guardar el libro en formato JSON junto con sus índices
+    guardar_libro(r, libro)
     print(f"✅ Libro agregado con ID {libro_id}\n")
 
 
 def ver_libros():
     """Lista todos los libros almacenados."""
-    claves = r.keys("libro:*")
-    if not claves:
+    hay_libros = False
+    for libro in iterar_libros(r):
+        if not hay_libros:
+            print("\n📚 Lista de libros registrados:")
+            print("-" * 70)
+            hay_libros = True
+        print(f"ID: {libro['id']} | Título: {libro['titulo']} | Autor: {libro['autor']} | Género: {libro['genero']} | Leído: {libro['leido']}")
+    if not hay_libros:
         print("📭 No hay libros en la biblioteca.\n")
         return
-
-    print("\n📚 Lista de libros registrados:")
-    print("-" * 70)
-    for clave in claves:
-        libro = json.loads(r.get(clave))
-        print(f"ID: {libro['id']} | Título: {libro['titulo']} | Autor: {libro['autor']} | Género: {libro['genero']} | Leído: {libro['leido']}")
     print("-" * 70 + "\n")
 
 
@@ -83,13 +84,8 @@ def buscar_libros():
         print("❌ Campo no válido.\n")
         return
 
-    claves = r.keys("libro:*")
-    encontrados = []
-
-    for clave in claves:
-        libro = json.loads(r.get(clave))
-        if termino in libro[campo].lower():
-            encontrados.append(libro)
+    # Solo se leen los libros candidatos según los índices de KeyDB
+    encontrados = buscar(r, termino, (campo,))
 
     if encontrados:
         print("\n🔎 Resultados encontrados:")
@@ -103,13 +99,12 @@ def buscar_libros():
 def actualizar_libro():
     """Actualiza los datos de un libro existente."""
     libro_id = input("Ingrese el ID del libro a actualizar: ")
-    clave = f"libro:{libro_id}"
+    libro = leer_libro(r, libro_id)
 
-    if not r.exists(clave):
+    if not libro:
         print("⚠️ Libro no encontrado.\n")
         return
 
-    libro = json.loads(r.get(clave))
     print(f"Libro actual: {libro}")
 
     campo = input("Campo a modificar (titulo, autor, genero, leido): ").lower()
@@ -118,17 +113,18 @@ def actualizar_libro():
         return
 
     nuevo_valor = input(f"Nuevo valor para {campo}: ")
+    anterior = dict(libro)
     libro[campo] = nuevo_valor
-    r.set(clave, json.dumps(libro))
+    guardar_libro(r, libro, anterior)
     print("✅ Libro actualizado correctamente.\n")
 
 
 def eliminar_libro():
     """Elimina un libro por ID."""
     libro_id = input("Ingrese el ID del libro a eliminar: ")
-    clave = f"libro:{libro_id}"
+    libro = leer_libro(r, libro_id)
 
-    if r.delete(clave):
+    if libro and eliminar_con_indices(r, libro):
         print("🗑️ Libro eliminado correctamente.\n")
     else:
         print("⚠️ No se encontró el libro con ese ID.\n")
@@ -2,12 +2,20 @@
 # Aplicación de Biblioteca Personal con MariaDB
 # Usando SQLAlchemy (ORM)
 # ===============================================
+#
+# Uso:
+#   python biblioteca_mariadb.py            menú interactivo
+#   python biblioteca_mariadb.py migrar     crea las tablas (paso explícito, una sola vez)
+#
+# La conexión se configura con variables de entorno (MARIADB_URL, MARIADB_POOL_*).
+# Con MARIADB_URL=sqlite:///biblioteca_pruebas.db se puede probar sin servidor.
 
-from sqlalchemy import create_engine, Column, Integer, String, CheckConstraint
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import os
 import sys
 
+from sqlalchemy import create_engine, select, insert, update, delete, bindparam, Column, Integer, String, CheckConstraint, Index
+from sqlalchemy.orm import declarative_base, sessionmaker
+
 # -----------------------------------------------
 # CONFIGURACIÓN DE CONEXIÓN A MARIADB
 # -----------------------------------------------
@@ -20,17 +28,42 @@ HOST = "localhost"
 BASE_DATOS = "biblioteca"
 
 # Cadena de conexión para MariaDB
-DB_URL = f"mariadb+mariadbconnector://{USUARIO}:{PASSWORD}@{HOST}/{BASE_DATOS}"
+DB_URL = os.getenv("MARIADB_URL", f"mariadb+mariadbconnector://{USUARIO}:{PASSWORD}@{HOST}/{BASE_DATOS}")
+
+# Pool de conexiones: cada worker mantiene POOL_SIZE conexiones abiertas y puede
+# abrir MAX_OVERFLOW más en picos. RECYCLE (s) renueva las conexiones antes de que
+# MariaDB las cierre por wait_timeout; PRE_PING descarta las que hayan caído.
+POOL_SIZE = int(os.getenv("MARIADB_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.getenv("MARIADB_MAX_OVERFLOW", 10))
+POOL_TIMEOUT = int(os.getenv("MARIADB_POOL_TIMEOUT", 30))
+POOL_RECYCLE = int(os.getenv("MARIADB_POOL_RECYCLE", 1800))
+PRE_PING = os.getenv("MARIADB_PRE_PING", "1") == "1"
+
+
+def _opciones_pool(url, opciones):
+    ajustes = {"pool_pre_ping": PRE_PING, "pool_recycle": POOL_RECYCLE}
+    # SQLite en memoria usa un pool de una conexión por hilo, sin tamaño configurable
+    if not url.startswith("sqlite"):
+        ajustes.update(pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_timeout=POOL_TIMEOUT)
+    ajustes.update(opciones)
+    return ajustes
+
+
+def crear_engine(url=DB_URL, **opciones):
+    """Engine con el pool configurado; `opciones` sobrescribe cualquier parámetro de create_engine."""
+    return create_engine(url, **_opciones_pool(url, opciones))
+
 
 try:
-    engine = create_engine(DB_URL)
+    engine = crear_engine()
 except Exception as e:
     print("❌ Error al conectar con MariaDB:", e)
     sys.exit(1)
 
 Base = declarative_base()
-Session = sessionmaker(bind=engine)
-session = Session()
+# Sesiones ORM cortas, una por operación (benchmark_mariadb.py las compara con
+# las operaciones Core de este módulo)
+Session = sessionmaker(bind=engine, expire_on_commit=False)
 
 # -----------------------------------------------
 # DEFINICIÓN DEL MODELO ORM
@@ -40,12 +73,15 @@ class Libro(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     titulo = Column(String(100), nullable=False)
-    autor = Column(String(100), nullable=False)
-    genero = Column(String(50))
-    leido = Column(String(2), nullable=False, default="No")
+    autor = Column(String(100), nullable=False, index=True)
+    genero = Column(String(50), index=True)
+    leido = Column(String(2), nullable=False, default="No", index=True)
 
     __table_args__ = (
         CheckConstraint("leido IN ('Sí', 'No')", name="check_leido"),
+        # Índice de texto completo para MATCH ... AGAINST (solo en MariaDB/MySQL)
+        Index("ft_libros_texto", "titulo", "autor", "genero",
+              mysql_prefix="FULLTEXT", mariadb_prefix="FULLTEXT").ddl_if(dialect=("mysql", "mariadb")),
     )
 
     def __repr__(self):
@@ -53,9 +89,197 @@ class Libro(Base):
 
 
 # -----------------------------------------------
-# CREAR LAS TABLAS EN LA BASE DE DATOS
+# MIGRACIÓN: CREAR LAS TABLAS EN LA BASE DE DATOS
+# -----------------------------------------------
+def _crear_esquema(conexion):
+    Base.metadata.create_all(conexion)
+    # create_all no añade índices nuevos a tablas que ya existían
+    for indice in Libro.__table__.indexes:
+        indice.create(conexion, checkfirst=True)
+
+
+def migrar(engine=engine):
+    """Crea las tablas e índices que falten. Se ejecuta una vez al desplegar, no al importar."""
+    with engine.begin() as conexion:
+        _crear_esquema(conexion)
+
+
+# -----------------------------------------------
+# CONSULTAS: STREAMING, PAGINACIÓN Y BÚSQUEDA
+# Estas funciones y las operaciones masivas usan el engine del módulo salvo que
+# se pase otro (p. ej. repositorio_libros.RepositorioMariaDB(url=...)).
+# -----------------------------------------------
+# Solo columnas (Core), sin construir objetos ORM ni cargar la tabla en memoria
+COLUMNAS = (Libro.id, Libro.titulo, Libro.autor, Libro.genero, Libro.leido)
+CAMPOS_BUSQUEDA = ("titulo", "autor", "genero", "todos")
+TAMANO_LOTE = 1000
+POR_PAGINA = 50
+
+
+def iterar_libros(lote=TAMANO_LOTE, engine=engine):
+    """Genera todos los libros como dicts con un cursor en el servidor, `lote` filas cada vez."""
+    with engine.connect() as conexion:
+        resultado = conexion.execution_options(stream_results=True, yield_per=lote).execute(
+            select(*COLUMNAS).order_by(Libro.id)
+        )
+        for fila in resultado.mappings():
+            yield dict(fila)
+
+
+def pagina_libros(despues_id=0, por_pagina=POR_PAGINA, engine=engine):
+    """
+    Paginación por clave (keyset): libros con id > despues_id, en orden.
+    Devuelve (libros, siguiente_id); siguiente_id es None en la última página.
+    """
+    with engine.connect() as conexion:
+        filas = conexion.execute(
+            select(*COLUMNAS).where(Libro.id > despues_id).order_by(Libro.id).limit(por_pagina)
+        ).mappings().all()
+    libros = [dict(f) for f in filas]
+    siguiente = libros[-1]["id"] if len(libros) == por_pagina else None
+    return libros, siguiente
+
+
+def _usa_fulltext(engine=engine):
+    return engine.dialect.name in ("mysql", "mariadb")
+
+
+def _palabras(termino):
+    return "".join(c if c.isalnum() else " " for c in termino).split()
+
+
+def _consulta_booleana(termino):
+    """'cien años' -> '+cien* +años*': todas las palabras, como prefijo."""
+    return " ".join(f"+{p}*" for p in _palabras(termino))
+
+
+def _escapar_like(texto):
+    """Escapa los comodines de LIKE (% y _) que escriba el usuario."""
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _contiene(columna, texto):
+    return columna.like(f"%{_escapar_like(texto)}%", escape="\\")
+
+
+def buscar_libros(termino, campo="todos", limite=POR_PAGINA, engine=engine):
+    """
+    En MariaDB, titulo/autor/todos usan el índice FULLTEXT (MATCH ... AGAINST en modo
+    booleano) y genero un prefijo sobre su índice. En otros motores (p. ej. SQLite de
+    pruebas) se recurre a LIKE '%...%'. "todos" cubre titulo, autor y genero.
+    """
+    if campo not in CAMPOS_BUSQUEDA:
+        raise ValueError(f"Campo de búsqueda no válido: {campo}")
+
+    consulta = select(*COLUMNAS).limit(limite)
+    if campo == "genero":
+        consulta = consulta.where(Libro.genero.like(f"{_escapar_like(termino)}%", escape="\\"))
+    elif _usa_fulltext(engine) and _consulta_booleana(termino):
+        from sqlalchemy.dialects.mysql import match
+        relevancia = match(Libro.titulo, Libro.autor, Libro.genero,
+                           against=_consulta_booleana(termino)).in_boolean_mode()
+        consulta = consulta.where(relevancia).order_by(relevancia.desc())
+        if campo != "todos":
+            # El índice cubre las tres columnas: cada palabra debe aparecer además en la pedida
+            columna = getattr(Libro, campo)
+            consulta = consulta.where(*(_contiene(columna, p) for p in _palabras(termino)))
+    elif campo == "todos":
+        consulta = consulta.where(_contiene(Libro.titulo, termino) | _contiene(Libro.autor, termino)
+                                  | _contiene(Libro.genero, termino))
+    else:
+        consulta = consulta.where(_contiene(getattr(Libro, campo), termino))
+
+    with engine.connect() as conexion:
+        return [dict(f) for f in conexion.execute(consulta).mappings()]
+
+
+# -----------------------------------------------
+# OPERACIONES MASIVAS (CORE, SIN OBJETOS ORM)
 # -----------------------------------------------
-Base.metadata.create_all(engine)
+CAMPOS = ("titulo", "autor", "genero", "leido")
+TAMANO_LOTE_ESCRITURA = int(os.getenv("MARIADB_TAMANO_LOTE", 1000))
+
+
+def _validar_campos(campos):
+    desconocidos = set(campos) - set(CAMPOS)
+    if desconocidos:
+        raise ValueError(f"Campos no válidos: {', '.join(sorted(desconocidos))}")
+
+
+def _avisar_cache(ids=()):
+    """Invalida la caché compartida en KeyDB (cache_repositorio.py, solo con LIBROS_CACHE=1)."""
+    if os.getenv("LIBROS_CACHE", "0") == "1":
+        from cache_repositorio import invalidar
+        invalidar("mariadb", ids)
+
+
+def _bloques(elementos, lote):
+    elementos = list(elementos)
+    for inicio in range(0, len(elementos), lote):
+        yield elementos[inicio:inicio + lote]
+
+
+def insertar_libros(libros, lote=TAMANO_LOTE_ESCRITURA, engine=engine):
+    """INSERT executemany de dicts con CAMPOS, en bloques de `lote` y una transacción. Devuelve cuántos."""
+    total = 0
+    with engine.begin() as conexion:
+        for bloque in _bloques(libros, lote):
+            filas = [{c: l.get(c, "No" if c == "leido" else None) for c in CAMPOS} for l in bloque]
+            conexion.execute(insert(Libro), filas)
+            total += len(filas)
+    _avisar_cache()
+    return total
+
+
+def actualizar_libros(ids, lote=TAMANO_LOTE_ESCRITURA, engine=engine, **valores):
+    """Los mismos valores para todos los ids: UPDATE ... WHERE id IN (...) por bloque. Devuelve filas afectadas."""
+    _validar_campos(valores)
+    ids = list(ids)
+    total = 0
+    with engine.begin() as conexion:
+        for bloque in _bloques(ids, lote):
+            total += conexion.execute(update(Libro).where(Libro.id.in_(bloque)).values(**valores)).rowcount
+    _avisar_cache(ids)
+    return total
+
+
+def actualizar_cada_libro(cambios, lote=TAMANO_LOTE_ESCRITURA, engine=engine):
+    """
+    Valores distintos por libro: dicts {"id": ..., campo: valor} con los mismos campos,
+    enviados como UPDATE executemany. Devuelve filas afectadas.
+    """
+    cambios = list(cambios)
+    if not cambios:
+        return 0
+    campos = [c for c in cambios[0] if c != "id"]
+    _validar_campos(campos)
+    # Los parámetros no pueden llamarse como las columnas en un UPDATE con bindparam
+    sentencia = (update(Libro.__table__)
+                 .where(Libro.__table__.c.id == bindparam("_id"))
+                 .values({c: bindparam(f"_{c}") for c in campos}))
+    total = 0
+    with engine.begin() as conexion:
+        for bloque in _bloques(cambios, lote):
+            total += conexion.execute(sentencia, [{f"_{k}": v for k, v in c.items()} for c in bloque]).rowcount
+    _avisar_cache(c["id"] for c in cambios)
+    return total
+
+
+def eliminar_libros(ids, lote=TAMANO_LOTE_ESCRITURA, engine=engine):
+    """DELETE ... WHERE id IN (...) por bloque, sin cargar los libros. Devuelve filas borradas."""
+    ids = list(ids)
+    total = 0
+    with engine.begin() as conexion:
+        for bloque in _bloques(ids, lote):
+            total += conexion.execute(delete(Libro).where(Libro.id.in_(bloque))).rowcount
+    _avisar_cache(ids)
+    return total
+
+
+def existe_libro(id_libro, engine=engine):
+    with engine.connect() as conexion:
+        return conexion.execute(select(Libro.id).where(Libro.id == id_libro)).first() is not None
+
 
 # -----------------------------------------------
 # FUNCIONES CRUD
@@ -67,41 +291,40 @@ def agregar_libro():
         genero = input("Género: ")
         leido = input("¿Leído? (Sí/No): ").capitalize()
 
-        nuevo = Libro(titulo=titulo, autor=autor, genero=genero, leido=leido)
-        session.add(nuevo)
-        session.commit()
+        insertar_libros([{"titulo": titulo, "autor": autor, "genero": genero, "leido": leido}])
         print("✅ Libro agregado correctamente.\n")
     except Exception as e:
-        session.rollback()
         print("❌ Error al agregar libro:", e)
 
 
 def ver_libros():
-    libros = session.query(Libro).all()
-    if not libros:
+    total = 0
+    for libro in iterar_libros():
+        if not total:
+            print("\n📚 Lista de libros:")
+            print("-" * 70)
+        total += 1
+        print(f"ID: {libro['id']} | Título: {libro['titulo']} | Autor: {libro['autor']} | Género: {libro['genero']} | Leído: {libro['leido']}")
+    if not total:
         print("📭 No hay libros registrados.\n")
     else:
-        print("\n📚 Lista de libros:")
-        print("-" * 70)
-        for libro in libros:
-            print(f"ID: {libro.id} | Título: {libro.titulo} | Autor: {libro.autor} | Género: {libro.genero} | Leído: {libro.leido}")
         print("-" * 70 + "\n")
 
 
 def buscar_libro():
-    campo = input("Buscar por (titulo/autor/genero): ").lower()
+    campo = input("Buscar por (titulo/autor/genero/todos): ").lower()
     valor = input("Ingrese término de búsqueda: ")
 
-    if campo not in ["titulo", "autor", "genero"]:
+    if campo not in CAMPOS_BUSQUEDA:
         print("❌ Campo no válido.")
         return
 
-    resultados = session.query(Libro).filter(getattr(Libro, campo).like(f"%{valor}%")).all()
+    resultados = buscar_libros(valor, campo)
 
     if resultados:
         print("\n🔎 Resultados de búsqueda:")
         for libro in resultados:
-            print(f"ID: {libro.id} | {libro.titulo} | {libro.autor} | {libro.genero} | Leído: {libro.leido}")
+            print(f"ID: {libro['id']} | {libro['titulo']} | {libro['autor']} | {libro['genero']} | Leído: {libro['leido']}")
         print()
     else:
         print("❌ No se encontraron libros.\n")
@@ -109,8 +332,7 @@ def buscar_libro():
 
 def actualizar_libro():
     id_libro = input("Ingrese el ID del libro a actualizar: ")
-    libro = session.get(Libro, id_libro)
-    if not libro:
+    if not existe_libro(id_libro):
         print("⚠️ No existe un libro con ese ID.\n")
         return
 
@@ -118,26 +340,20 @@ def actualizar_libro():
     nuevo_valor = input(f"Nuevo valor para {campo}: ")
 
     try:
-        setattr(libro, campo, nuevo_valor)
-        session.commit()
+        actualizar_libros([id_libro], **{campo: nuevo_valor})
         print("✅ Libro actualizado correctamente.\n")
     except Exception as e:
-        session.rollback()
         print("❌ Error al actualizar:", e)
 
 
 def eliminar_libro():
     id_libro = input("Ingrese el ID del libro a eliminar: ")
-    libro = session.get(Libro, id_libro)
-    if not libro:
-        print("⚠️ No existe un libro con ese ID.\n")
-        return
     try:
-        session.delete(libro)
-        session.commit()
+        if not eliminar_libros([id_libro]):
+            print("⚠️ No existe un libro con ese ID.\n")
+            return
         print("🗑️ Libro eliminado correctamente.\n")
     except Exception as e:
-        session.rollback()
         print("❌ Error al eliminar libro:", e)
 
 
@@ -170,7 +386,7 @@ def menu():
             eliminar_libro()
         elif opcion == "6":
             print("👋 Saliendo del programa...")
-            session.close()
+            engine.dispose()
             break
         else:
             print("❌ Opción inválida.\n")
@@ -180,4 +396,8 @@ def menu():
 # EJECUCIÓN PRINCIPAL
 # -----------------------------------------------
 if __name__ == "__main__":
-    menu()
+    if len(sys.argv) > 1 and sys.argv[1] == "migrar":
+        migrar()
+        print("✅ Tablas creadas/actualizadas.")
+    else:
+        menu()
@@ -3,14 +3,19 @@
 # la gestión de una biblioteca personal con SQLite
 # ===============================================
 
-import sqlite3
+import re
+
+from sqlite_conexion import abrir_conexion, PERFIL
+
+CAMPOS_BUSQUEDA = ("titulo", "autor", "genero")
 
 # -----------------------------------------------
 # Conexión y creación de la base de datos
 # -----------------------------------------------
-def conectar():
-    """Conecta con la base de datos y crea la tabla si no existe."""
-    conexion = sqlite3.connect("biblioteca.db")
+def conectar(ruta="biblioteca.db", perfil=PERFIL):
+    """Conecta con la base de datos y crea la tabla (y su índice de texto) si no existen."""
+    # WAL, PRAGMAs de rendimiento y claves foráneas (ver sqlite_conexion.py)
+    conexion = abrir_conexion(ruta, perfil)
     cursor = conexion.cursor()
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS libros (
@@ -21,10 +26,78 @@ def conectar():
             leido TEXT CHECK(leido IN ('Sí', 'No')) NOT NULL DEFAULT 'No'
         );
     """)
+    crear_indice_fts(conexion)
     conexion.commit()
     return conexion
 
 
+def crear_indice_fts(conexion):
+    """
+    Crea la tabla FTS5 `libros_fts` (índice de texto completo sobre titulo, autor
+    y genero) y los triggers que la mantienen sincronizada con `libros`.
+    Si la tabla no existía se llena con los libros ya guardados (migración).
+    """
+    cursor = conexion.cursor()
+    existia = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'libros_fts'"
+    ).fetchone()
+    cursor.executescript("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS libros_fts USING fts5(
+            titulo, autor, genero,
+            content='libros', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+        CREATE TRIGGER IF NOT EXISTS libros_fts_insert AFTER INSERT ON libros BEGIN
+            INSERT INTO libros_fts(rowid, titulo, autor, genero)
+            VALUES (new.id, new.titulo, new.autor, new.genero);
+        END;
+        CREATE TRIGGER IF NOT EXISTS libros_fts_delete AFTER DELETE ON libros BEGIN
+            INSERT INTO libros_fts(libros_fts, rowid, titulo, autor, genero)
+            VALUES ('delete', old.id, old.titulo, old.autor, old.genero);
+        END;
+        CREATE TRIGGER IF NOT EXISTS libros_fts_update AFTER UPDATE OF titulo, autor, genero ON libros BEGIN
+            INSERT INTO libros_fts(libros_fts, rowid, titulo, autor, genero)
+            VALUES ('delete', old.id, old.titulo, old.autor, old.genero);
+            INSERT INTO libros_fts(rowid, titulo, autor, genero)
+            VALUES (new.id, new.titulo, new.autor, new.genero);
+        END;
+    """)
+    if not existia:
+        cursor.execute("INSERT INTO libros_fts(libros_fts) VALUES ('rebuild')")
+
+
+def consulta_fts(termino, campo=None):
+    """
+    Convierte el texto del usuario en una consulta FTS5: cada palabra se busca
+    como prefijo ("garc" encuentra "García") y opcionalmente en un solo campo.
+    """
+    palabras = re.findall(r"\w+", termino)
+    if not palabras:
+        return None
+    consulta = " ".join(f'"{p}"*' for p in palabras)
+    return f"{campo} : ({consulta})" if campo else consulta
+
+
+def buscar_fts(conexion, termino, campo=None, limite=50):
+    """
+    Busca en todos los campos (o en `campo`) y ordena por relevancia (bm25).
+    Con limite=None devuelve todas las coincidencias.
+    """
+    consulta = consulta_fts(termino, campo)
+    if consulta is None:
+        return []
+    cursor = conexion.cursor()
+    # Pesos bm25: una coincidencia en el título cuenta más que en el autor o el género
+    cursor.execute("""
+        SELECT l.id, l.titulo, l.autor, l.genero, l.leido
+        FROM libros_fts JOIN libros l ON l.id = libros_fts.rowid
+        WHERE libros_fts MATCH ?
+        ORDER BY bm25(libros_fts, 10.0, 5.0, 1.0)
+        LIMIT ?
+    """, (consulta, -1 if limite is None else limite))
+    return cursor.fetchall()
+
+
 # -----------------------------------------------
 # Funciones CRUD (Crear, Leer, Actualizar, Borrar)
 # -----------------------------------------------
@@ -59,14 +132,16 @@ def ver_libros(conexion):
 
 
 def buscar_libro(conexion):
-    """Permite buscar libros por título, autor o género."""
-    campo = input("Buscar por (titulo/autor/genero): ").lower()
+    """Permite buscar libros por título, autor, género o en todos los campos."""
+    campo = input("Buscar por (titulo/autor/genero/todos): ").lower() or "todos"
     valor = input("Ingrese término de búsqueda: ")
 
-    cursor = conexion.cursor()
-    query = f"SELECT * FROM libros WHERE {campo} LIKE ?"
-    cursor.execute(query, ('%' + valor + '%',))
-    resultados = cursor.fetchall()
+    if campo not in CAMPOS_BUSQUEDA + ("todos",):
+        print("❌ Campo no válido.\n")
+        return
+
+    # Búsqueda de texto completo con FTS5, ordenada por relevancia
+    resultados = buscar_fts(conexion, valor, None if campo == "todos" else campo, limite=None)
 
     if resultados:
         print("\n🔎 Resultados de búsqueda:")
@@ -0,0 +1,104 @@
+# ===============================================
+# 🧠 Caché en memoria (por proceso) para libros
+# LRU + TTL, invalidada por versión en KeyDB
+# ===============================================
+#
+# Cada escritura (guardar_libro / eliminar_libro en keydb_indices.py) hace
+# INCR de CLAVE_VERSION y PUBLISH en CANAL_CAMBIOS. Cada proceso (por ejemplo,
+# cada worker de gunicorn) descarta su caché cuando la versión cambia:
+#   - sin pub/sub: se consulta la versión con un GET antes de cada lectura
+#   - con pub/sub: un hilo escucha CANAL_CAMBIOS y vacía la caché al instante
+
+import threading
+import time
+from collections import OrderedDict
+
+CLAVE_VERSION = "libros:version"
+CANAL_CAMBIOS = "libros:cambios"
+
+
+class CacheLibros:
+    """Caché LRU con caducidad, coherente entre procesos gracias a la versión."""
+
+    def __init__(self, db, capacidad=1024, ttl=30, escuchar_cambios=False):
+        self.db = db
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entradas = OrderedDict()
+        self._version = None
+        # Sube en cada vaciado: una carga empezada antes no se guarda después
+        self._generacion = 0
+        self._lock = threading.Lock()
+        self._hilo = None
+        if escuchar_cambios:
+            self._escuchar()
+
+    # -------------------------------------------
+    # Invalidación
+    # -------------------------------------------
+    def _escuchar(self):
+        """Suscribe un hilo a CANAL_CAMBIOS que vacía la caché en cada escritura."""
+        pubsub = self.db.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{CANAL_CAMBIOS: lambda mensaje: self.limpiar()})
+        self._hilo = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def _comprobar_version(self):
+        """Sin pub/sub, un GET de la versión decide si la caché sigue siendo válida."""
+        if self._hilo is not None:
+            return
+        version = self.db.get(CLAVE_VERSION)
+        with self._lock:
+            if version != self._version:
+                self._entradas.clear()
+                self._generacion += 1
+                self._version = version
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._generacion += 1
+
+    # -------------------------------------------
+    # Lectura a través de la caché
+    # -------------------------------------------
+    def obtener(self, clave, cargar):
+        """
+        Devuelve el valor cacheado para `clave` o lo calcula con `cargar()`.
+        Los valores devueltos se comparten entre peticiones: no modificarlos.
+        """
+        self._comprobar_version()
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada and entrada[0] > ahora:
+                self._entradas.move_to_end(clave)
+                self.hits += 1
+                return entrada[1]
+            self.misses += 1
+            generacion = self._generacion
+
+        valor = cargar()
+        with self._lock:
+            # Si la caché se vació durante la carga, el valor puede ser anterior a la escritura
+            if generacion != self._generacion:
+                return valor
+            self._entradas[clave] = (ahora + self.ttl, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+        return valor
+
+    def estadisticas(self):
+        """Contadores para dimensionar la caché."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "ratio_aciertos": round(self.hits / total, 4) if total else 0.0,
+            "entradas": len(self._entradas),
+            "capacidad": self.capacidad,
+            "ttl": self.ttl,
+            "pubsub": self._hilo is not None
+        }
@@ -0,0 +1,292 @@
+# ===============================================
+# 🧠 Caché compartida en KeyDB para MariaDB y MongoDB
+# Cache-aside con TTL, invalidación y cerrojo single-flight
+# ===============================================
+#
+# Envuelve cualquier repositorio de repositorio_libros.py (se activa con
+# LIBROS_CACHE=1 o crear_repositorio(..., cache=True)). A diferencia de
+# CacheLibros (en memoria, por proceso), esta caché vive en KeyDB y la comparten
+# todos los workers.
+#
+# Claves (prefijo cache:{backend}):
+#   :libro:{id}                                   JSON del libro ("null" si no existe), con TTL
+#   :version:{id}                                 INCR en cada escritura del libro
+#   :busqueda:{generacion}:{campo}:{limite}:{q}   JSON con los resultados, con TTL
+#   :generacion                                   INCR en cada escritura
+#   {clave}:cerrojo                               SET NX PX mientras un worker carga la clave
+#
+# Las escrituras borran la entrada del libro y suben su versión y la generación:
+# las búsquedas antiguas dejan de leerse y caducan solas. Un libro cargado del
+# backend solo se guarda si su versión no cambió durante la carga (así una
+# lectura lenta no reescribe un valor anterior a una escritura). Con
+# CACHE_ESCRITURA_DIRECTA=1 las actualizaciones vuelven a escribir el libro.
+# Si KeyDB falla, se lee directamente del backend.
+#
+# Las escrituras que no pasan por RepositorioCacheado (menús de biblioteca_mariadb.py
+# y biblioteca_mongodb.py, importar_exportar.py) llaman a invalidar().
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+
+import redis
+
+from repositorio_libros import RepositorioLibros, LIMITE_BUSQUEDA, POR_PAGINA, conectar_keydb
+
+TTL_LIBRO = int(os.getenv("CACHE_TTL_LIBRO", 300))
+TTL_BUSQUEDA = int(os.getenv("CACHE_TTL_BUSQUEDA", 60))
+# Los "no existe" se guardan menos tiempo
+TTL_NEGATIVO = int(os.getenv("CACHE_TTL_NEGATIVO", 30))
+# Las versiones deben sobrevivir a cualquier carga en curso; caducan para no acumularse
+TTL_VERSION = 24 * 3600
+ESCRITURA_DIRECTA = os.getenv("CACHE_ESCRITURA_DIRECTA", "0") == "1"
+# Cerrojo: lo que puede tardar una carga antes de que otro worker lo reintente
+CERROJO_MS = 5000
+ESPERA_MAXIMA = 2.0
+INTERVALO_ESPERA = 0.02
+
+# Borra el cerrojo solo si sigue siendo nuestro (pudo caducar y tomarlo otro worker)
+LIBERAR_CERROJO = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Guarda el valor solo si la versión del libro sigue siendo la leída antes de cargarlo
+GUARDAR_SI_VERSION = """
+if (redis.call("get", KEYS[2]) or "") == ARGV[1] then
+    redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# Verdadero mientras RepositorioCacheado escribe en el backend: ya invalida él
+_gestionada = contextvars.ContextVar("cache_gestionada", default=False)
+
+
+def _invalidar_claves(db, prefijo, ids=()):
+    """
+    Borra los libros `ids`, sube sus versiones y la generación de búsquedas en una
+    transacción. Devuelve las versiones nuevas, en el orden de `ids`.
+    """
+    pipe = db.pipeline(transaction=True)
+    for id_libro in ids:
+        pipe.delete(f"{prefijo}:libro:{id_libro}")
+        pipe.incr(f"{prefijo}:version:{id_libro}")
+        pipe.expire(f"{prefijo}:version:{id_libro}", TTL_VERSION)
+    pipe.incr(f"{prefijo}:generacion")
+    return pipe.execute()[1:-1:3]
+
+
+class RepositorioCacheado(RepositorioLibros):
+    """Cache-aside sobre otro repositorio; las lecturas por id y las búsquedas pasan por KeyDB."""
+
+    def __init__(self, repo, db, ttl=TTL_LIBRO, ttl_busqueda=TTL_BUSQUEDA,
+                 escritura_directa=ESCRITURA_DIRECTA):
+        self.repo = repo
+        self.db = db
+        self.nombre = f"{repo.nombre}+cache"
+        self.prefijo = f"cache:{repo.nombre}"
+        self.ttl = ttl
+        self.ttl_busqueda = ttl_busqueda
+        self.escritura_directa = escritura_directa
+        self._liberar = db.register_script(LIBERAR_CERROJO)
+        self._guardar_si_version = db.register_script(GUARDAR_SI_VERSION)
+        self._lock = threading.Lock()
+        self.contadores = dict.fromkeys(
+            ("hits", "misses", "esperas", "cargas_sin_cerrojo", "descartes", "errores"), 0
+        )
+
+    def _contar(self, nombre):
+        with self._lock:
+            self.contadores[nombre] += 1
+
+    # -------------------------------------------
+    # Lectura con cerrojo single-flight
+    # -------------------------------------------
+    def _guardar(self, clave, valor, ttl, clave_version=None, version=""):
+        datos = json.dumps(valor, ensure_ascii=False)
+        ttl = ttl if valor is not None else TTL_NEGATIVO
+        if clave_version is None:
+            self.db.set(clave, datos, ex=ttl)
+        elif not self._guardar_si_version(keys=[clave, clave_version], args=[version, datos, ttl]):
+            # Hubo una escritura durante la carga: el valor puede ser anterior a ella
+            self._contar("descartes")
+
+    def _cargar_con_cerrojo(self, clave, cargar, ttl, clave_version=None):
+        """
+        Solo el worker que consigue el cerrojo consulta el backend; el resto espera a
+        que la clave aparezca y, si el cerrojo se libera sin valor (la carga se descartó),
+        lo vuelve a intentar. Pasado ESPERA_MAXIMA consulta por su cuenta.
+        """
+        cerrojo = f"{clave}:cerrojo"
+        token = uuid.uuid4().hex
+        fin = time.monotonic() + ESPERA_MAXIMA
+        esperando = False
+        while True:
+            if self.db.set(cerrojo, token, nx=True, px=CERROJO_MS):
+                try:
+                    # La versión se lee antes de cargar: si cambia, la carga no se guarda
+                    version = (self.db.get(clave_version) or "") if clave_version else ""
+                    valor = cargar()
+                    self._guardar(clave, valor, ttl, clave_version, version)
+                    return valor
+                finally:
+                    self._liberar(keys=[cerrojo], args=[token])
+
+            if not esperando:
+                self._contar("esperas")
+                esperando = True
+            if time.monotonic() >= fin:
+                break
+            time.sleep(INTERVALO_ESPERA)
+            datos = self.db.get(clave)
+            if datos is not None:
+                return json.loads(datos)
+        self._contar("cargas_sin_cerrojo")
+        return cargar()
+
+    def _obtener(self, clave, cargar, ttl, clave_version=None):
+        try:
+            datos = self.db.get(clave)
+            if datos is not None:
+                self._contar("hits")
+                return json.loads(datos)
+            self._contar("misses")
+            return self._cargar_con_cerrojo(clave, cargar, ttl, clave_version)
+        except redis.RedisError:
+            self._contar("errores")
+            return cargar()
+
+    def _clave_libro(self, id_libro):
+        return f"{self.prefijo}:libro:{id_libro}"
+
+    def _clave_version(self, id_libro):
+        return f"{self.prefijo}:version:{id_libro}"
+
+    def _generacion(self):
+        return self.db.get(f"{self.prefijo}:generacion") or "0"
+
+    # -------------------------------------------
+    # Invalidación
+    # -------------------------------------------
+    def _invalidar(self, ids=()):
+        """Invalida los libros `ids` y las búsquedas; devuelve sus versiones nuevas ([] si KeyDB falla)."""
+        try:
+            return _invalidar_claves(self.db, self.prefijo, ids)
+        except redis.RedisError:
+            self._contar("errores")
+            return []
+
+    def _escribir(self, operacion, *args):
+        """Ejecuta una escritura del backend sin que este vuelva a invalidar (invalidar())."""
+        marca = _gestionada.set(True)
+        try:
+            return operacion(*args)
+        finally:
+            _gestionada.reset(marca)
+
+    # -------------------------------------------
+    # Interfaz de RepositorioLibros
+    # -------------------------------------------
+    def agregar(self, libro):
+        id_libro = self._escribir(self.repo.agregar, libro)
+        # Borra un posible "no existe" cacheado y caduca las búsquedas
+        self._invalidar([id_libro])
+        return id_libro
+
+    def agregar_varios(self, libros):
+        total = self._escribir(self.repo.agregar_varios, libros)
+        self._invalidar()
+        return total
+
+    def obtener(self, id_libro):
+        return self._obtener(self._clave_libro(id_libro), lambda: self.repo.obtener(id_libro),
+                             self.ttl, self._clave_version(id_libro))
+
+    def pagina(self, despues=None, por_pagina=POR_PAGINA):
+        return self.repo.pagina(despues, por_pagina)
+
+    def pagina_numero(self, pagina=1, por_pagina=POR_PAGINA):
+        return self.repo.pagina_numero(pagina, por_pagina)
+
+    def buscar(self, termino, campo="todos", limite=LIMITE_BUSQUEDA):
+        try:
+            generacion = self._generacion()
+        except redis.RedisError:
+            self._contar("errores")
+            return self.repo.buscar(termino, campo, limite)
+        # Sin quitar acentos: algunos backends distinguen "garcia" de "garcía"
+        consulta = termino.strip().casefold()
+        clave = f"{self.prefijo}:busqueda:{generacion}:{campo}:{limite}:{consulta}"
+        return self._obtener(clave, lambda: self.repo.buscar(termino, campo, limite), self.ttl_busqueda)
+
+    def actualizar(self, id_libro, valores):
+        existia = self._escribir(self.repo.actualizar, id_libro, valores)
+        if existia:
+            versiones = self._invalidar([id_libro])
+            if self.escritura_directa and versiones:
+                # Con la versión recién creada: si otra escritura la adelanta, no se guarda
+                try:
+                    self._guardar(self._clave_libro(id_libro), self.repo.obtener(id_libro), self.ttl,
+                                  self._clave_version(id_libro), str(versiones[0]))
+                except redis.RedisError:
+                    self._contar("errores")
+        return existia
+
+    def eliminar(self, id_libro):
+        existia = self._escribir(self.repo.eliminar, id_libro)
+        self._invalidar([id_libro])
+        return existia
+
+    def cerrar(self):
+        self.repo.cerrar()
+        self.db.close()
+
+    def estadisticas(self):
+        """Contadores de este proceso y parámetros de la caché."""
+        with self._lock:
+            contadores = dict(self.contadores)
+        total = contadores["hits"] + contadores["misses"]
+        return {
+            "backend": self.repo.nombre,
+            **contadores,
+            "ratio_aciertos": round(contadores["hits"] / total, 4) if total else 0.0,
+            "ttl": self.ttl,
+            "ttl_busqueda": self.ttl_busqueda,
+            "escritura_directa": self.escritura_directa,
+        }
+
+
+# -----------------------------------------------
+# Invalidación desde fuera del repositorio
+# -----------------------------------------------
+_conexion = None
+_lock_conexion = threading.Lock()
+
+
+def _keydb():
+    global _conexion
+    with _lock_conexion:
+        if _conexion is None:
+            _conexion = conectar_keydb()
+        return _conexion
+
+
+def invalidar(backend, ids=()):
+    """
+    Invalida la caché de `backend` tras una escritura hecha directamente en él.
+    Sin ids (p. ej. inserciones masivas) solo caducan las búsquedas. No hace nada
+    con LIBROS_CACHE distinto de 1 ni si la escritura viene de RepositorioCacheado.
+    """
+    if os.getenv("LIBROS_CACHE", "0") != "1" or _gestionada.get():
+        return
+    try:
+        _invalidar_claves(_keydb(), f"cache:{backend}", [str(i) for i in ids])
+    except redis.RedisError as e:
+        print(f"⚠️ No se pudo invalidar la caché de {backend}:", e)
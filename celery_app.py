@@ -29,13 +29,14 @@ def make_celery(app):
 # envía correos asíncronos con Celery.
 
 import os
-import json
 import uuid
 from dotenv import load_dotenv
 from flask import Flask, render_template, request, redirect, url_for, flash
 from flask_mail import Mail, Message
 import redis
 from celery_app import make_celery
+from keydb_libros import obtener_todos, leer_libro
+from keydb_indices import guardar_libro, eliminar_libro
 
 # Cargar variables de entorno desde .env
 load_dotenv()
@@ -75,18 +76,11 @@ db = redis.Redis(host=KEYDB_HOST, port=KEYDB_PORT, password=KEYDB_PASSWORD, deco
 # Auxiliares (almacenamiento simple en KeyDB)
 # -------------------------
 def obtener_libros():
-    keys = db.keys("libro:*")
-    libros = []
-    for k in keys:
-        try:
-            libros.append(json.loads(db.get(k)))
-        except Exception:
-            continue
+    libros = obtener_todos(db)
     return sorted(libros, key=lambda x: x.get("titulo", "").lower())
 
 def obtener_libro(id_libro):
-    data = db.get(f"libro:{id_libro}")
-    return json.loads(data) if data else None
+    return leer_libro(db, id_libro)
 
 # -------------------------
 # Tarea asíncrona: envío de correo
@@ -135,7 +129,7 @@ def add_book():
 
         libro_id = str(uuid.uuid4())
         libro = {"id": libro_id, "titulo": titulo, "autor": autor, "genero": genero, "leido": leido}
-        db.set(f"libro:{libro_id}", json.dumps(libro))
+        guardar_libro(db, libro)
 
         # Llamada asíncrona para enviar correo
         destino = os.getenv("MAIL_NOTIFICATION_TO", app.config["MAIL_USERNAME"])
@@ -158,7 +152,7 @@ def delete_book(id_libro):
         return redirect(url_for("index"))
 
     if request.method == "POST":
-        db.delete(f"libro:{id_libro}")
+        eliminar_libro(db, libro)
 
         # Envío asíncrono de notificación
         destino = os.getenv("MAIL_NOTIFICATION_TO", app.config["MAIL_USERNAME"])
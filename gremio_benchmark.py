@@ -0,0 +1,127 @@
+# ===============================================
+# ⏱️ Benchmark del Gremio de Aventureros
+# Joins y agregaciones representativas con informe JSON
+# ===============================================
+#
+# Uso:
+#   python gremio_benchmark.py [ruta_db] [informe.json] [informe_anterior.json]
+# Con un informe anterior se muestra la variación de cada consulta, para
+# comparar cambios de esquema o de índices entre ejecuciones.
+
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from gremio_clasificaciones import misiones_mas_peligrosas, top_heroes
+from gremio_consultas import (
+    heroes_por_mision, misiones_con_monstruo, misiones_de_heroe,
+    recompensa_total_por_heroe, amenaza_por_mision,
+)
+from sqlite_conexion import abrir_conexion, PERFIL
+
+REPETICIONES = 5
+MUESTRA = 1000
+
+
+def consultas(conexion, azar):
+    """{nombre: función sin argumentos} con las consultas a medir."""
+    max_heroe = conexion.execute("SELECT MAX(id) FROM heroes").fetchone()[0] or 1
+    max_mision = conexion.execute("SELECT MAX(id) FROM misiones").fetchone()[0] or 1
+    max_monstruo = conexion.execute("SELECT MAX(id) FROM monstruos").fetchone()[0] or 1
+    heroes = [azar.randint(1, max_heroe) for _ in range(MUESTRA)]
+    misiones = [azar.randint(1, max_mision) for _ in range(MUESTRA)]
+    monstruos = [azar.randint(1, max_monstruo) for _ in range(MUESTRA // 10)]
+
+    def sql(texto):
+        return lambda: conexion.execute(texto).fetchall()
+
+    medidas = {
+        "top10_heroes_por_recompensa": sql("""
+            SELECT mh.id_heroe, SUM(m.recompensa) AS total
+            FROM misiones_heroes mh JOIN misiones m ON m.id = mh.id_mision
+            GROUP BY mh.id_heroe ORDER BY total DESC LIMIT 10"""),
+        "top10_misiones_mas_peligrosas": sql("""
+            SELECT mm.id_mision, SUM(mo.nivel_amenaza) AS amenaza
+            FROM misiones_monstruos mm JOIN monstruos mo ON mo.id = mm.id_monstruo
+            GROUP BY mm.id_mision ORDER BY amenaza DESC LIMIT 10"""),
+        "heroes_por_clase": sql("SELECT clase, COUNT(*) FROM heroes GROUP BY clase"),
+        "recompensa_media_por_dificultad": sql(
+            "SELECT dificultad, AVG(recompensa) FROM misiones GROUP BY dificultad"),
+        "misiones_epicas_con_dragones": sql("""
+            SELECT COUNT(DISTINCT m.id)
+            FROM misiones m
+            JOIN misiones_monstruos mm ON mm.id_mision = m.id
+            JOIN monstruos mo ON mo.id = mm.id_monstruo
+            WHERE m.dificultad = 'Épica' AND mo.tipo = 'Dragón' AND mo.nivel_amenaza >= 8"""),
+        f"heroes_por_mision_x{MUESTRA}": lambda: heroes_por_mision(conexion, misiones),
+        f"recompensa_por_heroe_x{MUESTRA}": lambda: recompensa_total_por_heroe(conexion, heroes),
+        f"amenaza_por_mision_x{MUESTRA}": lambda: amenaza_por_mision(conexion, misiones),
+        f"misiones_de_heroe_x{MUESTRA}": lambda: [misiones_de_heroe(conexion, h) for h in heroes],
+        f"misiones_con_monstruo_x{MUESTRA // 10}": lambda: [misiones_con_monstruo(conexion, m) for m in monstruos],
+    }
+    # Mismas clasificaciones leídas de las tablas resumen, si están instaladas
+    if conexion.execute("SELECT 1 FROM sqlite_master WHERE name = 'resumen_heroes'").fetchone():
+        medidas["top10_heroes_materializado"] = lambda: top_heroes(conexion, 10)
+        medidas["top10_misiones_materializado"] = lambda: misiones_mas_peligrosas(conexion, 10)
+    return medidas
+
+
+def medir(funcion, repeticiones=REPETICIONES):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return {"mediana_ms": round(statistics.median(tiempos), 3), "min_ms": round(min(tiempos), 3)}
+
+
+def ejecutar(ruta, semilla=42):
+    conexion = abrir_conexion(ruta)
+    filas = {
+        tabla: conexion.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+        for tabla in ("heroes", "misiones", "monstruos", "misiones_heroes", "misiones_monstruos")
+    }
+    indices = [fila[0] for fila in conexion.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name")]
+    resultados = {nombre: medir(f) for nombre, f in consultas(conexion, random.Random(semilla)).items()}
+    conexion.close()
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "base_datos": ruta,
+        "sqlite": sqlite3.sqlite_version,
+        "perfil": PERFIL,
+        "filas": filas,
+        "indices": indices,
+        "consultas": resultados,
+    }
+
+
+def comparar(actual, anterior):
+    """Imprime la variación de la mediana de cada consulta respecto a un informe anterior."""
+    for nombre, medida in actual["consultas"].items():
+        previa = anterior["consultas"].get(nombre)
+        if not previa:
+            continue
+        cambio = medida["mediana_ms"] / max(previa["mediana_ms"], 1e-9)
+        print(f"  {nombre}: {previa['mediana_ms']} ms -> {medida['mediana_ms']} ms (x{cambio:.2f})")
+
+
+if __name__ == "__main__":
+    ruta = sys.argv[1] if len(sys.argv) > 1 else "gremio_benchmark.db"
+    salida = sys.argv[2] if len(sys.argv) > 2 else "gremio_benchmark.json"
+
+    informe = ejecutar(ruta)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    for nombre, medida in informe["consultas"].items():
+        print(f"  {nombre}: {medida['mediana_ms']} ms")
+    print(f"✅ Informe guardado en {salida}")
+
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], encoding="utf-8") as f:
+            print("\n📊 Comparación con el informe anterior:")
+            comparar(informe, json.load(f))
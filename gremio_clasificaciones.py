@@ -0,0 +1,257 @@
+# ===============================================
+# 🏆 Clasificaciones materializadas del Gremio
+# Tablas resumen mantenidas por triggers de SQLite
+# ===============================================
+#
+# Uso:
+#   python gremio_clasificaciones.py instalar    [ruta_db]   crea tablas + triggers y reconstruye
+#   python gremio_clasificaciones.py reconstruir [ruta_db]   recalcula los resúmenes desde cero
+#   python gremio_clasificaciones.py verificar   [ruta_db]   compara resúmenes con el agregado real
+#   python gremio_clasificaciones.py top         [ruta_db]   muestra las dos clasificaciones
+#
+# resumen_heroes:   recompensa total y número de misiones de cada héroe
+# resumen_misiones: amenaza total y número de monstruos de cada misión
+#
+# Los triggers actualizan los resúmenes en cada INSERT/DELETE de misiones_heroes y
+# misiones_monstruos, y cuando cambia misiones.recompensa o monstruos.nivel_amenaza.
+# Al borrar una misión o un monstruo se eliminan antes sus filas relacionales (BEFORE
+# DELETE), para que los triggers aún puedan leer la recompensa o la amenaza; el
+# ON DELETE CASCADE ya no encuentra nada que borrar.
+# Cambiar id_heroe/id_mision de una fila relacional existente no está cubierto:
+# se modela como DELETE + INSERT (o se ejecuta "reconstruir").
+#
+# Para cargas masivas es más rápido cargar sin triggers y ejecutar "instalar" al final.
+
+import sys
+
+from gremio_consultas import RUTA_DB
+from sqlite_conexion import abrir_conexion
+
+# -----------------------------------------------------
+# Esquema
+# -----------------------------------------------------
+TABLAS = [
+    """
+    CREATE TABLE IF NOT EXISTS resumen_heroes (
+        id_heroe INTEGER PRIMARY KEY,
+        recompensa_total INTEGER NOT NULL DEFAULT 0,
+        misiones INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resumen_misiones (
+        id_mision INTEGER PRIMARY KEY,
+        amenaza_total INTEGER NOT NULL DEFAULT 0,
+        monstruos INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    # Índices de las clasificaciones: ORDER BY ... DESC LIMIT n sin ordenar la tabla
+    "CREATE INDEX IF NOT EXISTS idx_resumen_heroes_recompensa ON resumen_heroes(recompensa_total)",
+    "CREATE INDEX IF NOT EXISTS idx_resumen_misiones_amenaza ON resumen_misiones(amenaza_total)",
+]
+
+TRIGGERS = {
+    # --- misiones_heroes -> resumen_heroes ---
+    "trg_mh_insertar": """
+        AFTER INSERT ON misiones_heroes BEGIN
+            INSERT INTO resumen_heroes (id_heroe, recompensa_total, misiones)
+            VALUES (NEW.id_heroe, (SELECT recompensa FROM misiones WHERE id = NEW.id_mision), 1)
+            ON CONFLICT(id_heroe) DO UPDATE SET
+                recompensa_total = recompensa_total + excluded.recompensa_total,
+                misiones = misiones + 1;
+        END""",
+    "trg_mh_borrar": """
+        AFTER DELETE ON misiones_heroes BEGIN
+            UPDATE resumen_heroes SET
+                recompensa_total = recompensa_total - (SELECT recompensa FROM misiones WHERE id = OLD.id_mision),
+                misiones = misiones - 1
+            WHERE id_heroe = OLD.id_heroe;
+        END""",
+    # --- misiones_monstruos -> resumen_misiones ---
+    "trg_mm_insertar": """
+        AFTER INSERT ON misiones_monstruos BEGIN
+            INSERT INTO resumen_misiones (id_mision, amenaza_total, monstruos)
+            VALUES (NEW.id_mision, (SELECT nivel_amenaza FROM monstruos WHERE id = NEW.id_monstruo), 1)
+            ON CONFLICT(id_mision) DO UPDATE SET
+                amenaza_total = amenaza_total + excluded.amenaza_total,
+                monstruos = monstruos + 1;
+        END""",
+    "trg_mm_borrar": """
+        AFTER DELETE ON misiones_monstruos BEGIN
+            UPDATE resumen_misiones SET
+                amenaza_total = amenaza_total - (SELECT nivel_amenaza FROM monstruos WHERE id = OLD.id_monstruo),
+                monstruos = monstruos - 1
+            WHERE id_mision = OLD.id_mision;
+        END""",
+    # --- cambios de valor en las tablas base ---
+    "trg_misiones_recompensa": """
+        AFTER UPDATE OF recompensa ON misiones BEGIN
+            UPDATE resumen_heroes SET recompensa_total = recompensa_total + NEW.recompensa - OLD.recompensa
+            WHERE id_heroe IN (SELECT id_heroe FROM misiones_heroes WHERE id_mision = NEW.id);
+        END""",
+    "trg_monstruos_amenaza": """
+        AFTER UPDATE OF nivel_amenaza ON monstruos BEGIN
+            UPDATE resumen_misiones SET amenaza_total = amenaza_total + NEW.nivel_amenaza - OLD.nivel_amenaza
+            WHERE id_mision IN (SELECT id_mision FROM misiones_monstruos WHERE id_monstruo = NEW.id);
+        END""",
+    # --- borrados en las tablas base (antes del ON DELETE CASCADE) ---
+    "trg_misiones_borrar": """
+        BEFORE DELETE ON misiones BEGIN
+            DELETE FROM misiones_heroes WHERE id_mision = OLD.id;
+            DELETE FROM misiones_monstruos WHERE id_mision = OLD.id;
+            DELETE FROM resumen_misiones WHERE id_mision = OLD.id;
+        END""",
+    "trg_monstruos_borrar": """
+        BEFORE DELETE ON monstruos BEGIN
+            DELETE FROM misiones_monstruos WHERE id_monstruo = OLD.id;
+        END""",
+    "trg_heroes_borrar": """
+        BEFORE DELETE ON heroes BEGIN
+            DELETE FROM resumen_heroes WHERE id_heroe = OLD.id;
+        END""",
+}
+
+
+def instalar(conexion):
+    """Crea (si no existen) las tablas resumen y sus triggers, y las reconstruye."""
+    with conexion:
+        for sql in TABLAS:
+            conexion.execute(sql)
+        for nombre, cuerpo in TRIGGERS.items():
+            conexion.execute(f"CREATE TRIGGER IF NOT EXISTS {nombre} {cuerpo}")
+    reconstruir(conexion)
+
+
+def desinstalar(conexion):
+    """Elimina triggers y tablas resumen (p. ej. antes de una carga masiva)."""
+    with conexion:
+        for nombre in TRIGGERS:
+            conexion.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+        conexion.execute("DROP TABLE IF EXISTS resumen_heroes")
+        conexion.execute("DROP TABLE IF EXISTS resumen_misiones")
+
+
+# -----------------------------------------------------
+# Reconstrucción completa
+# -----------------------------------------------------
+SQL_AGREGADO_HEROES = """
+    SELECT mh.id_heroe, SUM(m.recompensa), COUNT(*)
+    FROM misiones_heroes mh JOIN misiones m ON m.id = mh.id_mision
+    GROUP BY mh.id_heroe
+"""
+
+SQL_AGREGADO_MISIONES = """
+    SELECT mm.id_mision, SUM(mo.nivel_amenaza), COUNT(*)
+    FROM misiones_monstruos mm JOIN monstruos mo ON mo.id = mm.id_monstruo
+    GROUP BY mm.id_mision
+"""
+
+
+def reconstruir(conexion):
+    """Recalcula ambos resúmenes con un único agregado en una transacción."""
+    with conexion:
+        conexion.execute("DELETE FROM resumen_heroes")
+        conexion.execute("DELETE FROM resumen_misiones")
+        conexion.execute(f"INSERT INTO resumen_heroes (id_heroe, recompensa_total, misiones) {SQL_AGREGADO_HEROES}")
+        conexion.execute(f"INSERT INTO resumen_misiones (id_mision, amenaza_total, monstruos) {SQL_AGREGADO_MISIONES}")
+    conexion.execute("ANALYZE resumen_heroes")
+    conexion.execute("ANALYZE resumen_misiones")
+    conexion.commit()
+
+
+# -----------------------------------------------------
+# Lecturas
+# -----------------------------------------------------
+def top_heroes(conexion, n=10):
+    """[(id, nombre, clase, recompensa_total, misiones)] de los n héroes con más recompensa."""
+    return conexion.execute("""
+        SELECT h.id, h.nombre, h.clase, r.recompensa_total, r.misiones
+        FROM resumen_heroes r JOIN heroes h ON h.id = r.id_heroe
+        ORDER BY r.recompensa_total DESC LIMIT ?
+    """, (n,)).fetchall()
+
+
+def misiones_mas_peligrosas(conexion, n=10):
+    """[(id, nombre, dificultad, amenaza_total, monstruos)] de las n misiones más peligrosas."""
+    return conexion.execute("""
+        SELECT m.id, m.nombre, m.dificultad, r.amenaza_total, r.monstruos
+        FROM resumen_misiones r JOIN misiones m ON m.id = r.id_mision
+        ORDER BY r.amenaza_total DESC LIMIT ?
+    """, (n,)).fetchall()
+
+
+def recompensa_de_heroe(conexion, id_heroe):
+    fila = conexion.execute(
+        "SELECT recompensa_total FROM resumen_heroes WHERE id_heroe = ?", (id_heroe,)
+    ).fetchone()
+    return fila[0] if fila else 0
+
+
+def amenaza_de_mision(conexion, id_mision):
+    fila = conexion.execute(
+        "SELECT amenaza_total FROM resumen_misiones WHERE id_mision = ?", (id_mision,)
+    ).fetchone()
+    return fila[0] if fila else 0
+
+
+# -----------------------------------------------------
+# Verificación de consistencia
+# -----------------------------------------------------
+def _diferencias(conexion, agregado, tabla, clave, total, cuenta):
+    """Filas (id, total_real, cuenta_real, total_resumen, cuenta_resumen) que no coinciden."""
+    return conexion.execute(f"""
+        WITH real (id, total, cuenta) AS ({agregado})
+        SELECT r.id, r.total, r.cuenta, s.{total}, s.{cuenta}
+        FROM real r LEFT JOIN {tabla} s ON s.{clave} = r.id
+        WHERE s.{total} IS NOT r.total OR s.{cuenta} IS NOT r.cuenta
+        UNION ALL
+        SELECT s.{clave}, 0, 0, s.{total}, s.{cuenta}
+        FROM {tabla} s
+        WHERE (s.{total} IS NOT 0 OR s.{cuenta} IS NOT 0)
+          AND s.{clave} NOT IN (SELECT id FROM real)
+    """).fetchall()
+
+
+def verificar(conexion):
+    """
+    Compara los resúmenes con el agregado calculado al vuelo.
+    Devuelve {"heroes": [...], "misiones": [...]} con las discrepancias (vacío = consistente).
+    """
+    return {
+        "heroes": _diferencias(conexion, SQL_AGREGADO_HEROES, "resumen_heroes",
+                               "id_heroe", "recompensa_total", "misiones"),
+        "misiones": _diferencias(conexion, SQL_AGREGADO_MISIONES, "resumen_misiones",
+                                 "id_mision", "amenaza_total", "monstruos"),
+    }
+
+
+if __name__ == "__main__":
+    comandos = ("instalar", "reconstruir", "verificar", "top")
+    if len(sys.argv) < 2 or sys.argv[1] not in comandos:
+        print(f"Uso: python gremio_clasificaciones.py ({' | '.join(comandos)}) [ruta_db]")
+        sys.exit(1)
+
+    comando = sys.argv[1]
+    conexion = abrir_conexion(sys.argv[2] if len(sys.argv) > 2 else RUTA_DB)
+    codigo = 0
+    if comando == "instalar":
+        instalar(conexion)
+        print("✅ Tablas resumen y triggers instalados")
+    elif comando == "reconstruir":
+        reconstruir(conexion)
+        print("✅ Resúmenes reconstruidos")
+    elif comando == "verificar":
+        for nombre, diferencias in verificar(conexion).items():
+            print(f"{'✅' if not diferencias else '❌'} {nombre}: {len(diferencias)} discrepancias")
+            for fila in diferencias[:10]:
+                print(f"    id={fila[0]} real=({fila[1]}, {fila[2]}) resumen=({fila[3]}, {fila[4]})")
+            codigo = codigo or bool(diferencias)
+    else:
+        print("🏆 Héroes con más recompensa:")
+        for fila in top_heroes(conexion):
+            print("   ", fila)
+        print("💀 Misiones más peligrosas:")
+        for fila in misiones_mas_peligrosas(conexion):
+            print("   ", fila)
+    conexion.close()
+    sys.exit(int(codigo))
@@ -0,0 +1,158 @@
+# ===============================================
+# 🗡️ Acceso a datos del Gremio de Aventureros
+# Índices y consultas por lotes sobre gremio_aventureros.db
+# ===============================================
+#
+# Uso (crea los índices y comprueba los planes con EXPLAIN QUERY PLAN):
+#   python gremio_consultas.py [ruta_db]
+
+import sys
+
+from sqlite_conexion import abrir_conexion
+
+RUTA_DB = "gremio_aventureros.db"
+# Límite prudente de parámetros por sentencia (SQLITE_MAX_VARIABLE_NUMBER puede ser 999)
+MAX_PARAMETROS = 900
+
+# -----------------------------------------------------
+# Índices
+# -----------------------------------------------------
+# Los UNIQUE de las tablas relacionales ya indexan (id_heroe, id_mision) y
+# (id_mision, id_monstruo); estos cubren la dirección contraria.
+INDICES = {
+    "idx_misiones_heroes_mision": "misiones_heroes(id_mision, id_heroe)",
+    "idx_misiones_monstruos_monstruo": "misiones_monstruos(id_monstruo, id_mision)",
+    "idx_heroes_clase": "heroes(clase)",
+    "idx_misiones_dificultad": "misiones(dificultad)",
+    "idx_monstruos_tipo": "monstruos(tipo)",
+    "idx_monstruos_amenaza": "monstruos(nivel_amenaza)",
+}
+
+
+def crear_indices(conexion):
+    """Crea (si no existen) los índices de consulta del gremio."""
+    for nombre, definicion in INDICES.items():
+        conexion.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {definicion}")
+    conexion.execute("ANALYZE")
+    conexion.commit()
+
+
+# -----------------------------------------------------
+# Consultas
+# -----------------------------------------------------
+SQL_MISIONES_DE_HEROE = """
+    SELECT m.id, m.nombre, m.dificultad, m.recompensa
+    FROM misiones_heroes mh JOIN misiones m ON m.id = mh.id_mision
+    WHERE mh.id_heroe = ?
+"""
+
+SQL_MISIONES_CON_MONSTRUO = """
+    SELECT m.id, m.nombre, m.dificultad, m.recompensa
+    FROM misiones_monstruos mm JOIN misiones m ON m.id = mm.id_mision
+    WHERE mm.id_monstruo = ?
+"""
+
+SQL_HEROES_POR_MISION = """
+    SELECT mh.id_mision, h.id, h.nombre, h.clase, h.nivel_experiencia
+    FROM misiones_heroes mh JOIN heroes h ON h.id = mh.id_heroe
+    WHERE mh.id_mision IN ({marcas})
+"""
+
+SQL_RECOMPENSA_POR_HEROE = """
+    SELECT mh.id_heroe, SUM(m.recompensa)
+    FROM misiones_heroes mh JOIN misiones m ON m.id = mh.id_mision
+    WHERE mh.id_heroe IN ({marcas})
+    GROUP BY mh.id_heroe
+"""
+
+SQL_AMENAZA_POR_MISION = """
+    SELECT mm.id_mision, SUM(mo.nivel_amenaza)
+    FROM misiones_monstruos mm JOIN monstruos mo ON mo.id = mm.id_monstruo
+    WHERE mm.id_mision IN ({marcas})
+    GROUP BY mm.id_mision
+"""
+
+
+def _por_lotes(conexion, sql, ids):
+    """Ejecuta `sql` con IN (...) en bloques de MAX_PARAMETROS ids y encadena las filas."""
+    ids = list(ids)
+    for inicio in range(0, len(ids), MAX_PARAMETROS):
+        bloque = ids[inicio:inicio + MAX_PARAMETROS]
+        marcas = ", ".join("?" * len(bloque))
+        yield from conexion.execute(sql.format(marcas=marcas), bloque)
+
+
+def misiones_de_heroe(conexion, id_heroe):
+    """Misiones en las que participó un héroe (índice UNIQUE(id_heroe, id_mision))."""
+    return conexion.execute(SQL_MISIONES_DE_HEROE, (id_heroe,)).fetchall()
+
+
+def misiones_con_monstruo(conexion, id_monstruo):
+    """Misiones en las que aparece un monstruo (índice idx_misiones_monstruos_monstruo)."""
+    return conexion.execute(SQL_MISIONES_CON_MONSTRUO, (id_monstruo,)).fetchall()
+
+
+def heroes_por_mision(conexion, ids_mision):
+    """{id_mision: [(id, nombre, clase, nivel), ...]} para varias misiones a la vez."""
+    resultado = {i: [] for i in ids_mision}
+    for id_mision, *heroe in _por_lotes(conexion, SQL_HEROES_POR_MISION, resultado):
+        resultado[id_mision].append(tuple(heroe))
+    return resultado
+
+
+def recompensa_total_por_heroe(conexion, ids_heroe):
+    """{id_heroe: suma de recompensas de sus misiones} (0 si no tiene misiones)."""
+    resultado = dict.fromkeys(ids_heroe, 0)
+    resultado.update(_por_lotes(conexion, SQL_RECOMPENSA_POR_HEROE, resultado))
+    return resultado
+
+
+def amenaza_por_mision(conexion, ids_mision):
+    """{id_mision: suma de nivel_amenaza de sus monstruos} (0 si no tiene monstruos)."""
+    resultado = dict.fromkeys(ids_mision, 0)
+    resultado.update(_por_lotes(conexion, SQL_AMENAZA_POR_MISION, resultado))
+    return resultado
+
+
+# -----------------------------------------------------
+# Verificación de planes de ejecución
+# -----------------------------------------------------
+def plan_consulta(conexion, sql, parametros=()):
+    """Líneas de detalle de EXPLAIN QUERY PLAN para una consulta."""
+    return [fila[3] for fila in conexion.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)]
+
+
+def verificar_planes(conexion):
+    """
+    Comprueba que ninguna consulta recorre una tabla entera (SCAN) en lugar de usar un índice.
+    Devuelve {consulta: (correcto, plan)}.
+    """
+    dos = ", ".join("?" * 2)
+    consultas = {
+        "misiones_de_heroe": (SQL_MISIONES_DE_HEROE, (1,)),
+        "misiones_con_monstruo": (SQL_MISIONES_CON_MONSTRUO, (1,)),
+        "heroes_por_mision": (SQL_HEROES_POR_MISION.format(marcas=dos), (1, 2)),
+        "recompensa_total_por_heroe": (SQL_RECOMPENSA_POR_HEROE.format(marcas=dos), (1, 2)),
+        "amenaza_por_mision": (SQL_AMENAZA_POR_MISION.format(marcas=dos), (1, 2)),
+        "heroes_por_clase": ("SELECT id FROM heroes WHERE clase = ?", ("Mago",)),
+        "misiones_por_dificultad": ("SELECT id FROM misiones WHERE dificultad = ?", ("Épica",)),
+        "monstruos_por_tipo": ("SELECT id FROM monstruos WHERE tipo = ?", ("Dragón",)),
+        "monstruos_peligrosos": ("SELECT id FROM monstruos WHERE nivel_amenaza >= ?", (8,)),
+    }
+    resultado = {}
+    for nombre, (sql, parametros) in consultas.items():
+        plan = plan_consulta(conexion, sql, parametros)
+        correcto = not any(linea.startswith("SCAN") for linea in plan)
+        resultado[nombre] = (correcto, plan)
+    return resultado
+
+
+if __name__ == "__main__":
+    conexion = abrir_conexion(sys.argv[1] if len(sys.argv) > 1 else RUTA_DB)
+    crear_indices(conexion)
+    fallos = 0
+    for nombre, (correcto, plan) in verificar_planes(conexion).items():
+        print(f"{'✅' if correcto else '❌'} {nombre}: {' | '.join(plan)}")
+        fallos += not correcto
+    conexion.close()
+    sys.exit(1 if fallos else 0)
@@ -0,0 +1,283 @@
+# ===============================================
+# 🤝 Emparejamiento de grupos del Gremio
+# Asigna héroes disponibles a misiones abiertas maximizando la recompensa
+# ===============================================
+#
+# Uso:
+#   python gremio_emparejamiento.py [ruta_db] [--simular]
+#
+# Misión abierta: no tiene héroes en misiones_heroes.
+# Héroe disponible: no participa en ninguna misión.
+# Un grupo (1..TAMANO_GRUPO_MAX héroes) puede aceptar una misión si la suma de
+# sus nivel_experiencia alcanza FACTOR_AMENAZA × la amenaza total de sus monstruos.
+#
+# Algoritmo: voraz por densidad (recompensa / nivel requerido) seguido de una
+# búsqueda local que compacta grupos y cambia misiones baratas por caras.
+# Los héroes libres se guardan agrupados por nivel, así que elegir "el héroe más
+# débil que basta" es una búsqueda binaria sobre los niveles distintos.
+
+import sys
+import time
+from bisect import bisect_left, insort
+from math import ceil
+
+from gremio_consultas import RUTA_DB
+from sqlite_conexion import abrir_conexion
+
+TAMANO_GRUPO_MAX = 5
+FACTOR_AMENAZA = 1.0
+# Misiones asignadas (las más baratas) que se prueban a liberar por cada misión sin grupo
+VECINOS = 20
+LIMITE_BUSQUEDA_LOCAL = 10.0    # segundos
+TAMANO_LOTE = 50000
+
+SQL_MISIONES_ABIERTAS = """
+    SELECT m.id, m.recompensa, COALESCE(SUM(mo.nivel_amenaza), 0)
+    FROM misiones m
+    LEFT JOIN misiones_monstruos mm ON mm.id_mision = m.id
+    LEFT JOIN monstruos mo ON mo.id = mm.id_monstruo
+    WHERE NOT EXISTS (SELECT 1 FROM misiones_heroes mh WHERE mh.id_mision = m.id)
+    GROUP BY m.id
+"""
+
+SQL_HEROES_DISPONIBLES = """
+    SELECT h.id, h.nivel_experiencia
+    FROM heroes h
+    WHERE NOT EXISTS (SELECT 1 FROM misiones_heroes mh WHERE mh.id_heroe = h.id)
+"""
+
+
+# -----------------------------------------------------
+# Datos del problema
+# -----------------------------------------------------
+def cargar_misiones(conexion):
+    """
+    Listas paralelas (ids, recompensas, requeridos) de las misiones abiertas.
+    La amenaza se agrega una sola vez en SQL; requerido es el nivel total mínimo del grupo.
+    """
+    ids, recompensas, requeridos = [], [], []
+    for id_mision, recompensa, amenaza in conexion.execute(SQL_MISIONES_ABIERTAS):
+        ids.append(id_mision)
+        recompensas.append(recompensa)
+        requeridos.append(max(1, ceil(amenaza * FACTOR_AMENAZA)))
+    return ids, recompensas, requeridos
+
+
+def cargar_heroes(conexion):
+    """{id_heroe: nivel_experiencia} de los héroes disponibles."""
+    return dict(conexion.execute(SQL_HEROES_DISPONIBLES))
+
+
+class ReservaHeroes:
+    """Héroes libres agrupados por nivel, con los niveles distintos ordenados."""
+
+    def __init__(self, niveles_heroe):
+        self.nivel = niveles_heroe
+        self.por_nivel = {}
+        for id_heroe, nivel in niveles_heroe.items():
+            self.por_nivel.setdefault(nivel, set()).add(id_heroe)
+        self.niveles = sorted(self.por_nivel)
+
+    def __len__(self):
+        return sum(len(grupo) for grupo in self.por_nivel.values())
+
+    def _sacar(self, posicion):
+        nivel = self.niveles[posicion]
+        grupo = self.por_nivel[nivel]
+        id_heroe = grupo.pop()
+        if not grupo:
+            del self.niveles[posicion]
+            del self.por_nivel[nivel]
+        return id_heroe
+
+    def tomar(self, nivel_minimo):
+        """Saca el héroe más débil con nivel >= nivel_minimo (None si no hay)."""
+        posicion = bisect_left(self.niveles, nivel_minimo)
+        return self._sacar(posicion) if posicion < len(self.niveles) else None
+
+    def tomar_mas_fuerte(self):
+        return self._sacar(len(self.niveles) - 1) if self.niveles else None
+
+    def quitar(self, id_heroe):
+        """Saca un héroe concreto (debe estar libre)."""
+        nivel = self.nivel[id_heroe]
+        grupo = self.por_nivel[nivel]
+        grupo.remove(id_heroe)
+        if not grupo:
+            self.niveles.pop(bisect_left(self.niveles, nivel))
+            del self.por_nivel[nivel]
+
+    def devolver(self, ids_heroe):
+        for id_heroe in ids_heroe:
+            nivel = self.nivel[id_heroe]
+            if nivel not in self.por_nivel:
+                insort(self.niveles, nivel)
+                self.por_nivel[nivel] = set()
+            self.por_nivel[nivel].add(id_heroe)
+
+
+# -----------------------------------------------------
+# Solucionador
+# -----------------------------------------------------
+def formar_grupo(reserva, requerido, maximo=TAMANO_GRUPO_MAX):
+    """
+    Forma un grupo con nivel total >= requerido: mientras ningún héroe baste por sí
+    solo para lo que falta se toma el más fuerte; el último es el más débil que basta.
+    Si no se consigue, devuelve los héroes a la reserva y retorna None.
+    """
+    grupo = []
+    suma = 0
+    while suma < requerido and len(grupo) < maximo:
+        id_heroe = reserva.tomar(requerido - suma)
+        if id_heroe is None:
+            if len(grupo) == maximo - 1:
+                break
+            id_heroe = reserva.tomar_mas_fuerte()
+            if id_heroe is None:
+                break
+        grupo.append(id_heroe)
+        suma += reserva.nivel[id_heroe]
+    if suma < requerido:
+        reserva.devolver(grupo)
+        return None
+    return grupo
+
+
+def compactar(asignacion, requeridos, reserva):
+    """
+    Sustituye cada héroe por el más débil de la reserva que mantiene el grupo
+    por encima del requerido, o lo quita si sobra. Libera a los héroes fuertes.
+    """
+    nivel = reserva.nivel
+    for i, grupo in asignacion.items():
+        suma = sum(nivel[h] for h in grupo)
+        for id_heroe in sorted(grupo, key=nivel.get, reverse=True):
+            resto = suma - nivel[id_heroe]
+            if resto >= requeridos[i] and len(grupo) > 1:
+                grupo.remove(id_heroe)
+                reserva.devolver([id_heroe])
+                suma = resto
+                continue
+            sustituto = reserva.tomar(requeridos[i] - resto)
+            if sustituto is None:
+                continue
+            if nivel[sustituto] < nivel[id_heroe]:
+                grupo[grupo.index(id_heroe)] = sustituto
+                reserva.devolver([id_heroe])
+                suma = resto + nivel[sustituto]
+            else:
+                reserva.devolver([sustituto])
+
+
+def intercambiar(asignacion, sin_grupo, recompensas, requeridos, reserva, limite):
+    """
+    Para cada misión sin grupo (de más a menos recompensa) libera temporalmente
+    las misiones asignadas más baratas; si con sus héroes se cubre la cara, se
+    cambia una por otra (y se intenta recolocar la barata con lo que sobre).
+    """
+    fin = time.perf_counter() + limite
+    baratas = sorted(asignacion, key=recompensas.__getitem__)
+    for u in sorted(sin_grupo, key=recompensas.__getitem__, reverse=True):
+        if time.perf_counter() > fin:
+            break
+        probadas = 0
+        for a in baratas:
+            if probadas == VECINOS or recompensas[a] >= recompensas[u]:
+                break
+            if a not in asignacion:
+                continue
+            probadas += 1
+            liberados = asignacion.pop(a)
+            reserva.devolver(liberados)
+            grupo = formar_grupo(reserva, requeridos[u])
+            if grupo is None:
+                for id_heroe in liberados:
+                    reserva.quitar(id_heroe)
+                asignacion[a] = liberados
+                continue
+            asignacion[u] = grupo
+            sin_grupo.discard(u)
+            recolocado = formar_grupo(reserva, requeridos[a])
+            if recolocado is None:
+                sin_grupo.add(a)
+            else:
+                asignacion[a] = recolocado
+            break
+
+
+def resolver(recompensas, requeridos, niveles_heroe, limite=LIMITE_BUSQUEDA_LOCAL):
+    """
+    Devuelve {índice_misión: [id_heroe, ...]} sobre las listas paralelas de
+    cargar_misiones. Cada héroe aparece como mucho en un grupo.
+    """
+    reserva = ReservaHeroes(dict(niveles_heroe))
+    orden = sorted(range(len(recompensas)),
+                   key=lambda i: (recompensas[i] / requeridos[i], recompensas[i]), reverse=True)
+
+    asignacion = {}
+    sin_grupo = set()
+    for i in orden:
+        grupo = formar_grupo(reserva, requeridos[i])
+        if grupo is None:
+            sin_grupo.add(i)
+        else:
+            asignacion[i] = grupo
+
+    if sin_grupo:
+        compactar(asignacion, requeridos, reserva)
+        for i in sorted(sin_grupo, key=recompensas.__getitem__, reverse=True):
+            grupo = formar_grupo(reserva, requeridos[i])
+            if grupo is not None:
+                asignacion[i] = grupo
+                sin_grupo.discard(i)
+        if sin_grupo:
+            intercambiar(asignacion, sin_grupo, recompensas, requeridos, reserva, limite)
+    return asignacion
+
+
+# -----------------------------------------------------
+# Escritura
+# -----------------------------------------------------
+def guardar_asignacion(conexion, ids_mision, asignacion, lote=TAMANO_LOTE):
+    """Inserta todos los pares (misión, héroe) en una única transacción. Devuelve cuántos."""
+    filas = [(ids_mision[i], id_heroe) for i, grupo in asignacion.items() for id_heroe in grupo]
+    with conexion:
+        for inicio in range(0, len(filas), lote):
+            conexion.executemany(
+                "INSERT INTO misiones_heroes (id_mision, id_heroe) VALUES (?, ?)",
+                filas[inicio:inicio + lote]
+            )
+    return len(filas)
+
+
+def emparejar(conexion, simular=False, limite=LIMITE_BUSQUEDA_LOCAL):
+    """Carga, resuelve y (salvo simular=True) guarda. Devuelve un resumen."""
+    inicio = time.perf_counter()
+    ids, recompensas, requeridos = cargar_misiones(conexion)
+    niveles_heroe = cargar_heroes(conexion)
+    cargado = time.perf_counter()
+    asignacion = resolver(recompensas, requeridos, niveles_heroe, limite)
+    resuelto = time.perf_counter()
+    parejas = 0 if simular else guardar_asignacion(conexion, ids, asignacion)
+    return {
+        "misiones_abiertas": len(ids),
+        "heroes_disponibles": len(niveles_heroe),
+        "misiones_asignadas": len(asignacion),
+        "heroes_asignados": sum(len(g) for g in asignacion.values()),
+        "recompensa_total": sum(recompensas[i] for i in asignacion),
+        "recompensa_posible": sum(recompensas),
+        "parejas_guardadas": parejas,
+        "carga_s": round(cargado - inicio, 3),
+        "resolucion_s": round(resuelto - cargado, 3),
+        "escritura_s": round(time.perf_counter() - resuelto, 3),
+    }
+
+
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    conexion = abrir_conexion(argumentos[0] if argumentos else RUTA_DB)
+    resumen = emparejar(conexion, simular="--simular" in sys.argv)
+    conexion.close()
+    for clave, valor in resumen.items():
+        print(f"  {clave}: {valor}")
+    print("✅ Emparejamiento " + ("simulado" if "--simular" in sys.argv else "guardado"))
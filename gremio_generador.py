@@ -0,0 +1,134 @@
+# ===============================================
+# 🎲 Generador de datos sintéticos del Gremio
+# Millones de filas que respetan todas las restricciones CHECK
+# ===============================================
+#
+# Uso:
+#   python gremio_generador.py [ruta_db] [heroes] [misiones] [monstruos]
+# Por defecto: gremio_benchmark.db con 1.000.000 de héroes, 500.000 misiones
+# y 100.000 monstruos (más sus tablas relacionales).
+
+import random
+import sys
+import time
+
+from base_gremio_aventureros import crear_tablas
+from gremio_consultas import crear_indices
+from sqlite_conexion import abrir_conexion
+
+# Valores permitidos por los CHECK de base_gremio_aventureros.py
+CLASES = ("Guerrero", "Mago", "Arquero", "Ladrón", "Paladín", "Hechicero")
+DIFICULTADES = ("Fácil", "Media", "Difícil", "Épica")
+TIPOS = ("Dragón", "Goblin", "No-muerto", "Bestia", "Humanoide", "Demonio")
+NIVEL_AMENAZA = (1, 10)
+
+# Recompensa base por dificultad (la real varía ±50 %)
+RECOMPENSA = {"Fácil": 100, "Media": 500, "Difícil": 2000, "Épica": 10000}
+LOCALIZACIONES = ("Bosque Sombrío", "Montañas Heladas", "Pantano Maldito", "Ruinas Antiguas",
+                  "Desierto Rojo", "Cavernas Profundas", "Ciudad Perdida", "Costa Tormentosa")
+
+HEROES_POR_MISION = (1, 5)
+MONSTRUOS_POR_MISION = (1, 4)
+TAMANO_LOTE = 50000
+
+
+def _max_id(conexion, tabla):
+    return conexion.execute(f"SELECT COALESCE(MAX(id), 0) FROM {tabla}").fetchone()[0]
+
+
+def _insertar_por_lotes(cursor, sql, filas, lote=TAMANO_LOTE):
+    """Consume un generador de filas con executemany en bloques de `lote`."""
+    bloque = []
+    total = 0
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) == lote:
+            cursor.executemany(sql, bloque)
+            total += len(bloque)
+            bloque = []
+    if bloque:
+        cursor.executemany(sql, bloque)
+        total += len(bloque)
+    return total
+
+
+def generar(conexion, heroes, misiones, monstruos, semilla=42, lote=TAMANO_LOTE, asignar_heroes=True):
+    """
+    Inserta los datos en una sola transacción y devuelve el número de filas por tabla.
+    Los IDs nuevos continúan a partir de los existentes, así que puede ejecutarse
+    sobre una base con datos. Con asignar_heroes=False las misiones quedan abiertas
+    (sin grupo) para gremio_emparejamiento.py.
+    """
+    azar = random.Random(semilla)
+    cursor = conexion.cursor()
+    base_heroe = _max_id(conexion, "heroes")
+    base_mision = _max_id(conexion, "misiones")
+    base_monstruo = _max_id(conexion, "monstruos")
+
+    def filas_heroes():
+        for i in range(1, heroes + 1):
+            yield (base_heroe + i, f"Héroe {base_heroe + i}", azar.choice(CLASES),
+                   max(1, int(azar.expovariate(1 / 20))))
+
+    def filas_misiones():
+        for i in range(1, misiones + 1):
+            dificultad = azar.choice(DIFICULTADES)
+            recompensa = int(RECOMPENSA[dificultad] * azar.uniform(0.5, 1.5))
+            yield (base_mision + i, f"Misión {base_mision + i}", dificultad,
+                   azar.choice(LOCALIZACIONES), recompensa)
+
+    def filas_monstruos():
+        for i in range(1, monstruos + 1):
+            yield (base_monstruo + i, f"Monstruo {base_monstruo + i}", azar.choice(TIPOS),
+                   azar.randint(*NIVEL_AMENAZA))
+
+    def filas_relacion(minimo, maximo, base_otro, total_otro):
+        # random.sample sobre un range no materializa la lista: pares únicos por misión
+        rango = range(base_otro + 1, base_otro + total_otro + 1)
+        for id_mision in range(base_mision + 1, base_mision + misiones + 1):
+            for id_otro in azar.sample(rango, min(azar.randint(minimo, maximo), total_otro)):
+                yield (id_mision, id_otro)
+
+    conteo = {
+        "heroes": _insertar_por_lotes(
+            cursor, "INSERT INTO heroes (id, nombre, clase, nivel_experiencia) VALUES (?, ?, ?, ?)",
+            filas_heroes(), lote),
+        "misiones": _insertar_por_lotes(
+            cursor, "INSERT INTO misiones (id, nombre, dificultad, localizacion, recompensa) VALUES (?, ?, ?, ?, ?)",
+            filas_misiones(), lote),
+        "monstruos": _insertar_por_lotes(
+            cursor, "INSERT INTO monstruos (id, nombre, tipo, nivel_amenaza) VALUES (?, ?, ?, ?)",
+            filas_monstruos(), lote),
+    }
+    if heroes and asignar_heroes:
+        conteo["misiones_heroes"] = _insertar_por_lotes(
+            cursor, "INSERT INTO misiones_heroes (id_mision, id_heroe) VALUES (?, ?)",
+            filas_relacion(*HEROES_POR_MISION, base_heroe, heroes), lote)
+    if monstruos:
+        conteo["misiones_monstruos"] = _insertar_por_lotes(
+            cursor, "INSERT INTO misiones_monstruos (id_mision, id_monstruo) VALUES (?, ?)",
+            filas_relacion(*MONSTRUOS_POR_MISION, base_monstruo, monstruos), lote)
+    conexion.commit()
+    return conteo
+
+
+if __name__ == "__main__":
+    ruta = sys.argv[1] if len(sys.argv) > 1 else "gremio_benchmark.db"
+    heroes = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    misiones = int(sys.argv[3]) if len(sys.argv) > 3 else 500_000
+    monstruos = int(sys.argv[4]) if len(sys.argv) > 4 else 100_000
+
+    # Carga desechable: perfil "rapido" y los índices secundarios se crean al final
+    conexion = abrir_conexion(ruta, "rapido")
+    crear_tablas(conexion)
+
+    inicio = time.perf_counter()
+    conteo = generar(conexion, heroes, misiones, monstruos)
+    crear_indices(conexion)
+    duracion = time.perf_counter() - inicio
+    conexion.close()
+
+    total = sum(conteo.values())
+    for tabla, filas in conteo.items():
+        print(f"  {tabla}: {filas}")
+    print(f"✅ {total} filas generadas en {duracion:.1f} s ({total / duracion:.0f} filas/s)")
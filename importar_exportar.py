@@ -0,0 +1,256 @@
+# ===============================================
+# 📥📤 Importación y exportación masiva de libros
+# CSV / JSONL en streaming para SQLite, MariaDB, MongoDB y KeyDB
+# ===============================================
+#
+# Uso:
+#   python importar_exportar.py importar <backend> <archivo.csv|archivo.jsonl> [tamaño_lote]
+#   python importar_exportar.py exportar <backend> <archivo.csv|archivo.jsonl> [tamaño_lote]
+#
+# backend: sqlite | mariadb | mongodb | keydb
+# Los archivos se leen y escriben por lotes: nunca se cargan enteros en memoria.
+# Columnas: titulo, autor, genero, leido (id es opcional y solo se usa en KeyDB).
+
+import csv
+import json
+import sys
+import time
+import uuid
+from itertools import islice
+
+CAMPOS = ("titulo", "autor", "genero", "leido")
+VALORES_LEIDO = ("Sí", "No")
+TAMANO_LOTE = 5000
+
+
+# -----------------------------------------------
+# VALIDACIÓN
+# -----------------------------------------------
+def _texto(valor):
+    """Valor de una celda como texto: en JSONL pueden llegar números o booleanos."""
+    if isinstance(valor, bool):
+        return "Sí" if valor else "No"
+    return "" if valor is None else str(valor).strip()
+
+
+def normalizar_fila(fila):
+    """
+    Limpia una fila y la valida con las mismas reglas que las tablas
+    (titulo y autor obligatorios, leido IN ('Sí', 'No')).
+    Devuelve el libro o None si la fila no es válida.
+    """
+    libro = {c: _texto(fila.get(c)) for c in CAMPOS}
+    libro["leido"] = (libro["leido"] or "No").capitalize()
+    if libro["leido"] == "Si":
+        libro["leido"] = "Sí"
+    if not libro["titulo"] or not libro["autor"] or libro["leido"] not in VALORES_LEIDO:
+        return None
+    if _texto(fila.get("id")):
+        libro["id"] = _texto(fila["id"])
+    return libro
+
+
+# -----------------------------------------------
+# LECTURA Y ESCRITURA DE ARCHIVOS (STREAMING)
+# -----------------------------------------------
+def leer_archivo(ruta):
+    """
+    Generador de filas de un CSV (con cabecera) o JSONL, una a una.
+    Una línea JSONL mal formada (o que no es un objeto) se devuelve como fila
+    vacía: normalizar_fila la rechaza y la importación sigue con la siguiente.
+    """
+    with open(ruta, encoding="utf-8", newline="") as f:
+        if ruta.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for linea in f:
+                if not linea.strip():
+                    continue
+                try:
+                    fila = json.loads(linea)
+                except json.JSONDecodeError:
+                    fila = {}
+                yield fila if isinstance(fila, dict) else {}
+
+
+def en_lotes(filas, tamano):
+    filas = iter(filas)
+    while True:
+        lote = list(islice(filas, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def escribir_archivo(ruta, libros):
+    """Escribe los libros según avanzan, sin acumularlos. Devuelve cuántos escribió."""
+    total = 0
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        if ruta.endswith(".csv"):
+            escritor = csv.DictWriter(f, fieldnames=("id",) + CAMPOS)
+            escritor.writeheader()
+            for libro in libros:
+                escritor.writerow(libro)
+                total += 1
+        else:
+            for libro in libros:
+                f.write(json.dumps(libro, ensure_ascii=False) + "\n")
+                total += 1
+    return total
+
+
+# -----------------------------------------------
+# BACKENDS
+# Cada backend se importa solo cuando se usa (los módulos conectan al importarse)
+# -----------------------------------------------
+class BackendSQLite:
+    def __init__(self):
+        from biblioteca_personal import conectar
+        self.conexion = conectar()
+
+    def escribir(self, lote):
+        """executemany de todo el lote en una sola transacción."""
+        with self.conexion:
+            self.conexion.executemany(
+                "INSERT INTO libros (titulo, autor, genero, leido) VALUES (?, ?, ?, ?)",
+                [tuple(l[c] for c in CAMPOS) for l in lote]
+            )
+
+    def leer(self, lote):
+        cursor = self.conexion.execute("SELECT id, titulo, autor, genero, leido FROM libros")
+        while True:
+            filas = cursor.fetchmany(lote)
+            if not filas:
+                return
+            for fila in filas:
+                yield dict(zip(("id",) + CAMPOS, fila))
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+class BackendMariaDB:
+    def __init__(self):
+        from biblioteca_mariadb import engine
+        self.engine = engine
+
+    def escribir(self, lote):
+        """INSERT con executemany (Core, sin objetos ORM) en una transacción."""
+        from biblioteca_mariadb import insertar_libros
+        insertar_libros(lote, lote=len(lote))
+
+    def leer(self, lote):
+        from biblioteca_mariadb import iterar_libros
+        yield from iterar_libros(lote)
+
+    def cerrar(self):
+        self.engine.dispose()
+
+
+class BackendMongoDB:
+    def __init__(self):
+        from biblioteca_mongodb import cliente, coleccion
+        self.cliente = cliente
+        self.coleccion = coleccion
+
+    def escribir(self, lote):
+        """insert_many desordenado: el servidor puede paralelizar las inserciones."""
+        from biblioteca_mongodb import insertar_libros
+        insertar_libros(lote, lote=len(lote))
+
+    def leer(self, lote):
+        proyeccion = {c: 1 for c in CAMPOS}
+        for documento in self.coleccion.find({}, proyeccion).batch_size(lote):
+            documento["id"] = str(documento.pop("_id"))
+            yield documento
+
+    def cerrar(self):
+        self.cliente.close()
+
+
+class BackendKeyDB:
+    def __init__(self):
+        from biblioteca_keydb import r
+        self.db = r
+
+    def escribir(self, lote):
+        """
+        Los libros nuevos se guardan con sus índices en un único pipeline MULTI/EXEC.
+        Los ids que ya existen se reescriben con guardar_libro(..., anterior) para
+        quitar sus entradas de índice antiguas.
+        """
+        from keydb_indices import guardar_libro, guardar_libros
+        from keydb_libros import leer_libros
+        # Si un id se repite dentro del lote, gana la última fila
+        por_id = {}
+        for libro in lote:
+            libro.setdefault("id", str(uuid.uuid4()))
+            por_id[libro["id"]] = libro
+        anteriores = {l["id"]: l for l in leer_libros(self.db, [f"libro:{i}" for i in por_id])}
+        nuevos = [l for i, l in por_id.items() if i not in anteriores]
+        if nuevos:
+            guardar_libros(self.db, nuevos)
+        for id_libro, anterior in anteriores.items():
+            guardar_libro(self.db, por_id[id_libro], anterior)
+
+    def leer(self, lote):
+        from keydb_libros import iterar_libros
+        yield from iterar_libros(self.db, lote=lote)
+
+    def cerrar(self):
+        self.db.close()
+
+
+BACKENDS = {
+    "sqlite": BackendSQLite,
+    "mariadb": BackendMariaDB,
+    "mongodb": BackendMongoDB,
+    "keydb": BackendKeyDB,
+}
+
+
+# -----------------------------------------------
+# IMPORTAR / EXPORTAR
+# -----------------------------------------------
+def importar(backend, ruta, lote=TAMANO_LOTE):
+    """Importa un archivo por lotes. Devuelve (insertados, rechazados, filas_por_segundo)."""
+    insertados = rechazados = 0
+    inicio = time.perf_counter()
+    for filas in en_lotes(leer_archivo(ruta), lote):
+        libros = [l for l in map(normalizar_fila, filas) if l]
+        rechazados += len(filas) - len(libros)
+        if libros:
+            backend.escribir(libros)
+            insertados += len(libros)
+    duracion = max(time.perf_counter() - inicio, 1e-9)
+    return insertados, rechazados, round(insertados / duracion)
+
+
+def exportar(backend, ruta, lote=TAMANO_LOTE):
+    """Exporta todos los libros en streaming. Devuelve (exportados, filas_por_segundo)."""
+    inicio = time.perf_counter()
+    total = escribir_archivo(ruta, backend.leer(lote))
+    return total, round(total / max(time.perf_counter() - inicio, 1e-9))
+
+
+# -----------------------------------------------
+# EJECUCIÓN PRINCIPAL
+# -----------------------------------------------
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] not in ("importar", "exportar") or sys.argv[2] not in BACKENDS:
+        print("Uso: python importar_exportar.py (importar | exportar) "
+              "(sqlite | mariadb | mongodb | keydb) <archivo.csv|.jsonl> [tamaño_lote]")
+        sys.exit(1)
+
+    comando, nombre, ruta = sys.argv[1:4]
+    lote = int(sys.argv[4]) if len(sys.argv) > 4 else TAMANO_LOTE
+    backend = BACKENDS[nombre]()
+    try:
+        if comando == "importar":
+            insertados, rechazados, velocidad = importar(backend, ruta, lote)
+            print(f"✅ {insertados} libros importados ({rechazados} filas rechazadas) — {velocidad} filas/s")
+        else:
+            total, velocidad = exportar(backend, ruta, lote)
+            print(f"✅ {total} libros exportados a {ruta} — {velocidad} filas/s")
+    finally:
+        backend.cerrar()
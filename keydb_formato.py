@@ -0,0 +1,194 @@
+# ===============================================
+# 🔁 Migración y benchmark de formatos en KeyDB
+# STRING con JSON  <->  HASH con un campo por atributo
+# ===============================================
+#
+# Uso:
+#   python keydb_formato.py migrar           # JSON -> hash (libro:* existentes)
+#   python keydb_formato.py revertir         # hash -> JSON
+#   python keydb_formato.py benchmark [N]    # compara ambos formatos con N libros
+#
+# Después de migrar, arrancar las aplicaciones con KEYDB_FORMATO=hash.
+
+import json
+import os
+import sys
+import time
+import uuid
+
+import redis
+
+from keydb_libros import escribir_libro, iterar_claves, leer_libros, TAMANO_LOTE
+
+# -----------------------------------------------
+# MIGRACIÓN
+# -----------------------------------------------
+def _leer_con_claves(db, claves, formato):
+    """
+    Como leer_libros, pero devuelve pares (clave, libro): el libro se reescribe en
+    la clave escaneada aunque el id guardado dentro no coincida con ella.
+    """
+    lectura = db.pipeline(transaction=False)
+    for clave in claves:
+        if formato == "hash":
+            lectura.hgetall(clave)
+        else:
+            lectura.get(clave)
+    pares = []
+    for clave, valor in zip(claves, lectura.execute()):
+        if formato != "hash" and valor:
+            try:
+                valor = json.loads(valor)
+            except ValueError:
+                continue
+        if valor:
+            pares.append((clave, valor))
+    return pares
+
+
+def _migrar_lote(db, claves, origen, destino):
+    """
+    Convierte un lote con WATCH sobre sus claves: si otro cliente escribe alguna
+    entre la lectura y el EXEC, la transacción se descarta y el lote se repite.
+    """
+    tipo_origen = "string" if origen == "json" else "hash"
+    with db.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                pipe.watch(*claves)
+                # Las claves que ya están en el formato de destino se ignoran
+                tipos = db.pipeline(transaction=False)
+                for clave in claves:
+                    tipos.type(clave)
+                pendientes = [c for c, t in zip(claves, tipos.execute()) if t == tipo_origen]
+                libros = _leer_con_claves(db, pendientes, origen)
+                pipe.multi()
+                for clave, libro in libros:
+                    pipe.delete(clave)
+                    escribir_libro(pipe, libro, formato=destino, clave=clave)
+                pipe.execute()
+                return len(libros)
+            except redis.WatchError:
+                continue
+
+
+def migrar(db, origen="json", destino="hash", lote=TAMANO_LOTE):
+    """
+    Convierte todos los libro:* del formato `origen` al formato `destino`.
+    Cada lote se lee en un viaje de red y se reescribe en una transacción
+    (DEL + escritura) para que ninguna clave quede a medias.
+    """
+    total = 0
+    for claves in iterar_claves(db, lote=lote):
+        total += _migrar_lote(db, claves, origen, destino)
+    return total
+
+
+# -----------------------------------------------
+# BENCHMARK
+# -----------------------------------------------
+def _libro_de_prueba(i):
+    return {
+        "id": str(uuid.uuid4()),
+        "titulo": f"Libro de prueba número {i}",
+        "autor": f"Autor {i % 500}",
+        "genero": ("Novela", "Ensayo", "Poesía", "Ciencia", "Historia")[i % 5],
+        "leido": "Sí" if i % 2 else "No"
+    }
+
+
+def _ops_por_segundo(cantidad, inicio):
+    return round(cantidad / max(time.perf_counter() - inicio, 1e-9))
+
+
+def benchmark(db, cantidad=10000, lote=TAMANO_LOTE):
+    """
+    Escribe `cantidad` libros en cada formato bajo el prefijo bench:{formato}:
+    y mide memoria por libro (MEMORY USAGE), escrituras, lecturas completas y
+    actualizaciones de `leido` por segundo. Borra los datos al terminar.
+    """
+    libros = [_libro_de_prueba(i) for i in range(cantidad)]
+    resultados = {}
+
+    for formato in ("json", "hash"):
+        prefijo = f"bench:{formato}:"
+        claves = [f"{prefijo}{l['id']}" for l in libros]
+
+        # Escritura
+        inicio = time.perf_counter()
+        for desde in range(0, cantidad, lote):
+            pipe = db.pipeline(transaction=False)
+            for libro in libros[desde:desde + lote]:
+                clave = f"{prefijo}{libro['id']}"
+                if formato == "hash":
+                    pipe.hset(clave, mapping=libro)
+                else:
+                    pipe.set(clave, json.dumps(libro))
+            pipe.execute()
+        escrituras = _ops_por_segundo(cantidad, inicio)
+
+        # Memoria (muestra de hasta 1000 claves)
+        muestra = claves[:1000]
+        pipe = db.pipeline(transaction=False)
+        for clave in muestra:
+            pipe.memory_usage(clave)
+        memoria = sum(m or 0 for m in pipe.execute()) / max(len(muestra), 1)
+
+        # Lectura completa
+        inicio = time.perf_counter()
+        for desde in range(0, cantidad, lote):
+            leer_libros(db, claves[desde:desde + lote], formato=formato)
+        lecturas = _ops_por_segundo(cantidad, inicio)
+
+        # Actualización de un solo campo: HSET frente a GET + SET del JSON
+        inicio = time.perf_counter()
+        for desde in range(0, cantidad, lote):
+            bloque = claves[desde:desde + lote]
+            pipe = db.pipeline(transaction=False)
+            if formato == "hash":
+                for clave in bloque:
+                    pipe.hset(clave, "leido", "Sí")
+            else:
+                for clave, data in zip(bloque, db.mget(bloque)):
+                    libro = json.loads(data)
+                    libro["leido"] = "Sí"
+                    pipe.set(clave, json.dumps(libro))
+            pipe.execute()
+        actualizaciones = _ops_por_segundo(cantidad, inicio)
+
+        for desde in range(0, cantidad, lote):
+            db.delete(*claves[desde:desde + lote])
+
+        resultados[formato] = {
+            "bytes_por_libro": round(memoria, 1),
+            "escrituras_por_seg": escrituras,
+            "lecturas_por_seg": lecturas,
+            "actualizaciones_leido_por_seg": actualizaciones
+        }
+    return resultados
+
+
+# -----------------------------------------------
+# EJECUCIÓN PRINCIPAL
+# -----------------------------------------------
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    db = redis.Redis(
+        host=os.getenv("KEYDB_HOST", "localhost"),
+        port=int(os.getenv("KEYDB_PORT", 6379)),
+        password=os.getenv("KEYDB_PASSWORD") or None,
+        decode_responses=True
+    )
+
+    comando = sys.argv[1] if len(sys.argv) > 1 else ""
+    if comando == "migrar":
+        print(f"✅ {migrar(db, 'json', 'hash')} libros convertidos a hash.")
+    elif comando == "revertir":
+        print(f"✅ {migrar(db, 'hash', 'json')} libros convertidos a JSON.")
+    elif comando == "benchmark":
+        cantidad = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        print(json.dumps(benchmark(db, cantidad), indent=2, ensure_ascii=False))
+    else:
+        print("Uso: python keydb_formato.py (migrar | revertir | benchmark [N])")
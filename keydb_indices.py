@@ -0,0 +1,416 @@
+# ===============================================
+# 🔎 Índices secundarios de libros en KeyDB
+# Trigramas, tokens y títulos normalizados
+# ===============================================
+#
+# Estructuras mantenidas al escribir cada libro:
+#   idx:{campo}:g:{trigrama}  SET   ids de libros cuyo campo contiene el trigrama
+#   idx:{campo}:tokens        ZSET  "token\0id" (orden lexicográfico, score 0)
+#   idx:titulos               ZSET  "titulo_normalizado\0id" (orden lexicográfico)
+#   indices:reconstruyendo    STRING prefijo de los índices temporales mientras se reconstruyen
+#
+# Uso por línea de comandos (reconstruye los índices de los libro:* existentes):
+#   python keydb_indices.py
+
+import base64
+import re
+import unicodedata
+import uuid
+
+import redis
+
+from cache_libros import CLAVE_VERSION, CANAL_CAMBIOS
+from keydb_libros import escribir_libro, iterar_claves, leer_libro, leer_libros, TAMANO_LOTE
+
+# -----------------------------------------------
+# CONFIGURACIÓN
+# -----------------------------------------------
+CAMPOS = ("titulo", "autor", "genero")
+N_GRAMA = 3
+CLAVE_TITULOS = "idx:titulos"
+SEPARADOR = "\0"
+# Límite superior para rangos ZRANGEBYLEX por prefijo
+MAXIMO_LEX = chr(0x10FFFF)
+# Fuera de idx:* para que la sustitución de índices no la toque
+CLAVE_RECONSTRUCCION = "indices:reconstruyendo"
+# Si el proceso que reconstruye muere, la marca caduca sola (se renueva en cada lote)
+TTL_RECONSTRUCCION = 600
+
+# Borra un índice definitivo que no tiene versión temporal (ya no le corresponde ningún libro)
+BORRAR_SI_SOBRA = """
+if redis.call("exists", KEYS[2]) == 0 then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Sustituye el índice definitivo por su versión temporal, si esta sigue existiendo
+RENOMBRAR_SI_EXISTE = """
+if redis.call("exists", KEYS[1]) == 1 then
+    redis.call("rename", KEYS[1], KEYS[2])
+    return 1
+end
+return 0
+"""
+
+
+# -----------------------------------------------
+# NORMALIZACIÓN DE TEXTO
+# -----------------------------------------------
+def normalizar(texto):
+    """Minúsculas y sin acentos: 'Gabriel García' -> 'gabriel garcia'."""
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    sin_acentos = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_acentos.lower().split())
+
+
+def tokens(texto):
+    """Palabras de un texto ya normalizado."""
+    return set(re.findall(r"\w+", texto))
+
+
+def trigramas(texto):
+    """Conjunto de n-gramas (n = N_GRAMA) de un texto ya normalizado."""
+    return {texto[i:i + N_GRAMA] for i in range(len(texto) - N_GRAMA + 1)}
+
+
+def clave_trigrama(campo, trigrama):
+    return f"idx:{campo}:g:{trigrama}"
+
+
+def clave_tokens(campo):
+    return f"idx:{campo}:tokens"
+
+
+def miembro_titulo(libro):
+    """Miembro del ZSET de títulos: ordena por título y desempata por id."""
+    return f"{normalizar(libro['titulo'])}{SEPARADOR}{libro['id']}"
+
+
+# -----------------------------------------------
+# MANTENIMIENTO DE ÍNDICES
+# -----------------------------------------------
+def _agregar_indices(pipe, libro, prefijo=""):
+    """`prefijo` permite escribir los índices en claves temporales (reconstruir_indices)."""
+    libro_id = libro["id"]
+    for campo in CAMPOS:
+        valor = normalizar(libro.get(campo, ""))
+        for g in trigramas(valor):
+            pipe.sadd(prefijo + clave_trigrama(campo, g), libro_id)
+        miembros = {f"{t}{SEPARADOR}{libro_id}": 0 for t in tokens(valor)}
+        if miembros:
+            pipe.zadd(prefijo + clave_tokens(campo), miembros)
+    pipe.zadd(prefijo + CLAVE_TITULOS, {miembro_titulo(libro): 0})
+
+
+def _quitar_indices(pipe, libro, prefijo=""):
+    libro_id = libro["id"]
+    for campo in CAMPOS:
+        valor = normalizar(libro.get(campo, ""))
+        for g in trigramas(valor):
+            pipe.srem(prefijo + clave_trigrama(campo, g), libro_id)
+        miembros = [f"{t}{SEPARADOR}{libro_id}" for t in tokens(valor)]
+        if miembros:
+            pipe.zrem(prefijo + clave_tokens(campo), *miembros)
+    pipe.zrem(prefijo + CLAVE_TITULOS, miembro_titulo(libro))
+
+
+def _prefijos(pipe):
+    """
+    Índices que hay que mantener: los definitivos y, si hay una reconstrucción en
+    curso, también los temporales. Quien llama vigila CLAVE_RECONSTRUCCION con WATCH:
+    si la reconstrucción empieza o termina antes del EXEC, la escritura se reintenta.
+    """
+    temporal = pipe.get(CLAVE_RECONSTRUCCION)
+    return ("", temporal) if temporal else ("",)
+
+
+def _notificar_cambio(pipe):
+    """Sube la versión de la biblioteca y avisa a las cachés en memoria (cache_libros.py)."""
+    pipe.incr(CLAVE_VERSION)
+    pipe.publish(CANAL_CAMBIOS, "")
+
+
+def guardar_libro(db, libro, anterior=None):
+    """
+    Guarda el libro y actualiza sus índices en una sola transacción (MULTI/EXEC).
+    Si se pasa `anterior` (versión que leyó quien llama) solo se escriben los campos
+    modificados respecto a ella: se vigila libro:{id} con WATCH, se aplican sobre el
+    libro actual y se reintenta si otro cliente lo cambia antes del EXEC. Así los
+    índices se quitan siempre de la versión que hay en KeyDB.
+    Devuelve el libro guardado, o None si ya no existía.
+    """
+    if not anterior:
+        guardar_libros(db, [libro])
+        return libro
+
+    cambios = {c: v for c, v in libro.items() if anterior.get(c) != v}
+    with db.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                pipe.watch(f"libro:{libro['id']}", CLAVE_RECONSTRUCCION)
+                prefijos = _prefijos(pipe)
+                actual = leer_libro(pipe, libro["id"])
+                if actual is None:
+                    return None
+                nuevo = {**actual, **cambios}
+                modificados = [c for c in cambios if actual.get(c) != cambios[c]]
+                if not modificados:
+                    return nuevo
+                pipe.multi()
+                escribir_libro(pipe, nuevo, modificados)
+                if any(c in CAMPOS for c in modificados):
+                    for prefijo in prefijos:
+                        _quitar_indices(pipe, actual, prefijo)
+                        _agregar_indices(pipe, nuevo, prefijo)
+                _notificar_cambio(pipe)
+                pipe.execute()
+                return nuevo
+            except redis.WatchError:
+                continue
+
+
+def guardar_libros(db, libros):
+    """Guarda un lote de libros nuevos con sus índices en una sola transacción."""
+    with db.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                pipe.watch(CLAVE_RECONSTRUCCION)
+                prefijos = _prefijos(pipe)
+                pipe.multi()
+                for libro in libros:
+                    escribir_libro(pipe, libro)
+                    for prefijo in prefijos:
+                        _agregar_indices(pipe, libro, prefijo)
+                _notificar_cambio(pipe)
+                pipe.execute()
+                return
+            except redis.WatchError:
+                continue
+
+
+def eliminar_libro(db, libro):
+    """
+    Elimina el libro y sus entradas de índice en una sola transacción. Las entradas
+    se calculan con la versión actual del libro (leída bajo WATCH), no con `libro`,
+    que pudo cambiar desde que se leyó. Devuelve 1 si se borró y 0 si no existía.
+    """
+    with db.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                pipe.watch(f"libro:{libro['id']}", CLAVE_RECONSTRUCCION)
+                prefijos = _prefijos(pipe)
+                actual = leer_libro(pipe, libro["id"])
+                if actual is None:
+                    return 0
+                pipe.multi()
+                pipe.delete(f"libro:{libro['id']}")
+                for prefijo in prefijos:
+                    _quitar_indices(pipe, actual, prefijo)
+                _notificar_cambio(pipe)
+                return pipe.execute()[0]
+            except redis.WatchError:
+                continue
+
+
+# -----------------------------------------------
+# BÚSQUEDA
+# -----------------------------------------------
+def _ids_por_prefijo(db, campo, prefijo):
+    """Ids cuyos tokens empiezan por `prefijo` (consultas más cortas que un trigrama)."""
+    miembros = db.zrangebylex(clave_tokens(campo), f"[{prefijo}", f"[{prefijo}{MAXIMO_LEX}")
+    return {m.rsplit(SEPARADOR, 1)[1] for m in miembros}
+
+
+def buscar_ids(db, consulta, campos=CAMPOS):
+    """
+    Resuelve una consulta a ids candidatos sin leer ningún libro:
+    SINTER de los trigramas de la consulta por cada campo (un solo pipeline),
+    o ZRANGEBYLEX sobre los tokens si la consulta es más corta que un trigrama.
+    """
+    consulta = normalizar(consulta)
+    if not consulta:
+        return set()
+
+    if len(consulta) < N_GRAMA:
+        ids = set()
+        for campo in campos:
+            ids |= _ids_por_prefijo(db, campo, consulta)
+        return ids
+
+    gramas = trigramas(consulta)
+    pipe = db.pipeline(transaction=False)
+    for campo in campos:
+        pipe.sinter([clave_trigrama(campo, g) for g in gramas])
+    ids = set()
+    for resultado in pipe.execute():
+        ids |= set(resultado)
+    return ids
+
+
+def buscar(db, consulta, campos=CAMPOS):
+    """
+    Devuelve los libros cuyo titulo/autor/genero contiene `consulta`.
+    Solo se leen (con MGET) los candidatos del índice; la comprobación final
+    descarta falsos positivos de la intersección de trigramas.
+    """
+    ids = buscar_ids(db, consulta, campos)
+    consulta = normalizar(consulta)
+    claves = [f"libro:{i}" for i in ids]
+    encontrados = []
+    for inicio in range(0, len(claves), TAMANO_LOTE):
+        for libro in leer_libros(db, claves[inicio:inicio + TAMANO_LOTE]):
+            valores = [normalizar(libro.get(c, "")) for c in campos]
+            if len(consulta) < N_GRAMA:
+                coincide = any(t.startswith(consulta) for v in valores for t in tokens(v))
+            else:
+                coincide = any(consulta in v for v in valores)
+            if coincide:
+                encontrados.append(libro)
+    return encontrados
+
+
+# -----------------------------------------------
+# LISTADO PAGINADO POR TÍTULO
+# -----------------------------------------------
+def codificar_cursor(miembro):
+    """Convierte un miembro de idx:titulos en un cursor apto para URLs."""
+    return base64.urlsafe_b64encode(miembro.encode()).decode()
+
+
+def decodificar_cursor(cursor):
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _libros_de_miembros(db, miembros):
+    """Un único MGET para los libros de una página, en el orden del índice."""
+    claves = [f"libro:{m.rsplit(SEPARADOR, 1)[1]}" for m in miembros]
+    return leer_libros(db, claves)
+
+
+def pagina_libros(db, pagina=1, por_pagina=20):
+    """
+    Página `pagina` (desde 1) del listado ordenado por título normalizado.
+    Cuesta un ZRANGE (+ ZCARD en el mismo pipeline) y un MGET.
+    Devuelve (libros, total).
+    """
+    inicio = (pagina - 1) * por_pagina
+    pipe = db.pipeline(transaction=False)
+    pipe.zrange(CLAVE_TITULOS, inicio, inicio + por_pagina - 1)
+    pipe.zcard(CLAVE_TITULOS)
+    miembros, total = pipe.execute()
+    return _libros_de_miembros(db, miembros), total
+
+
+def pagina_despues(db, despues=None, por_pagina=20):
+    """
+    Página que empieza justo después del cursor `despues` (paginación por cursor).
+    Cuesta un ZRANGEBYLEX y un MGET. Devuelve (libros, cursor_siguiente);
+    el cursor siguiente es None al llegar al final.
+    """
+    minimo = "-"
+    if despues:
+        miembro = decodificar_cursor(despues)
+        if miembro:
+            minimo = f"({miembro}"
+    miembros = db.zrangebylex(CLAVE_TITULOS, minimo, "+", start=0, num=por_pagina)
+    siguiente = codificar_cursor(miembros[-1]) if len(miembros) == por_pagina else None
+    return _libros_de_miembros(db, miembros), siguiente
+
+
+# -----------------------------------------------
+# RECONSTRUCCIÓN COMPLETA
+# -----------------------------------------------
+def _indexar_lote(db, claves, prefijo):
+    """
+    Añade a los índices temporales los libros de `claves`. Las claves se vigilan con
+    WATCH: si un libro cambia entre la lectura y el EXEC se vuelve a leer, para no
+    indexar una versión que quien escribió ya quitó de los temporales.
+    """
+    with db.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                pipe.watch(*claves)
+                libros = leer_libros(db, claves)
+                pipe.multi()
+                for libro in libros:
+                    _agregar_indices(pipe, libro, prefijo)
+                pipe.expire(CLAVE_RECONSTRUCCION, TTL_RECONSTRUCCION)
+                pipe.execute()
+                return len(libros)
+            except redis.WatchError:
+                continue
+
+
+def _sustituir_indices(db, prefijo, lote):
+    """
+    Cambia los índices definitivos por los temporales por lotes de `lote` claves,
+    cada uno en un pipeline: ningún comando bloquea el servidor mucho tiempo.
+    Primero se borran los índices que ya no tienen versión temporal y luego se
+    renombran los temporales. Cada operación es un script atómico que comprueba la
+    clave temporal en el momento de ejecutarse, y mientras dura la sustitución las
+    escrituras siguen manteniendo ambos juegos de índices.
+    """
+    borrar_si_sobra = db.register_script(BORRAR_SI_SOBRA)
+    renombrar_si_existe = db.register_script(RENOMBRAR_SI_EXISTE)
+    for claves in iterar_claves(db, "idx:*", lote):
+        pipe = db.pipeline(transaction=False)
+        for clave in claves:
+            borrar_si_sobra(keys=[clave, prefijo + clave], client=pipe)
+        pipe.execute()
+    for claves in iterar_claves(db, f"{prefijo}idx:*", lote):
+        pipe = db.pipeline(transaction=False)
+        for temporal in claves:
+            renombrar_si_existe(keys=[temporal, temporal[len(prefijo):]], client=pipe)
+        pipe.execute()
+
+
+def reconstruir_indices(db, lote=TAMANO_LOTE):
+    """
+    Vuelve a generar los índices a partir de los libro:* existentes.
+    Se construyen en claves temporales (tmp:{token}:idx:*) mientras los índices
+    actuales siguen respondiendo. CLAVE_RECONSTRUCCION guarda el prefijo temporal:
+    mientras existe, guardar_libro/guardar_libros/eliminar_libro actualizan también
+    los índices temporales, así que no se pierde ninguna escritura hecha durante la
+    reconstrucción. Al terminar se sustituyen los índices por lotes, se quita la
+    marca, se borran los temporales que hayan quedado y se avisa a las cachés.
+    """
+    prefijo = f"tmp:{uuid.uuid4().hex}:"
+    if not db.set(CLAVE_RECONSTRUCCION, prefijo, nx=True, ex=TTL_RECONSTRUCCION):
+        raise RuntimeError("Ya hay una reconstrucción de índices en curso.")
+    total = 0
+    try:
+        for claves in iterar_claves(db, lote=lote):
+            total += _indexar_lote(db, claves, prefijo)
+        _sustituir_indices(db, prefijo, lote)
+    finally:
+        # Las escrituras posteriores ya solo tocan los índices definitivos;
+        # los temporales que queden son copias de claves ya sustituidas
+        db.delete(CLAVE_RECONSTRUCCION)
+        for claves in iterar_claves(db, f"{prefijo}*", lote):
+            db.delete(*claves)
+    pipe = db.pipeline(transaction=True)
+    _notificar_cambio(pipe)
+    pipe.execute()
+    return total
+
+
+# -----------------------------------------------
+# EJECUCIÓN PRINCIPAL
+# -----------------------------------------------
+if __name__ == "__main__":
+    import os
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    db = redis.Redis(
+        host=os.getenv("KEYDB_HOST", "localhost"),
+        port=int(os.getenv("KEYDB_PORT", 6379)),
+        password=os.getenv("KEYDB_PASSWORD") or None,
+        decode_responses=True
+    )
+    total = reconstruir_indices(db)
+    print(f"✅ Índices reconstruidos para {total} libros.")
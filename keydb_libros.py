@@ -0,0 +1,105 @@
+# ===============================================
+# 📦 Lectura masiva de libros en KeyDB
+# SCAN por cursor + MGET por lotes (sin KEYS)
+# ===============================================
+#
+# Formatos de almacenamiento (variable KEYDB_FORMATO):
+#   json  libro:{id} es un STRING con el libro serializado en JSON (por defecto)
+#   hash  libro:{id} es un HASH con un campo por atributo (HSET/HGET por campo)
+# Para pasar de uno a otro usar keydb_formato.py.
+
+import json
+import os
+
+# -----------------------------------------------
+# CONFIGURACIÓN
+# -----------------------------------------------
+PATRON_LIBROS = "libro:*"
+# Cantidad de claves pedidas por cada SCAN y leídas por cada MGET
+TAMANO_LOTE = int(os.getenv("KEYDB_TAMANO_LOTE", 1000))
+FORMATO = os.getenv("KEYDB_FORMATO", "json")
+
+
+# -----------------------------------------------
+# ITERACIÓN DE CLAVES
+# -----------------------------------------------
+def iterar_claves(db, patron=PATRON_LIBROS, lote=TAMANO_LOTE):
+    """
+    Recorre las claves que coinciden con `patron` usando SCAN.
+    A diferencia de KEYS, SCAN no bloquea el servidor: cada llamada devuelve
+    un cursor y un lote de claves. SCAN puede devolver (rara vez, si la tabla
+    se redimensiona) una clave más de una vez; no se guardan las claves vistas
+    para que la memoria no crezca con la base: quien lo necesite debe tolerar
+    repeticiones (MGET, SADD, ZADD y SET son idempotentes).
+    """
+    cursor = 0
+    while True:
+        cursor, claves = db.scan(cursor=cursor, match=patron, count=lote)
+        if claves:
+            yield claves
+        if cursor == 0:
+            break
+
+
+# -----------------------------------------------
+# ESCRITURA Y LECTURA DE LIBROS
+# -----------------------------------------------
+def escribir_libro(pipe, libro, campos=None, formato=FORMATO, clave=None):
+    """
+    Encola la escritura de un libro en `pipe` (por defecto en libro:{id}).
+    En formato hash, si se indican `campos`, solo se escriben esos campos
+    (por ejemplo, marcar como leído es un único HSET).
+    """
+    clave = clave or f"libro:{libro['id']}"
+    if formato == "hash":
+        valores = {c: libro[c] for c in (campos or libro)}
+        if valores:
+            pipe.hset(clave, mapping=valores)
+    else:
+        pipe.set(clave, json.dumps(libro))
+
+
+def leer_libro(db, libro_id, formato=FORMATO):
+    """Lee un libro por su ID; devuelve None si no existe."""
+    clave = f"libro:{libro_id}"
+    if formato == "hash":
+        return db.hgetall(clave) or None
+    data = db.get(clave)
+    return json.loads(data) if data else None
+
+
+def leer_libros(db, claves, formato=FORMATO):
+    """
+    Lee una lista de claves en un único viaje de red y devuelve los libros:
+    un MGET en formato json, o un pipeline de HGETALL en formato hash.
+    """
+    if not claves:
+        return []
+    if formato == "hash":
+        pipe = db.pipeline(transaction=False)
+        for clave in claves:
+            pipe.hgetall(clave)
+        # Un hash vacío indica que la clave se borró entre el SCAN y la lectura
+        return [libro for libro in pipe.execute() if libro]
+
+    libros = []
+    for data in db.mget(claves):
+        # La clave pudo borrarse entre el SCAN y el MGET
+        if data is None:
+            continue
+        try:
+            libros.append(json.loads(data))
+        except ValueError:
+            continue
+    return libros
+
+
+def iterar_libros(db, patron=PATRON_LIBROS, lote=TAMANO_LOTE):
+    """Generador de libros: un SCAN y un MGET por lote, nunca uno por libro."""
+    for claves in iterar_claves(db, patron, lote):
+        yield from leer_libros(db, claves)
+
+
+def obtener_todos(db, patron=PATRON_LIBROS, lote=TAMANO_LOTE):
+    """Devuelve todos los libros en una lista (sin repetidos: ya están todos en memoria)."""
+    return list({libro["id"]: libro for libro in iterar_libros(db, patron, lote)}.values())
@@ -3,51 +3,77 @@
 📚 Objetivo:
 Utilizar la API pública https://pokeapi.co/ para responder preguntas sobre tipos,
 evoluciones, estadísticas y curiosidades de Pokémon.
+
+Cada análisis está escrito como un "plan": un generador que hace `yield` de la
+lista de URLs que necesita y recibe los documentos en el mismo orden. Así un
+mismo plan puede ejecutarse solo (`ejecutar`) o junto con los demás en
+pokeapi_planificador.py, que descarga cada URL una única vez.
 """
 
-import requests
-import time
+from pokeapi_cliente import ClientePokeAPI, BASE_URL
+from pokeapi_recursos import referencias
+from pokeapi_evoluciones import GrafoEvolutivo
+
+# Sesión compartida, caché en disco, reintentos y límite de tasa (ver pokeapi_cliente.py)
+cliente = ClientePokeAPI()
+# Cadenas evolutivas ya recorridas, compartidas por todos los análisis
+grafo = GrafoEvolutivo()
 
-BASE_URL = "https://pokeapi.co/api/v2"
+# Marca "resultado todavía no calculado" (None es un resultado válido: falló la descarga)
+SIN_CALCULAR = object()
 
 # ---------------------------
-# Función auxiliar para peticiones seguras
+# Funciones auxiliares para peticiones seguras
 # ---------------------------
 def get_data(url):
+    return cliente.obtener(url)
+
+def get_many(urls):
+    """Descarga varias URLs en paralelo; devuelve la lista de documentos en el mismo orden."""
+    urls = list(urls)
+    resultados = cliente.obtener_varios(urls)
+    return [resultados[u] for u in urls]
+
+def ejecutar(plan):
+    """Ejecuta un plan por sí solo: cada lista de URLs pedida se descarga en paralelo."""
     try:
-        resp = requests.get(url)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        print(f"Error al obtener {url}: {e}")
-        return None
+        urls = next(plan)
+        while True:
+            urls = plan.send(get_many(urls))
+    except StopIteration as fin:
+        return fin.value
 
 # ---------------------------
 # 🔹 Clasificación por Tipos
 # ---------------------------
 
-def pokemon_tipo_fuego_kanto():
-    """a) Cuántos Pokémon de tipo fuego existen en Kanto"""
-    data = get_data(f"{BASE_URL}/type/fire")
+def plan_tipo_fuego_kanto():
+    data, = yield [f"{BASE_URL}/type/fire"]
     if not data:
+        return None
+    # Solo Kanto (ID 1–151): el ID viene en la URL, no hace falta descargar cada Pokémon
+    return [p.name for p in referencias(data["pokemon"], "pokemon", cliente) if p.id <= 151]
+
+def pokemon_tipo_fuego_kanto(resultado=SIN_CALCULAR):
+    """a) Cuántos Pokémon de tipo fuego existen en Kanto"""
+    kanto = ejecutar(plan_tipo_fuego_kanto()) if resultado is SIN_CALCULAR else resultado
+    if kanto is None:
         return
-    pokemons = [p["pokemon"]["name"] for p in data["pokemon"]]
-    # Solo Kanto (ID 1–151)
-    kanto = [p for p in pokemons if get_data(f"{BASE_URL}/pokemon/{p}").get("id", 1000) <= 151]
     print(f"🔥 Pokémon tipo fuego en Kanto: {len(kanto)}")
     print(kanto)
 
-def pokemon_agua_altos():
-    """b) Pokémon tipo agua con altura > 10"""
-    data = get_data(f"{BASE_URL}/type/water")
+def plan_agua_altos():
+    data, = yield [f"{BASE_URL}/type/water"]
     if not data:
+        return None
+    docs = yield [p.url for p in referencias(data["pokemon"], "pokemon", cliente)]
+    return [poke["name"] for poke in docs if poke and poke["height"] > 10]
+
+def pokemon_agua_altos(resultado=SIN_CALCULAR):
+    """b) Pokémon tipo agua con altura > 10"""
+    result = ejecutar(plan_agua_altos()) if resultado is SIN_CALCULAR else resultado
+    if result is None:
         return
-    result = []
-    for p in data["pokemon"]:
-        poke = get_data(p["pokemon"]["url"])
-        if poke and poke["height"] > 10:
-            result.append(poke["name"])
-        time.sleep(0.1)
     print("💧 Pokémon tipo agua con altura > 10:")
     print(result)
 
@@ -55,35 +81,39 @@ def pokemon_agua_altos():
 # 🔹 Evoluciones
 # ---------------------------
 
-def cadena_evolutiva(pokemon_inicial="charmander"):
-    """a) Cadena evolutiva completa de un Pokémon inicial"""
-    species = get_data(f"{BASE_URL}/pokemon-species/{pokemon_inicial}")
+def plan_cadena_evolutiva(pokemon_inicial="charmander"):
+    species, = yield [f"{BASE_URL}/pokemon-species/{pokemon_inicial}"]
     if not species:
-        return
-    evo_chain_url = species["evolution_chain"]["url"]
-    chain = get_data(evo_chain_url)
-    if not chain:
-        return
-
-    cadena = []
-    evo = chain["chain"]
-    while evo:
-        cadena.append(evo["species"]["name"])
-        evo = evo["evolves_to"][0] if evo["evolves_to"] else None
+        return None
+    # Todas las ramas de la cadena (p. ej. todas las evoluciones de Eevee)
+    yield from grafo.plan_cargar([species["evolution_chain"]["url"]])
+    return grafo.cadena_completa(species["name"]) or None
 
+def cadena_evolutiva(pokemon_inicial="charmander", resultado=SIN_CALCULAR):
+    """a) Cadena evolutiva completa de un Pokémon inicial"""
+    cadena = ejecutar(plan_cadena_evolutiva(pokemon_inicial)) if resultado is SIN_CALCULAR else resultado
+    if cadena is None:
+        return
     print(f"🧬 Cadena evolutiva de {pokemon_inicial.capitalize()}: {', '.join(cadena)}")
 
-def electricos_sin_evolucion():
-    """b) Pokémon eléctricos sin evoluciones"""
-    data = get_data(f"{BASE_URL}/type/electric")
+def plan_electricos_sin_evolucion():
+    data, = yield [f"{BASE_URL}/type/electric"]
     if not data:
+        return None
+    # Las formas alternativas no tienen especie propia: se descartan antes de pedir nada
+    pokes = [p for p in referencias(data["pokemon"], "pokemon", cliente) if not p.es_forma]
+    especies = yield [p.url_hermana("pokemon-species") for p in pokes]
+    especies = [s for s in especies if s and s["evolves_from_species"] is None]
+    # Cada cadena se descarga una sola vez aunque la compartan varias especies
+    yield from grafo.plan_cargar([s["evolution_chain"]["url"] for s in especies])
+    return [s["name"] for s in especies
+            if s["name"] in grafo.cadena_de and not grafo.tiene_evoluciones(s["name"])]
+
+def electricos_sin_evolucion(resultado=SIN_CALCULAR):
+    """b) Pokémon eléctricos sin evoluciones"""
+    sin_evo = ejecutar(plan_electricos_sin_evolucion()) if resultado is SIN_CALCULAR else resultado
+    if sin_evo is None:
         return
-    sin_evo = []
-    for p in data["pokemon"]:
-        species = get_data(p["pokemon"]["url"].replace("pokemon/", "pokemon-species/"))
-        if species and species["evolves_from_species"] is None and not get_data(species["evolution_chain"]["url"])["chain"]["evolves_to"]:
-            sin_evo.append(species["name"])
-        time.sleep(0.1)
     print("⚡ Pokémon eléctricos sin evoluciones:")
     print(sin_evo)
 
@@ -91,84 +121,101 @@ def electricos_sin_evolucion():
 # 🔹 Estadísticas de Batalla
 # ---------------------------
 
-def max_ataque_johto():
-    """a) Pokémon con mayor ataque base en Johto (ID 152–251)"""
+def stat(poke, nombre):
+    return next(s["base_stat"] for s in poke["stats"] if s["stat"]["name"] == nombre)
+
+def plan_max_ataque_johto():
     max_atk = 0
     max_name = ""
-    for i in range(152, 252):
-        poke = get_data(f"{BASE_URL}/pokemon/{i}")
+    docs = yield [f"{BASE_URL}/pokemon/{i}" for i in range(152, 252)]
+    for poke in docs:
         if not poke:
             continue
-        atk = next(s["base_stat"] for s in poke["stats"] if s["stat"]["name"] == "attack")
+        atk = stat(poke, "attack")
         if atk > max_atk:
             max_atk = atk
             max_name = poke["name"]
-        time.sleep(0.05)
+    return max_name, max_atk
+
+def max_ataque_johto(resultado=SIN_CALCULAR):
+    """a) Pokémon con mayor ataque base en Johto (ID 152–251)"""
+    max_name, max_atk = ejecutar(plan_max_ataque_johto()) if resultado is SIN_CALCULAR else resultado
     print(f"💪 Pokémon con mayor ataque base en Johto: {max_name.capitalize()} ({max_atk})")
 
-def mas_rapido_no_legendario():
-    """b) Pokémon con mayor velocidad que no sea legendario"""
+def plan_mas_rapido_no_legendario():
     max_speed = 0
     name = ""
-    for i in range(1, 500):
-        poke = get_data(f"{BASE_URL}/pokemon/{i}")
-        if not poke:
-            continue
-        species = get_data(f"{BASE_URL}/pokemon-species/{poke['name']}")
+    pokes = yield [f"{BASE_URL}/pokemon/{i}" for i in range(1, 500)]
+    pokes = [p for p in pokes if p]
+    especies = yield [p["species"]["url"] for p in pokes]
+    for poke, species in zip(pokes, especies):
         if species and not species["is_legendary"]:
-            speed = next(s["base_stat"] for s in poke["stats"] if s["stat"]["name"] == "speed")
+            speed = stat(poke, "speed")
             if speed > max_speed:
                 max_speed = speed
                 name = poke["name"]
-        time.sleep(0.05)
+    return name, max_speed
+
+def mas_rapido_no_legendario(resultado=SIN_CALCULAR):
+    """b) Pokémon con mayor velocidad que no sea legendario"""
+    name, max_speed = ejecutar(plan_mas_rapido_no_legendario()) if resultado is SIN_CALCULAR else resultado
     print(f"⚡ Pokémon no legendario más rápido: {name.capitalize()} ({max_speed})")
 
 # ---------------------------
 # 🔹 Extras
 # ---------------------------
 
-def habitat_comun_planta():
-    """a) Hábitat más común entre los Pokémon tipo planta"""
-    data = get_data(f"{BASE_URL}/type/grass")
+def plan_habitat_comun_planta():
+    data, = yield [f"{BASE_URL}/type/grass"]
+    if not data:
+        return None
     habitats = {}
-    for p in data["pokemon"]:
-        species = get_data(p["pokemon"]["url"].replace("pokemon/", "pokemon-species/"))
+    pokes = [p for p in referencias(data["pokemon"], "pokemon", cliente) if not p.es_forma]
+    especies = yield [p.url_hermana("pokemon-species") for p in pokes]
+    for species in especies:
         if species and species["habitat"]:
             nombre_habitat = species["habitat"]["name"]
             habitats[nombre_habitat] = habitats.get(nombre_habitat, 0) + 1
-        time.sleep(0.1)
-    if habitats:
-        hab_mas_comun = max(habitats, key=habitats.get)
+    return max(habitats, key=habitats.get) if habitats else None
+
+def habitat_comun_planta(resultado=SIN_CALCULAR):
+    """a) Hábitat más común entre los Pokémon tipo planta"""
+    hab_mas_comun = ejecutar(plan_habitat_comun_planta()) if resultado is SIN_CALCULAR else resultado
+    if hab_mas_comun:
         print(f"🌿 Hábitat más común entre tipo planta: {hab_mas_comun}")
 
-def pokemon_mas_liviano():
-    """b) Pokémon con el menor peso registrado"""
+def plan_pokemon_mas_liviano():
     min_peso = 999999
     nombre = ""
-    for i in range(1, 900):
-        poke = get_data(f"{BASE_URL}/pokemon/{i}")
+    docs = yield [f"{BASE_URL}/pokemon/{i}" for i in range(1, 900)]
+    for poke in docs:
         if poke and poke["weight"] < min_peso:
             min_peso = poke["weight"]
             nombre = poke["name"]
-        time.sleep(0.02)
+    return nombre, min_peso
+
+def pokemon_mas_liviano(resultado=SIN_CALCULAR):
+    """b) Pokémon con el menor peso registrado"""
+    nombre, min_peso = ejecutar(plan_pokemon_mas_liviano()) if resultado is SIN_CALCULAR else resultado
     print(f"🍃 Pokémon más liviano: {nombre.capitalize()} (peso: {min_peso})")
 
+# ---------------------------
+# 🔹 Registro de análisis: (sección, nombre, plan, función que muestra el resultado)
+# ---------------------------
+ANALISIS = [
+    ("=== 🔥 Clasificación por Tipos ===", "tipo_fuego_kanto", plan_tipo_fuego_kanto, pokemon_tipo_fuego_kanto),
+    ("=== 🔥 Clasificación por Tipos ===", "agua_altos", plan_agua_altos, pokemon_agua_altos),
+    ("=== 🧬 Evoluciones ===", "cadena_evolutiva", plan_cadena_evolutiva, cadena_evolutiva),
+    ("=== 🧬 Evoluciones ===", "electricos_sin_evolucion", plan_electricos_sin_evolucion, electricos_sin_evolucion),
+    ("=== ⚔️ Estadísticas de Batalla ===", "max_ataque_johto", plan_max_ataque_johto, max_ataque_johto),
+    ("=== ⚔️ Estadísticas de Batalla ===", "mas_rapido_no_legendario", plan_mas_rapido_no_legendario, mas_rapido_no_legendario),
+    ("=== 🌿 Extras ===", "habitat_comun_planta", plan_habitat_comun_planta, habitat_comun_planta),
+    ("=== 🌿 Extras ===", "pokemon_mas_liviano", plan_pokemon_mas_liviano, pokemon_mas_liviano),
+]
+
 # ---------------------------
 # 🔹 Ejecución principal
 # ---------------------------
 if __name__ == "__main__":
-    print("\n=== 🔥 Clasificación por Tipos ===")
-    pokemon_tipo_fuego_kanto()
-    pokemon_agua_altos()
-
-    print("\n=== 🧬 Evoluciones ===")
-    cadena_evolutiva("charmander")
-    electricos_sin_evolucion()
-
-    print("\n=== ⚔️ Estadísticas de Batalla ===")
-    max_ataque_johto()
-    mas_rapido_no_legendario()
-
-    print("\n=== 🌿 Extras ===")
-    habitat_comun_planta()
-    pokemon_mas_liviano()
+    from pokeapi_planificador import ejecutar_analisis
+    ejecutar_analisis(cliente, ANALISIS)
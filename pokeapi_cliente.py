@@ -0,0 +1,194 @@
+"""
+🌐 Cliente HTTP para la PokeAPI
+- Sesión requests con conexiones reutilizadas (pool)
+- Concurrencia acotada con un limitador de tasa (token bucket)
+- Reintentos con backoff exponencial
+- Caché persistente en disco por URL con TTL y revalidación por ETag
+
+Variables de entorno:
+  POKEAPI_BASE_URL     URL base (p. ej. http://localhost:8000/api/v2 para un stub local)
+  POKEAPI_CACHE_DIR    carpeta de la caché en disco (por defecto .cache_pokeapi)
+  POKEAPI_CACHE_TTL    segundos de validez de una respuesta (por defecto 7 días)
+  POKEAPI_CONCURRENCIA peticiones simultáneas (por defecto 8)
+  POKEAPI_TASA         peticiones por segundo (por defecto 20)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+URL_OFICIAL = "https://pokeapi.co/api/v2"
+BASE_URL = os.getenv("POKEAPI_BASE_URL", URL_OFICIAL).rstrip("/")
+CACHE_DIR = os.getenv("POKEAPI_CACHE_DIR", ".cache_pokeapi")
+CACHE_TTL = float(os.getenv("POKEAPI_CACHE_TTL", 7 * 24 * 3600))
+CONCURRENCIA = int(os.getenv("POKEAPI_CONCURRENCIA", 8))
+TASA = float(os.getenv("POKEAPI_TASA", 20))
+# Respuestas que se reintentan (con backoff exponencial y respetando Retry-After)
+REINTENTABLES = (429, 500, 502, 503, 504)
+
+
+# ---------------------------
+# Limitador de tasa (token bucket)
+# ---------------------------
+class LimitadorTasa:
+    """Permite `tasa` peticiones por segundo con ráfagas de hasta `capacidad`."""
+
+    def __init__(self, tasa=TASA, capacidad=None):
+        self.tasa = tasa
+        self.capacidad = capacidad or max(1, int(tasa))
+        self._fichas = float(self.capacidad)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def esperar(self):
+        """Bloquea hasta que haya una ficha disponible y la consume."""
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self._fichas = min(self.capacidad, self._fichas + (ahora - self._ultimo) * self.tasa)
+                self._ultimo = ahora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                espera = (1 - self._fichas) / self.tasa
+            time.sleep(espera)
+
+
+# ---------------------------
+# Caché en disco por URL
+# ---------------------------
+class CacheDisco:
+    """Guarda cada respuesta en un archivo JSON con su ETag y fecha de descarga."""
+
+    def __init__(self, carpeta=CACHE_DIR, ttl=CACHE_TTL):
+        self.carpeta = carpeta
+        self.ttl = ttl
+        os.makedirs(carpeta, exist_ok=True)
+
+    def _ruta(self, url):
+        return os.path.join(self.carpeta, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def leer(self, url):
+        """Devuelve la entrada {url, etag, guardado, datos} o None."""
+        try:
+            with open(self._ruta(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def vigente(self, entrada, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        return entrada is not None and time.time() - entrada["guardado"] < ttl
+
+    def guardar(self, url, datos, etag=None):
+        entrada = {"url": url, "etag": etag, "guardado": time.time(), "datos": datos}
+        # Un temporal único por escritura: dos hilos con la misma URL no se pisan
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.carpeta,
+                                         suffix=".tmp", delete=False) as f:
+            json.dump(entrada, f)
+        # Reemplazo atómico: otro hilo nunca ve un archivo a medio escribir
+        os.replace(f.name, self._ruta(url))
+        return entrada
+
+
+# ---------------------------
+# Cliente
+# ---------------------------
+class ClientePokeAPI:
+    """Cliente con sesión compartida, caché en disco y descargas concurrentes."""
+
+    def __init__(self, base_url=BASE_URL, concurrencia=CONCURRENCIA, tasa=TASA,
+                 cache=None, reintentos=5, timeout=15):
+        self.base_url = base_url.rstrip("/")
+        self.concurrencia = concurrencia
+        self.timeout = timeout
+        self.reintentos = reintentos
+        self.limitador = LimitadorTasa(tasa)
+        self.cache = cache if cache is not None else CacheDisco()
+        self.peticiones = 0
+        self.aciertos_cache = 0
+        self._lock = threading.Lock()
+
+        # Los reintentos se hacen en _descargar para que también pasen por el limitador
+        adaptador = HTTPAdapter(pool_connections=concurrencia, pool_maxsize=concurrencia)
+        self.sesion = requests.Session()
+        self.sesion.mount("http://", adaptador)
+        self.sesion.mount("https://", adaptador)
+
+    def url(self, ruta):
+        """
+        Convierte una ruta ('pokemon/25') o una URL oficial en una URL del servidor
+        configurado, sin barra final, para que 'pokemon/25/' y 'pokemon/25' compartan caché.
+        """
+        if ruta.startswith(URL_OFICIAL):
+            ruta = ruta[len(URL_OFICIAL):]
+        if ruta.startswith("http"):
+            return ruta.rstrip("/")
+        return f"{self.base_url}/{ruta.strip('/')}"
+
+    def _contar(self, atributo):
+        with self._lock:
+            setattr(self, atributo, getattr(self, atributo) + 1)
+
+    def _descargar(self, url, cabeceras):
+        """
+        GET con reintentos ante REINTENTABLES y errores de conexión. Cada intento
+        consume una ficha del limitador, así que los reintentos respetan la tasa.
+        """
+        for intento in range(self.reintentos + 1):
+            self.limitador.esperar()
+            self._contar("peticiones")
+            try:
+                resp = self.sesion.get(url, headers=cabeceras, timeout=self.timeout)
+            except requests.ConnectionError:
+                if intento == self.reintentos:
+                    raise
+                espera = 0.5 * 2 ** intento
+            else:
+                if resp.status_code not in REINTENTABLES or intento == self.reintentos:
+                    return resp
+                retry_after = resp.headers.get("Retry-After", "")
+                espera = float(retry_after) if retry_after.isdigit() else 0.5 * 2 ** intento
+            time.sleep(espera)
+
+    def obtener(self, url, ttl=None):
+        """
+        Descarga (o lee de caché) un documento JSON; devuelve None si falla.
+        `ttl` sustituye al de la caché para esta URL: con ttl=0 siempre se pregunta
+        al servidor, aunque con el ETag guardado (un 304 no vuelve a traer los datos).
+        """
+        url = self.url(url)
+        entrada = self.cache.leer(url)
+        if self.cache.vigente(entrada, ttl):
+            self._contar("aciertos_cache")
+            return entrada["datos"]
+
+        cabeceras = {}
+        if entrada and entrada.get("etag"):
+            cabeceras["If-None-Match"] = entrada["etag"]
+        try:
+            resp = self._descargar(url, cabeceras)
+            if resp.status_code == 304 and entrada:
+                # No cambió: se renueva la fecha de la entrada en caché
+                return self.cache.guardar(url, entrada["datos"], entrada["etag"])["datos"]
+            resp.raise_for_status()
+            datos = resp.json()
+            self.cache.guardar(url, datos, resp.headers.get("ETag"))
+            return datos
+        except Exception as e:
+            print(f"Error al obtener {url}: {e}")
+            # Si la red falla, una copia caducada es mejor que nada
+            return entrada["datos"] if entrada else None
+
+    def obtener_varios(self, urls):
+        """Descarga varias URLs en paralelo; devuelve {url_original: datos} en el mismo orden."""
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=self.concurrencia) as ejecutor:
+            return dict(zip(urls, ejecutor.map(self.obtener, urls)))
@@ -0,0 +1,123 @@
+"""
+🧬 Grafo de evoluciones de la PokeAPI
+Descarga cada cadena evolutiva una sola vez (memorizada por ID de cadena),
+recorre todas sus ramas (Eevee, Oddish...) y construye una estructura de
+adyacencia para responder en O(1): cadena completa, si tiene evoluciones,
+forma base y etapa (profundidad) de cualquier especie cargada.
+
+Uso (benchmark de peticiones para la consulta de eléctricos):
+  python pokeapi_evoluciones.py
+"""
+
+from pokeapi_recursos import id_de_url
+
+
+class GrafoEvolutivo:
+    """Cadenas evolutivas indexadas por especie."""
+
+    def __init__(self):
+        self.hijos = {}         # especie -> [especies a las que evoluciona]
+        self.padre = {}         # especie -> especie de la que evoluciona (o None)
+        self.profundidad = {}   # especie -> etapa (0 = forma base)
+        self.cadena_de = {}     # especie -> id de cadena
+        self.miembros = {}      # id de cadena -> especies en orden de etapa
+        self.base = {}          # id de cadena -> forma base
+
+    # ---------------------------
+    # Carga
+    # ---------------------------
+    def cargada(self, cadena_url):
+        return id_de_url(cadena_url) in self.miembros
+
+    def agregar_cadena(self, documento):
+        """Recorre en anchura todas las ramas de un documento /evolution-chain/{id}."""
+        cadena_id = documento["id"]
+        if cadena_id in self.miembros:
+            return
+        raiz = documento["chain"]
+        orden = []
+        pendientes = [(raiz, None, 0)]
+        while pendientes:
+            siguientes = []
+            for nodo, padre, etapa in pendientes:
+                especie = nodo["species"]["name"]
+                orden.append(especie)
+                self.padre[especie] = padre
+                self.profundidad[especie] = etapa
+                self.cadena_de[especie] = cadena_id
+                self.hijos[especie] = [h["species"]["name"] for h in nodo["evolves_to"]]
+                siguientes.extend((h, especie, etapa + 1) for h in nodo["evolves_to"])
+            pendientes = siguientes
+        self.miembros[cadena_id] = orden
+        self.base[cadena_id] = raiz["species"]["name"]
+
+    def plan_cargar(self, cadena_urls):
+        """Plan (ver pokeapi_analysis.py) que descarga solo las cadenas no cargadas todavía."""
+        faltan = list(dict.fromkeys(u for u in cadena_urls if not self.cargada(u)))
+        if faltan:
+            documentos = yield faltan
+            for documento in documentos:
+                if documento:
+                    self.agregar_cadena(documento)
+
+    def cargar(self, cliente, cadena_urls):
+        """Carga directa con un cliente (descargas en paralelo, cada cadena una vez)."""
+        faltan = [u for u in dict.fromkeys(cadena_urls) if not self.cargada(u)]
+        for documento in cliente.obtener_varios(faltan).values():
+            if documento:
+                self.agregar_cadena(documento)
+
+    # ---------------------------
+    # Consultas O(1)
+    # ---------------------------
+    def cadena_completa(self, especie):
+        """Todas las especies de la cadena (todas las ramas) por etapa; [] si no está cargada."""
+        cadena_id = self.cadena_de.get(especie)
+        return list(self.miembros[cadena_id]) if cadena_id is not None else []
+
+    def tiene_evoluciones(self, especie):
+        """True si la especie evoluciona o procede de otra."""
+        return bool(self.hijos.get(especie)) or self.padre.get(especie) is not None
+
+    def forma_base(self, especie):
+        cadena_id = self.cadena_de.get(especie)
+        return self.base[cadena_id] if cadena_id is not None else None
+
+    def etapa(self, especie):
+        return self.profundidad.get(especie)
+
+
+# ---------------------------
+# 🔹 Benchmark: eléctricos sin evolución
+# ---------------------------
+def benchmark_electricos(cliente):
+    """
+    Compara las descargas de cadenas evolutivas de la consulta de eléctricos:
+    antes, una por especie sin pre-evolución; después, una por cadena distinta.
+    """
+    from pokeapi_analysis import BASE_URL
+    from pokeapi_recursos import referencias
+
+    data = cliente.obtener(f"{BASE_URL}/type/electric")
+    pokes = [p for p in referencias(data["pokemon"], "pokemon", cliente) if not p.es_forma]
+    especies = [e for e in cliente.obtener_varios(p.url_hermana("pokemon-species") for p in pokes).values() if e]
+    candidatas = [e for e in especies if e["evolves_from_species"] is None]
+    cadena_urls = [e["evolution_chain"]["url"] for e in candidatas]
+
+    grafo = GrafoEvolutivo()
+    grafo.cargar(cliente, cadena_urls)
+    sin_evo = [e["name"] for e in candidatas if not grafo.tiene_evoluciones(e["name"])]
+    return {
+        "especies_consultadas": len(candidatas),
+        "cadenas_antes": len(cadena_urls),
+        "cadenas_despues": len({id_de_url(u) for u in cadena_urls}),
+        "sin_evolucion": sin_evo,
+    }
+
+
+if __name__ == "__main__":
+    from pokeapi_analysis import cliente
+
+    informe = benchmark_electricos(cliente)
+    print(f"⚡ Eléctricos sin evolución: {informe['sin_evolucion']}")
+    print(f"Descargas de cadenas antes: {informe['cadenas_antes']} | después: {informe['cadenas_despues']}")
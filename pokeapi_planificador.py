@@ -0,0 +1,86 @@
+"""
+🗺️ Planificador de peticiones para pokeapi_analysis.py
+Ejecuta varios planes de análisis a la vez por rondas: en cada ronda junta las
+URLs que piden todos los planes, descarga en paralelo solo las que todavía no
+se tienen y reparte los documentos. Cada URL se descarga una única vez aunque
+la pidan varios análisis (p. ej. /pokemon/1..151 o las especies de cada tipo).
+
+Uso:
+  python pokeapi_planificador.py                       # los ocho análisis
+  python pokeapi_planificador.py agua_altos max_ataque_johto
+"""
+
+import sys
+import time
+
+
+def ejecutar_planes(planes, cliente):
+    """
+    Ejecuta los generadores `planes` ({nombre: plan}) compartiendo las descargas.
+    Devuelve (resultados, informe), donde el informe compara las peticiones de
+    una ejecución ingenua (cada análisis por separado) con las realmente únicas.
+    """
+    documentos = {}
+    resultados = {}
+    pendientes = {}
+    solicitadas = 0
+    rondas = 0
+
+    def avanzar(nombre, plan, valor=None):
+        try:
+            pendientes[nombre] = plan.send(valor)
+        except StopIteration as fin:
+            pendientes.pop(nombre, None)
+            resultados[nombre] = fin.value
+
+    for nombre, plan in planes.items():
+        avanzar(nombre, plan)
+
+    while pendientes:
+        rondas += 1
+        solicitadas += sum(len(urls) for urls in pendientes.values())
+        nuevas = {cliente.url(u) for urls in pendientes.values() for u in urls} - documentos.keys()
+        documentos.update(cliente.obtener_varios(nuevas))
+
+        for nombre, urls in list(pendientes.items()):
+            avanzar(nombre, planes[nombre], [documentos[cliente.url(u)] for u in urls])
+
+    informe = {
+        "peticiones_ingenuas": solicitadas,
+        "urls_unicas": len(documentos),
+        "peticiones_ahorradas": solicitadas - len(documentos),
+        "rondas": rondas,
+    }
+    return resultados, informe
+
+
+def ejecutar_analisis(cliente, analisis, nombres=None):
+    """
+    Ejecuta los análisis seleccionados (todos por defecto) y muestra sus resultados.
+    `analisis` es el registro ANALISIS del módulo que define los planes; se recibe
+    como argumento para no volver a importar pokeapi_analysis cuando se ejecuta
+    como script (tendría otro cliente, otra caché y otro limitador).
+    """
+    seleccion = [a for a in analisis if not nombres or a[1] in nombres]
+    inicio = time.perf_counter()
+    resultados, informe = ejecutar_planes({nombre: plan() for _, nombre, plan, _ in seleccion}, cliente)
+    duracion = time.perf_counter() - inicio
+
+    seccion_actual = None
+    for seccion, nombre, _, mostrar in seleccion:
+        if seccion != seccion_actual:
+            print(f"\n{seccion}")
+            seccion_actual = seccion
+        mostrar(resultado=resultados[nombre])
+
+    print("\n=== 🗺️ Planificador ===")
+    print(f"Peticiones de la ejecución ingenua: {informe['peticiones_ingenuas']}")
+    print(f"URLs únicas descargadas: {informe['urls_unicas']} en {informe['rondas']} rondas")
+    print(f"Peticiones ahorradas: {informe['peticiones_ahorradas']}")
+    print(f"Peticiones HTTP reales (sin caché en disco): {cliente.peticiones} | ⏱️ {duracion:.1f} s")
+    return resultados, informe
+
+
+if __name__ == "__main__":
+    from pokeapi_analysis import ANALISIS, cliente
+    ejecutar_analisis(cliente, ANALISIS, sys.argv[1:])
@@ -0,0 +1,77 @@
+"""
+🔗 Referencias ligeras a recursos de la PokeAPI (NamedAPIResource)
+Los listados de la API ({"name": ..., "url": ".../pokemon/25/"}) ya traen el ID
+dentro de la URL. `Recurso` lo expone sin ninguna petición, de modo que filtros
+como "solo Kanto" o "rango de IDs" se aplican antes de descargar nada. El
+documento completo solo se descarga si se accede a un atributo que no está en
+la referencia (p. ej. `ref.height`).
+"""
+
+# Las formas alternativas (megas, regionales...) usan IDs a partir de 10001
+# y no tienen una especie con su mismo ID
+PRIMER_ID_FORMA = 10001
+
+
+def id_de_url(url):
+    """'https://pokeapi.co/api/v2/pokemon/25/' -> 25"""
+    return int(url.rstrip("/").split("/")[-1])
+
+
+class Recurso:
+    """Referencia a un recurso con resolución perezosa del documento completo."""
+
+    __slots__ = ("name", "url", "id", "_cliente", "_datos")
+
+    def __init__(self, referencia, cliente=None):
+        self.name = referencia["name"]
+        self.url = referencia["url"]
+        self.id = id_de_url(self.url)
+        self._cliente = cliente
+        self._datos = None
+
+    @property
+    def tipo(self):
+        """Tipo de recurso según la URL: 'pokemon', 'pokemon-species', 'type'..."""
+        return self.url.rstrip("/").split("/")[-2]
+
+    @property
+    def es_forma(self):
+        return self.tipo == "pokemon" and self.id >= PRIMER_ID_FORMA
+
+    def url_hermana(self, tipo):
+        """URL del recurso `tipo` con el mismo ID (p. ej. la especie de un Pokémon base)."""
+        return self.url.replace(f"/{self.tipo}/", f"/{tipo}/")
+
+    def resolver(self):
+        """Descarga (una sola vez) el documento completo."""
+        if self._datos is None:
+            if self._cliente is None:
+                raise ValueError(f"{self!r} no tiene cliente: pásalo a referencias(..., cliente=...)")
+            self._datos = self._cliente.obtener(self.url) or {}
+        return self._datos
+
+    def __getattr__(self, atributo):
+        # Solo se llama para atributos que no están en la referencia. Los privados
+        # (_datos, _cliente) no se resuelven: en copy/pickle aún no existen
+        if atributo.startswith("_"):
+            raise AttributeError(atributo)
+        datos = self.resolver()
+        try:
+            return datos[atributo]
+        except KeyError:
+            raise AttributeError(atributo) from None
+
+    def __getitem__(self, clave):
+        return self.resolver()[clave]
+
+    def __repr__(self):
+        return f"<Recurso {self.tipo}/{self.id} '{self.name}'>"
+
+
+def referencias(elementos, clave=None, cliente=None):
+    """
+    Convierte una lista de NamedAPIResource en `Recurso`.
+    Con `clave` se extrae primero la referencia anidada, p. ej. los elementos de
+    /type/{tipo} tienen la forma {"slot": 1, "pokemon": {...}} y clave="pokemon".
+    """
+    return [Recurso(e[clave] if clave else e, cliente) for e in elementos]
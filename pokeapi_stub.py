@@ -0,0 +1,75 @@
+"""
+🧪 Servidor HTTP local que imita la PokeAPI a partir de respuestas grabadas
+Usa como fixtures los archivos de la caché en disco de pokeapi_cliente.py,
+así que basta con ejecutar una vez el análisis contra la API real para grabarlos.
+
+Uso:
+  python pokeapi_stub.py [carpeta_fixtures] [puerto]
+  POKEAPI_BASE_URL=http://localhost:8000/api/v2 python pokeapi_analysis.py
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from pokeapi_cliente import CACHE_DIR
+
+
+def cargar_fixtures(carpeta=CACHE_DIR):
+    """Devuelve {ruta: cuerpo_json} a partir de las entradas de la caché en disco."""
+    fixtures = {}
+    for nombre in os.listdir(carpeta):
+        if not nombre.endswith(".json"):
+            continue
+        with open(os.path.join(carpeta, nombre), encoding="utf-8") as f:
+            entrada = json.load(f)
+        ruta = urlsplit(entrada["url"]).path.rstrip("/")
+        fixtures[ruta] = json.dumps(entrada["datos"]).encode()
+    return fixtures
+
+
+def crear_servidor(fixtures, puerto=0):
+    """Crea (sin arrancar) un servidor que responde las rutas de `fixtures` con ETag."""
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            cuerpo = fixtures.get(urlsplit(self.path).path.rstrip("/"))
+            if cuerpo is None:
+                self.send_error(404)
+                return
+            etag = '"' + hashlib.md5(cuerpo).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return ThreadingHTTPServer(("localhost", puerto), Manejador)
+
+
+def iniciar_en_hilo(fixtures, puerto=0):
+    """Arranca el servidor en segundo plano; devuelve (servidor, base_url)."""
+    servidor = crear_servidor(fixtures, puerto)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://localhost:{servidor.server_address[1]}/api/v2"
+
+
+if __name__ == "__main__":
+    carpeta = sys.argv[1] if len(sys.argv) > 1 else CACHE_DIR
+    puerto = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    servidor = crear_servidor(cargar_fixtures(carpeta), puerto)
+    print(f"🧪 Stub de PokeAPI en http://localhost:{puerto}/api/v2")
+    servidor.serve_forever()
@@ -0,0 +1,267 @@
+"""
+💾 Copia local de la Pokédex en SQLite
+Descarga una sola vez pokemon, especies, tipos, estadísticas y cadenas
+evolutivas, y responde las preguntas de pokeapi_analysis.py con consultas SQL
+sobre esa copia (milisegundos en lugar de cientos de peticiones HTTP).
+
+Uso:
+  python pokedex_local.py ingerir      # descarga completa
+  python pokedex_local.py refrescar    # solo IDs nuevos o con datos caducados
+  python pokedex_local.py consultas    # responde las ocho preguntas
+"""
+
+import os
+import sys
+import time
+
+from pokeapi_cliente import ClientePokeAPI
+from sqlite_conexion import abrir_conexion
+from pokeapi_recursos import id_de_url
+
+POKEDEX_DB = os.getenv("POKEDEX_DB", "pokedex.db")
+# Antigüedad (segundos) a partir de la cual `refrescar` vuelve a descargar un Pokémon
+MAX_EDAD = float(os.getenv("POKEDEX_MAX_EDAD", 30 * 24 * 3600))
+# Validez (segundos) del listado de IDs en la caché en disco; con 0 se revalida siempre
+TTL_LISTADO = float(os.getenv("POKEDEX_TTL_LISTADO", 0))
+
+
+# ---------------------------
+# Esquema
+# ---------------------------
+def conectar(ruta=POKEDEX_DB):
+    """Abre la base local y crea las tablas si no existen."""
+    conexion = abrir_conexion(ruta)
+    conexion.executescript("""
+        CREATE TABLE IF NOT EXISTS pokemon (
+            id INTEGER PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            especie_id INTEGER,
+            altura INTEGER,
+            peso INTEGER,
+            hp INTEGER,
+            ataque INTEGER,
+            defensa INTEGER,
+            ataque_especial INTEGER,
+            defensa_especial INTEGER,
+            velocidad INTEGER,
+            actualizado REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tipos (
+            pokemon_id INTEGER NOT NULL,
+            tipo TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            PRIMARY KEY (tipo, pokemon_id)
+        );
+        CREATE TABLE IF NOT EXISTS especies (
+            id INTEGER PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            es_legendario INTEGER NOT NULL,
+            habitat TEXT,
+            evoluciona_de TEXT,
+            cadena_id INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS evoluciones (
+            cadena_id INTEGER NOT NULL,
+            especie TEXT NOT NULL,
+            padre TEXT,
+            profundidad INTEGER NOT NULL,
+            PRIMARY KEY (cadena_id, especie)
+        );
+        CREATE INDEX IF NOT EXISTS idx_pokemon_especie ON pokemon(especie_id);
+        CREATE INDEX IF NOT EXISTS idx_especies_nombre ON especies(nombre);
+        CREATE INDEX IF NOT EXISTS idx_evoluciones_especie ON evoluciones(especie);
+    """)
+    return conexion
+
+
+# ---------------------------
+# Ingesta
+# ---------------------------
+COLUMNAS_STATS = {
+    "hp": "hp",
+    "attack": "ataque",
+    "defense": "defensa",
+    "special-attack": "ataque_especial",
+    "special-defense": "defensa_especial",
+    "speed": "velocidad",
+}
+
+
+def _filas_cadena(cadena_id, nodo, padre=None, profundidad=0):
+    """Aplana todas las ramas de una cadena evolutiva en filas (cadena, especie, padre, profundidad)."""
+    especie = nodo["species"]["name"]
+    filas = [(cadena_id, especie, padre, profundidad)]
+    for hijo in nodo["evolves_to"]:
+        filas.extend(_filas_cadena(cadena_id, hijo, especie, profundidad + 1))
+    return filas
+
+
+def ingerir(conexion, cliente, ids):
+    """Descarga e inserta los Pokémon `ids` con sus especies, tipos y cadenas evolutivas."""
+    ids = list(ids)
+    pokes = [p for p in cliente.obtener_varios(f"pokemon/{i}" for i in ids).values() if p]
+
+    especie_urls = {p["species"]["url"] for p in pokes}
+    especies = [e for e in cliente.obtener_varios(especie_urls).values() if e]
+
+    cadena_urls = {e["evolution_chain"]["url"] for e in especies if e.get("evolution_chain")}
+    cadenas = [c for c in cliente.obtener_varios(cadena_urls).values() if c]
+
+    ahora = time.time()
+    with conexion:
+        conexion.executemany(
+            f"""INSERT OR REPLACE INTO pokemon
+                (id, nombre, especie_id, altura, peso, {", ".join(COLUMNAS_STATS.values())}, actualizado)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (p["id"], p["name"], id_de_url(p["species"]["url"]), p["height"], p["weight"],
+                 *({s["stat"]["name"]: s["base_stat"] for s in p["stats"]}.get(k) for k in COLUMNAS_STATS),
+                 ahora)
+                for p in pokes
+            ]
+        )
+        conexion.executemany(
+            "DELETE FROM tipos WHERE pokemon_id = ?", [(p["id"],) for p in pokes]
+        )
+        conexion.executemany(
+            "INSERT INTO tipos (pokemon_id, tipo, slot) VALUES (?, ?, ?)",
+            [(p["id"], t["type"]["name"], t["slot"]) for p in pokes for t in p["types"]]
+        )
+        conexion.executemany(
+            "INSERT OR REPLACE INTO especies VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (e["id"], e["name"], int(e["is_legendary"]),
+                 e["habitat"]["name"] if e["habitat"] else None,
+                 e["evolves_from_species"]["name"] if e["evolves_from_species"] else None,
+                 id_de_url(e["evolution_chain"]["url"]) if e.get("evolution_chain") else None)
+                for e in especies
+            ]
+        )
+        for cadena in cadenas:
+            conexion.execute("DELETE FROM evoluciones WHERE cadena_id = ?", (cadena["id"],))
+            conexion.executemany(
+                "INSERT INTO evoluciones VALUES (?, ?, ?, ?)", _filas_cadena(cadena["id"], cadena["chain"])
+            )
+    return len(pokes)
+
+
+def ids_remotos(cliente):
+    """
+    IDs de todos los Pokémon publicados por la API (una sola petición).
+    El listado no usa el TTL de la caché (7 días): si no, `refrescar` no vería
+    los Pokémon nuevos hasta que caducara.
+    """
+    listado = cliente.obtener("pokemon?limit=100000", ttl=TTL_LISTADO)
+    return [id_de_url(p["url"]) for p in listado["results"]] if listado else []
+
+
+def refrescar(conexion, cliente, max_edad=MAX_EDAD):
+    """Descarga solo los IDs que faltan en la copia local o cuyos datos caducaron."""
+    locales = dict(conexion.execute("SELECT id, actualizado FROM pokemon"))
+    limite = time.time() - max_edad
+    pendientes = [i for i in ids_remotos(cliente) if locales.get(i, 0) < limite]
+    return ingerir(conexion, cliente, pendientes) if pendientes else 0
+
+
+# ---------------------------
+# Consultas (las ocho preguntas de pokeapi_analysis.py)
+# ---------------------------
+def _nombres(conexion, sql, parametros=()):
+    return [fila[0] for fila in conexion.execute(sql, parametros)]
+
+
+def tipo_fuego_kanto(conexion):
+    return _nombres(conexion, """
+        SELECT p.nombre FROM tipos t JOIN pokemon p ON p.id = t.pokemon_id
+        WHERE t.tipo = 'fire' AND p.id <= 151 ORDER BY p.id""")
+
+
+def agua_altos(conexion, altura=10):
+    return _nombres(conexion, """
+        SELECT p.nombre FROM tipos t JOIN pokemon p ON p.id = t.pokemon_id
+        WHERE t.tipo = 'water' AND p.altura > ? ORDER BY p.id""", (altura,))
+
+
+def cadena_evolutiva(conexion, especie="charmander"):
+    """Todas las especies de la cadena (todas las ramas), ordenadas por etapa."""
+    return _nombres(conexion, """
+        SELECT e.especie FROM evoluciones e
+        WHERE e.cadena_id = (SELECT cadena_id FROM evoluciones WHERE especie = ?)
+        ORDER BY e.profundidad, e.especie""", (especie,))
+
+
+def electricos_sin_evolucion(conexion):
+    return _nombres(conexion, """
+        SELECT DISTINCT s.nombre FROM tipos t
+        JOIN pokemon p ON p.id = t.pokemon_id
+        JOIN especies s ON s.id = p.especie_id
+        WHERE t.tipo = 'electric' AND s.evoluciona_de IS NULL
+          AND NOT EXISTS (SELECT 1 FROM evoluciones e
+                          WHERE e.cadena_id = s.cadena_id AND e.padre IS NOT NULL)
+        ORDER BY s.id""")
+
+
+def max_ataque_johto(conexion):
+    return conexion.execute("""
+        SELECT nombre, ataque FROM pokemon WHERE id BETWEEN 152 AND 251
+        ORDER BY ataque DESC, id LIMIT 1""").fetchone()
+
+
+def mas_rapido_no_legendario(conexion):
+    return conexion.execute("""
+        SELECT p.nombre, p.velocidad FROM pokemon p JOIN especies s ON s.id = p.especie_id
+        WHERE p.id < 500 AND s.es_legendario = 0
+        ORDER BY p.velocidad DESC, p.id LIMIT 1""").fetchone()
+
+
+def habitat_comun_planta(conexion):
+    fila = conexion.execute("""
+        SELECT s.habitat FROM tipos t
+        JOIN pokemon p ON p.id = t.pokemon_id
+        JOIN especies s ON s.id = p.especie_id
+        WHERE t.tipo = 'grass' AND s.habitat IS NOT NULL
+        GROUP BY s.habitat ORDER BY COUNT(*) DESC LIMIT 1""").fetchone()
+    return fila[0] if fila else None
+
+
+def pokemon_mas_liviano(conexion):
+    return conexion.execute("""
+        SELECT nombre, peso FROM pokemon WHERE id < 900
+        ORDER BY peso, id LIMIT 1""").fetchone()
+
+
+def responder_todo(conexion):
+    """Ejecuta las ocho consultas y devuelve {pregunta: respuesta}."""
+    return {
+        "tipo_fuego_kanto": tipo_fuego_kanto(conexion),
+        "agua_altos": agua_altos(conexion),
+        "cadena_evolutiva": cadena_evolutiva(conexion, "charmander"),
+        "electricos_sin_evolucion": electricos_sin_evolucion(conexion),
+        "max_ataque_johto": max_ataque_johto(conexion),
+        "mas_rapido_no_legendario": mas_rapido_no_legendario(conexion),
+        "habitat_comun_planta": habitat_comun_planta(conexion),
+        "pokemon_mas_liviano": pokemon_mas_liviano(conexion),
+    }
+
+
+# ---------------------------
+# 🔹 Ejecución principal
+# ---------------------------
+if __name__ == "__main__":
+    comando = sys.argv[1] if len(sys.argv) > 1 else "consultas"
+    conexion = conectar()
+
+    if comando == "ingerir":
+        cliente = ClientePokeAPI()
+        print(f"✅ {ingerir(conexion, cliente, ids_remotos(cliente))} Pokémon guardados en {POKEDEX_DB}")
+    elif comando == "refrescar":
+        print(f"🔄 {refrescar(conexion, ClientePokeAPI())} Pokémon actualizados")
+    elif comando == "consultas":
+        inicio = time.perf_counter()
+        respuestas = responder_todo(conexion)
+        for pregunta, respuesta in respuestas.items():
+            print(f"{pregunta}: {respuesta}")
+        print(f"⏱️ {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    else:
+        print("Uso: python pokedex_local.py (ingerir | refrescar | consultas)")
+    conexion.close()
@@ -0,0 +1,502 @@
+# ===============================================
+# 🗄️ Repositorio de libros independiente del backend
+# Una misma interfaz sobre SQLite, MariaDB, MongoDB y KeyDB
+# ===============================================
+#
+# Uso como menú de consola sobre cualquier backend:
+#   python repositorio_libros.py [sqlite | mariadb | mongodb | keydb]
+# Desde código:
+#   repo = crear_repositorio("mongodb")     # o LIBROS_BACKEND en el entorno
+#   id_libro = repo.agregar({"titulo": ..., "autor": ..., "genero": ..., "leido": "No"})
+#
+# Los libros son dicts con id (siempre str), titulo, autor, genero y leido.
+# Cada adaptador usa el camino rápido de su backend (FTS5, FULLTEXT, $text,
+# índices de trigramas; paginación por clave; escrituras por lotes).
+
+import os
+import sys
+import threading
+import uuid
+
+CAMPOS = ("titulo", "autor", "genero", "leido")
+CAMPOS_BUSQUEDA = ("titulo", "autor", "genero", "todos")
+BACKEND = os.getenv("LIBROS_BACKEND", "keydb")
+POR_PAGINA = 20
+LIMITE_BUSQUEDA = 50
+
+
+def _validar_campos(campos):
+    desconocidos = set(campos) - set(CAMPOS)
+    if desconocidos:
+        raise ValueError(f"Campos no válidos: {', '.join(sorted(desconocidos))}")
+
+
+def _validar_campo_busqueda(campo):
+    if campo not in CAMPOS_BUSQUEDA:
+        raise ValueError(f"Campo de búsqueda no válido: {campo}")
+
+
+class RepositorioLibros:
+    """Interfaz común. Los adaptadores sobrescriben cada operación."""
+
+    nombre = None
+
+    def agregar(self, libro):
+        """Guarda un libro nuevo y devuelve su id."""
+        raise NotImplementedError
+
+    def agregar_varios(self, libros):
+        """Guarda muchos libros de una vez. Devuelve cuántos."""
+        return sum(1 for libro in libros if self.agregar(libro))
+
+    def obtener(self, id_libro):
+        """El libro con ese id o None."""
+        raise NotImplementedError
+
+    def pagina(self, despues=None, por_pagina=POR_PAGINA):
+        """Paginación por cursor: (libros, cursor_siguiente); el cursor es None al final."""
+        raise NotImplementedError
+
+    def pagina_numero(self, pagina=1, por_pagina=POR_PAGINA):
+        """Paginación por número de página (desde 1): (libros, total)."""
+        raise NotImplementedError
+
+    def buscar(self, termino, campo="todos", limite=LIMITE_BUSQUEDA):
+        """
+        Hasta `limite` libros cuyo `campo` coincide con `termino`, sin distinguir
+        mayúsculas. "todos" busca en titulo, autor y genero en todos los backends;
+        el tipo de coincidencia (palabra, prefijo o subcadena) es el del índice de cada uno.
+        """
+        raise NotImplementedError
+
+    def actualizar(self, id_libro, valores):
+        """Modifica varios campos. Devuelve True si el libro existía."""
+        raise NotImplementedError
+
+    def actualizar_campo(self, id_libro, campo, valor):
+        return self.actualizar(id_libro, {campo: valor})
+
+    def eliminar(self, id_libro):
+        """Devuelve True si el libro existía."""
+        raise NotImplementedError
+
+    def cerrar(self):
+        pass
+
+
+# -----------------------------------------------
+# SQLITE (biblioteca_personal.py)
+# -----------------------------------------------
+class RepositorioSQLite(RepositorioLibros):
+    nombre = "sqlite"
+    COLUMNAS = "id, titulo, autor, genero, leido"
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or os.getenv("SQLITE_RUTA", "biblioteca.db")
+        # Una conexión por hilo: sqlite3 no permite compartirlas entre hilos
+        self._local = threading.local()
+        self._conexiones = []
+
+    @property
+    def conexion(self):
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            from biblioteca_personal import conectar
+            conexion = self._local.conexion = conectar(self.ruta)
+            self._conexiones.append(conexion)
+        return conexion
+
+    def _libro(self, fila):
+        libro = dict(zip(("id",) + CAMPOS, fila))
+        libro["id"] = str(libro["id"])
+        return libro
+
+    def agregar(self, libro):
+        with self.conexion:
+            cursor = self.conexion.execute(
+                "INSERT INTO libros (titulo, autor, genero, leido) VALUES (?, ?, ?, ?)",
+                [libro.get(c, "No" if c == "leido" else None) for c in CAMPOS]
+            )
+        return str(cursor.lastrowid)
+
+    def agregar_varios(self, libros):
+        filas = [[l.get(c, "No" if c == "leido" else None) for c in CAMPOS] for l in libros]
+        with self.conexion:
+            self.conexion.executemany(
+                "INSERT INTO libros (titulo, autor, genero, leido) VALUES (?, ?, ?, ?)", filas
+            )
+        return len(filas)
+
+    def obtener(self, id_libro):
+        fila = self.conexion.execute(
+            f"SELECT {self.COLUMNAS} FROM libros WHERE id = ?", (id_libro,)
+        ).fetchone()
+        return self._libro(fila) if fila else None
+
+    def pagina(self, despues=None, por_pagina=POR_PAGINA):
+        filas = self.conexion.execute(
+            f"SELECT {self.COLUMNAS} FROM libros WHERE id > ? ORDER BY id LIMIT ?",
+            (int(despues) if str(despues or "").isdigit() else 0, por_pagina)
+        ).fetchall()
+        libros = [self._libro(f) for f in filas]
+        return libros, (libros[-1]["id"] if len(libros) == por_pagina else None)
+
+    def pagina_numero(self, pagina=1, por_pagina=POR_PAGINA):
+        filas = self.conexion.execute(
+            f"SELECT {self.COLUMNAS} FROM libros ORDER BY id LIMIT ? OFFSET ?",
+            (por_pagina, (pagina - 1) * por_pagina)
+        ).fetchall()
+        total = self.conexion.execute("SELECT COUNT(*) FROM libros").fetchone()[0]
+        return [self._libro(f) for f in filas], total
+
+    def buscar(self, termino, campo="todos", limite=LIMITE_BUSQUEDA):
+        from biblioteca_personal import buscar_fts
+        _validar_campo_busqueda(campo)
+        filas = buscar_fts(self.conexion, termino, None if campo == "todos" else campo, limite)
+        return [self._libro(f) for f in filas]
+
+    def actualizar(self, id_libro, valores):
+        _validar_campos(valores)
+        if not valores:
+            return self.obtener(id_libro) is not None
+        asignaciones = ", ".join(f"{c} = ?" for c in valores)
+        with self.conexion:
+            cursor = self.conexion.execute(
+                f"UPDATE libros SET {asignaciones} WHERE id = ?", [*valores.values(), id_libro]
+            )
+        return cursor.rowcount > 0
+
+    def eliminar(self, id_libro):
+        with self.conexion:
+            cursor = self.conexion.execute("DELETE FROM libros WHERE id = ?", (id_libro,))
+        return cursor.rowcount > 0
+
+    def cerrar(self):
+        import sqlite3
+        for conexion in self._conexiones:
+            try:
+                conexion.close()
+            except sqlite3.ProgrammingError:
+                pass    # abierta en otro hilo: se cierra al recogerla el recolector
+        self._conexiones.clear()
+        self._local = threading.local()
+
+
+# -----------------------------------------------
+# MARIADB (biblioteca_mariadb.py, SQLAlchemy Core)
+# -----------------------------------------------
+class RepositorioMariaDB(RepositorioLibros):
+    nombre = "mariadb"
+
+    def __init__(self, url=None, engine=None):
+        """Por defecto usa el engine de biblioteca_mariadb (MARIADB_URL); `url` o `engine` lo sustituyen."""
+        import biblioteca_mariadb
+        self.bm = biblioteca_mariadb
+        if engine is None:
+            engine = biblioteca_mariadb.crear_engine(url) if url else biblioteca_mariadb.engine
+        self.engine = engine
+
+    @staticmethod
+    def _id(id_libro):
+        try:
+            return int(id_libro)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _libro(fila):
+        libro = dict(fila)
+        libro["id"] = str(libro["id"])
+        return libro
+
+    def agregar(self, libro):
+        from sqlalchemy import insert
+        datos = {c: libro.get(c, "No" if c == "leido" else None) for c in CAMPOS}
+        with self.engine.begin() as conexion:
+            resultado = conexion.execute(insert(self.bm.Libro).values(**datos))
+        return str(resultado.inserted_primary_key[0])
+
+    def agregar_varios(self, libros):
+        return self.bm.insertar_libros(libros, engine=self.engine)
+
+    def obtener(self, id_libro):
+        from sqlalchemy import select
+        id_libro = self._id(id_libro)
+        if id_libro is None:
+            return None
+        with self.engine.connect() as conexion:
+            fila = conexion.execute(
+                select(*self.bm.COLUMNAS).where(self.bm.Libro.id == id_libro)
+            ).mappings().first()
+        return self._libro(fila) if fila else None
+
+    def pagina(self, despues=None, por_pagina=POR_PAGINA):
+        libros, siguiente = self.bm.pagina_libros(self._id(despues) or 0, por_pagina, self.engine)
+        return [self._libro(l) for l in libros], (str(siguiente) if siguiente else None)
+
+    def pagina_numero(self, pagina=1, por_pagina=POR_PAGINA):
+        from sqlalchemy import func, select
+        Libro = self.bm.Libro
+        with self.engine.connect() as conexion:
+            filas = conexion.execute(
+                select(*self.bm.COLUMNAS).order_by(Libro.id)
+                .offset((pagina - 1) * por_pagina).limit(por_pagina)
+            ).mappings().all()
+            total = conexion.execute(select(func.count()).select_from(Libro)).scalar()
+        return [self._libro(f) for f in filas], total
+
+    def buscar(self, termino, campo="todos", limite=LIMITE_BUSQUEDA):
+        return [self._libro(l) for l in self.bm.buscar_libros(termino, campo, limite, self.engine)]
+
+    def actualizar(self, id_libro, valores):
+        _validar_campos(valores)
+        id_libro = self._id(id_libro)
+        if id_libro is None:
+            return False
+        if not valores:
+            return self.obtener(id_libro) is not None
+        return self.bm.actualizar_libros([id_libro], engine=self.engine, **valores) > 0
+
+    def eliminar(self, id_libro):
+        id_libro = self._id(id_libro)
+        return id_libro is not None and self.bm.eliminar_libros([id_libro], engine=self.engine) > 0
+
+    def cerrar(self):
+        self.engine.dispose()
+
+
+# -----------------------------------------------
+# MONGODB (biblioteca_mongodb.py)
+# -----------------------------------------------
+class RepositorioMongoDB(RepositorioLibros):
+    nombre = "mongodb"
+
+    def __init__(self):
+        import biblioteca_mongodb
+        self.bm = biblioteca_mongodb
+        # buscar("todos") necesita el índice $text; create_index no hace nada si ya existe
+        self.bm.crear_indices()
+
+    @staticmethod
+    def _id(id_libro):
+        from bson.objectid import ObjectId
+        return ObjectId(id_libro) if id_libro and ObjectId.is_valid(id_libro) else None
+
+    @staticmethod
+    def _libro(documento):
+        libro = {c: documento.get(c) for c in CAMPOS}
+        libro["id"] = str(documento["_id"])
+        return libro
+
+    def agregar(self, libro):
+        documento = {c: libro.get(c, "No" if c == "leido" else None) for c in CAMPOS}
+        return str(self.bm.coleccion.insert_one(documento).inserted_id)
+
+    def agregar_varios(self, libros):
+        return self.bm.insertar_libros(libros)
+
+    def obtener(self, id_libro):
+        id_libro = self._id(id_libro)
+        if id_libro is None:
+            return None
+        documento = self.bm.coleccion.find_one({"_id": id_libro}, self.bm.PROYECCION)
+        return self._libro(documento) if documento else None
+
+    def pagina(self, despues=None, por_pagina=POR_PAGINA):
+        despues = despues if self._id(despues) else None
+        libros, siguiente = self.bm.pagina_libros(despues, por_pagina)
+        return [self._libro(d) for d in libros], siguiente
+
+    def pagina_numero(self, pagina=1, por_pagina=POR_PAGINA):
+        documentos = (self.bm.coleccion.find({}, self.bm.PROYECCION).sort("_id", 1)
+                      .skip((pagina - 1) * por_pagina).limit(por_pagina))
+        # Conteo a partir de los metadatos de la colección: no recorre los documentos
+        return [self._libro(d) for d in documentos], self.bm.coleccion.estimated_document_count()
+
+    def buscar(self, termino, campo="todos", limite=LIMITE_BUSQUEDA):
+        return [self._libro(d) for d in self.bm.buscar(termino, campo, limite)]
+
+    def actualizar(self, id_libro, valores):
+        _validar_campos(valores)
+        id_libro = self._id(id_libro)
+        if id_libro is None:
+            return False
+        if not valores:
+            return self.obtener(id_libro) is not None
+        return self.bm.coleccion.update_one({"_id": id_libro}, {"$set": valores}).matched_count > 0
+
+    def eliminar(self, id_libro):
+        id_libro = self._id(id_libro)
+        return id_libro is not None and self.bm.coleccion.delete_one({"_id": id_libro}).deleted_count > 0
+
+    def cerrar(self):
+        self.bm.cliente.close()
+
+
+# -----------------------------------------------
+# KEYDB (keydb_libros.py + keydb_indices.py)
+# -----------------------------------------------
+def conectar_keydb():
+    """Cliente KeyDB según KEYDB_HOST/PORT/PASSWORD (también lo usa cache_repositorio.py)."""
+    import redis
+    db = redis.Redis(
+        host=os.getenv("KEYDB_HOST", "localhost"),
+        port=int(os.getenv("KEYDB_PORT", 6379)),
+        password=os.getenv("KEYDB_PASSWORD", None),
+        decode_responses=True
+    )
+    db.ping()
+    return db
+
+
+class RepositorioKeyDB(RepositorioLibros):
+    nombre = "keydb"
+
+    def __init__(self, db=None):
+        self.db = db if db is not None else conectar_keydb()
+
+    def agregar(self, libro):
+        from keydb_indices import guardar_libro
+        libro = {"id": str(uuid.uuid4()), **{c: libro.get(c, "No" if c == "leido" else "") for c in CAMPOS}}
+        guardar_libro(self.db, libro)
+        return libro["id"]
+
+    def agregar_varios(self, libros):
+        from keydb_indices import guardar_libros
+        libros = [{"id": str(uuid.uuid4()), **{c: l.get(c, "No" if c == "leido" else "") for c in CAMPOS}}
+                  for l in libros]
+        guardar_libros(self.db, libros)
+        return len(libros)
+
+    def obtener(self, id_libro):
+        from keydb_libros import leer_libro
+        return leer_libro(self.db, id_libro)
+
+    def pagina(self, despues=None, por_pagina=POR_PAGINA):
+        # Orden por título normalizado (ZSET idx:titulos), no por id
+        from keydb_indices import pagina_despues
+        return pagina_despues(self.db, despues, por_pagina)
+
+    def pagina_numero(self, pagina=1, por_pagina=POR_PAGINA):
+        from keydb_indices import pagina_libros
+        return pagina_libros(self.db, pagina, por_pagina)
+
+    def buscar(self, termino, campo="todos", limite=LIMITE_BUSQUEDA):
+        from keydb_indices import buscar, CAMPOS as CAMPOS_INDEXADOS
+        _validar_campo_busqueda(campo)
+        encontrados = buscar(self.db, termino, CAMPOS_INDEXADOS if campo == "todos" else (campo,))
+        return sorted(encontrados, key=lambda l: l["titulo"].lower())[:limite]
+
+    def actualizar(self, id_libro, valores):
+        from keydb_indices import guardar_libro
+        _validar_campos(valores)
+        anterior = self.obtener(id_libro)
+        if anterior is None:
+            return False
+        # guardar_libro solo reescribe los campos (e índices) que cambian
+        return guardar_libro(self.db, {**anterior, **valores}, anterior) is not None
+
+    def eliminar(self, id_libro):
+        from keydb_indices import eliminar_libro
+        libro = self.obtener(id_libro)
+        return bool(libro) and bool(eliminar_libro(self.db, libro))
+
+    def cerrar(self):
+        self.db.close()
+
+
+BACKENDS = {
+    "sqlite": RepositorioSQLite,
+    "mariadb": RepositorioMariaDB,
+    "mongodb": RepositorioMongoDB,
+    "keydb": RepositorioKeyDB,
+}
+
+
+def crear_repositorio(backend=BACKEND, cache=None, cache_db=None, **opciones):
+    """
+    Instancia el adaptador del backend (los módulos de cada backend se importan solo aquí).
+    Con cache=True (o LIBROS_CACHE=1) los backends distintos de KeyDB se envuelven en
+    cache_repositorio.RepositorioCacheado; cache_db permite pasar el cliente KeyDB.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+    repo = BACKENDS[backend](**opciones)
+    if cache is None:
+        cache = os.getenv("LIBROS_CACHE", "0") == "1"
+    if cache and backend != "keydb":
+        from cache_repositorio import RepositorioCacheado
+        repo = RepositorioCacheado(repo, cache_db if cache_db is not None else conectar_keydb())
+    return repo
+
+
+# -----------------------------------------------
+# MENÚ DE CONSOLA COMÚN
+# -----------------------------------------------
+def _mostrar(libro):
+    print(f"ID: {libro['id']} | Título: {libro['titulo']} | Autor: {libro['autor']} | "
+          f"Género: {libro['genero']} | Leído: {libro['leido']}")
+
+
+def menu(repo):
+    while True:
+        print(f"""
+============== 📖 MENÚ DE BIBLIOTECA ({repo.nombre}) ==============
+1. Agregar nuevo libro
+2. Ver listado de libros
+3. Buscar libros
+4. Actualizar información de un libro
+5. Eliminar libro existente
+6. Salir
+""")
+        opcion = input("Seleccione una opción (1-6): ")
+        try:
+            if opcion == "1":
+                libro = {
+                    "titulo": input("Título del libro: "),
+                    "autor": input("Autor: "),
+                    "genero": input("Género: "),
+                    "leido": input("¿Leído? (Sí/No): ").capitalize(),
+                }
+                print(f"✅ Libro agregado con ID: {repo.agregar(libro)}\n")
+            elif opcion == "2":
+                libros, siguiente = repo.pagina()
+                if not libros:
+                    print("📭 No hay libros registrados.\n")
+                while libros:
+                    for libro in libros:
+                        _mostrar(libro)
+                    if siguiente is None or input("Enter para continuar, 'q' para salir: ") == "q":
+                        break
+                    libros, siguiente = repo.pagina(siguiente)
+            elif opcion == "3":
+                campo = input("Buscar por (titulo/autor/genero/todos): ").lower()
+                resultados = repo.buscar(input("Ingrese término de búsqueda: "), campo)
+                for libro in resultados:
+                    _mostrar(libro)
+                if not resultados:
+                    print("❌ No se encontraron libros.\n")
+            elif opcion == "4":
+                id_libro = input("Ingrese el ID del libro a actualizar: ")
+                campo = input("Campo a modificar (titulo, autor, genero, leido): ").lower()
+                if repo.actualizar_campo(id_libro, campo, input(f"Nuevo valor para {campo}: ")):
+                    print("✅ Libro actualizado correctamente.\n")
+                else:
+                    print("⚠️ No existe un libro con ese ID.\n")
+            elif opcion == "5":
+                if repo.eliminar(input("Ingrese el ID del libro a eliminar: ")):
+                    print("🗑️ Libro eliminado correctamente.\n")
+                else:
+                    print("⚠️ No existe un libro con ese ID.\n")
+            elif opcion == "6":
+                print("👋 Saliendo del programa...")
+                repo.cerrar()
+                break
+            else:
+                print("❌ Opción inválida.\n")
+        except ValueError as e:
+            print("❌", e)
+
+
+if __name__ == "__main__":
+    menu(crear_repositorio(sys.argv[1] if len(sys.argv) > 1 else BACKEND))
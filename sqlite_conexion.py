@@ -0,0 +1,59 @@
+# ===============================================
+# 🔌 Fábrica de conexiones SQLite
+# WAL, PRAGMAs de rendimiento y claves foráneas
+# ===============================================
+#
+# Perfiles (variable SQLITE_PERFIL, por defecto "equilibrado"):
+#   original     valores por defecto de SQLite (journal DELETE, synchronous FULL)
+#   seguro       WAL + synchronous FULL: ninguna transacción confirmada se pierde
+#   equilibrado  WAL + synchronous NORMAL + mmap y caché grandes
+#   rapido       WAL + synchronous OFF: máximo rendimiento, solo para cargas desechables
+#
+# En todos los perfiles se activa foreign_keys: sin él SQLite ignora las
+# restricciones FOREIGN KEY y los ON DELETE CASCADE del gremio.
+
+import os
+import sqlite3
+
+MB = 1024 * 1024
+
+PERFILES = {
+    "original": {},
+    "seguro": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+    },
+    "equilibrado": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * MB,
+        "cache_size": -64000,       # negativo = KiB (≈ 64 MB)
+        "temp_store": "MEMORY",
+    },
+    "rapido": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 1024 * MB,
+        "cache_size": -256000,
+        "temp_store": "MEMORY",
+    },
+}
+
+PERFIL = os.getenv("SQLITE_PERFIL", "equilibrado")
+# Sentencias preparadas que el módulo sqlite3 reutiliza por conexión
+SENTENCIAS_EN_CACHE = int(os.getenv("SQLITE_SENTENCIAS_EN_CACHE", 256))
+
+
+def abrir_conexion(ruta, perfil=PERFIL, **ajustes):
+    """
+    Abre una conexión SQLite con el perfil indicado. `ajustes` permite
+    sobrescribir cualquier PRAGMA del perfil, p. ej. synchronous="FULL".
+    """
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil SQLite desconocido: {perfil}")
+
+    conexion = sqlite3.connect(ruta, cached_statements=SENTENCIAS_EN_CACHE)
+    pragmas = {**PERFILES[perfil], **ajustes, "foreign_keys": "ON"}
+    for nombre, valor in pragmas.items():
+        conexion.execute(f"PRAGMA {nombre} = {valor}")
+    return conexion
@@ -0,0 +1,50 @@
+# ===============================================
+# 🧪 Planes de ejecución de gremio_consultas.py
+# Cada consulta debe resolverse con su índice, sin SCAN
+# ===============================================
+#
+# Uso:
+#   python -m pytest test_gremio_consultas.py
+
+import pytest
+
+from base_gremio_aventureros import crear_tablas
+from gremio_consultas import crear_indices, verificar_planes
+from gremio_generador import generar
+from sqlite_conexion import abrir_conexion
+
+# Índice que debe aparecer en el plan de cada consulta de verificar_planes
+INDICE_ESPERADO = {
+    "misiones_de_heroe": "sqlite_autoindex_misiones_heroes_1",
+    "misiones_con_monstruo": "idx_misiones_monstruos_monstruo",
+    "heroes_por_mision": "idx_misiones_heroes_mision",
+    "recompensa_total_por_heroe": "sqlite_autoindex_misiones_heroes_1",
+    "amenaza_por_mision": "sqlite_autoindex_misiones_monstruos_1",
+    "heroes_por_clase": "idx_heroes_clase",
+    "misiones_por_dificultad": "idx_misiones_dificultad",
+    "monstruos_por_tipo": "idx_monstruos_tipo",
+    "monstruos_peligrosos": "idx_monstruos_amenaza",
+}
+
+
+@pytest.fixture(scope="module")
+def planes():
+    """Esquema en memoria con algunos datos (ANALYZE necesita filas) e índices creados."""
+    conexion = abrir_conexion(":memory:")
+    crear_tablas(conexion)
+    generar(conexion, heroes=500, misiones=300, monstruos=100)
+    crear_indices(conexion)
+    yield verificar_planes(conexion)
+    conexion.close()
+
+
+def test_se_verifican_todas_las_consultas(planes):
+    assert set(planes) == set(INDICE_ESPERADO)
+
+
+@pytest.mark.parametrize("consulta", sorted(INDICE_ESPERADO))
+def test_consulta_usa_su_indice(planes, consulta):
+    correcto, plan = planes[consulta]
+    assert correcto, f"{consulta} recorre una tabla entera: {plan}"
+    assert not any(linea.startswith("SCAN") for linea in plan)
+    assert any(INDICE_ESPERADO[consulta] in linea for linea in plan), plan